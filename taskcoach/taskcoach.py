@@ -297,9 +297,16 @@ def start():
     # Lancement de l'application :
     if options.profile:
         # if options["profile"]:
+        import atexit
         import cProfile
+        from taskcoachlib.tools import dispatchprofiler
 
         log.info("Mode profilage activ\u00e9, d\u00e9marrage avec cProfile.")
+        # Profile aussi la distribution des notifications (patterns.Publisher
+        # et PyPubSub) par sujet et par écouteur ; le rapport trié est écrit
+        # dans .dispatchprofile à la sortie.
+        dispatchprofiler.enable()
+        atexit.register(dispatchprofiler.writeReport, ".dispatchprofile")
         # Lance app.start() et imprime les résultats de profil
         # (les statistiques qui décrivent combien de fois et pendant combien de temps
         # les diverses parties du programme sont exécutées.)
@@ -881,6 +881,10 @@ class Application(object, metaclass=patterns.Singleton):
 
         # wx-2-Création d'une instance de la fenêtre Principale (objet de gui.mainwindow.MainWindow, wx.Frame):
         # ligne qui devrait être la première dans OnInit (ou en tout cas juste après self.__wx_app = wxApp() dans __init__):
+        # Les rafraîchissements des visionneuses sont regroupés et livrés une
+        # fois par cycle d'inactivité plutôt qu'à chaque changement d'attribut.
+        if self.settings.getboolean("feature", "deferviewerrefresh"):
+            patterns.DeliveryQueue().setScheduler(wx.CallAfter)
         log.info("Application.init: Initialisation de la fenêtre principale.")
         self.mainwindow = gui.mainwindow.MainWindow(
             self.iocontroller, self.taskFile, self.settings, splash=splash
@@ -1627,6 +1631,8 @@ Break the lock?""") % filename,
         # Stop all timers before closing windows to prevent crashes
         # See: https://github.com/wxWidgets/Phoenix/issues/429
         self._stopAllTimers()
+        # Les visionneuses vont être détruites : plus de livraison différée.
+        patterns.DeliveryQueue().setScheduler(None)
 
         if isinstance(sys.stdout, RedirectedOutput):
             sys.stdout.summary()
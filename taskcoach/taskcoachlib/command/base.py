@@ -126,20 +126,27 @@ class BaseCommand(patterns.Command):
         return bool(self.items)
 
     def do(self):
-        """Exécute la commande si elle peut être exécutée."""
+        """Exécute la commande si elle peut être exécutée.
+
+        Les événements émis pendant la commande sont regroupés et envoyés une
+        seule fois à la fin, voir patterns.Publisher.batch().
+        """
         if self.canDo():
             super().do()
-            self.do_command()
+            with patterns.Publisher().batch():
+                self.do_command()
 
     def undo(self):
         """Annule la commande."""
         super().undo()
-        self.undo_command()
+        with patterns.Publisher().batch():
+            self.undo_command()
 
     def redo(self):
         """Répète la commande."""
         super().redo()
-        self.redo_command()
+        with patterns.Publisher().batch():
+            self.redo_command()
 
     def __tryInvokeMethodOnSuper(self, method_name, *args, **kwargs):
         """Tente d'appeler une méthode sur la classe parente.
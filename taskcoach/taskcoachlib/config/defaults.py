@@ -571,6 +571,8 @@ defaults = {
         "sdtcspans": "60,120,1440,2880",
         "sdtcspans_effort": "60,120,180,240",
         "decimaltime": "False",
+        "deferviewerrefresh": "True",
+        "fusedfilters": "False",
     },
     "syncml": {
         "url": "",
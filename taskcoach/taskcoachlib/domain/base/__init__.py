@@ -17,9 +17,15 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from .object import Object, CompositeObject, SynchronizedObject
-from .attribute import Attribute, SetAttribute
+from .attribute import Attribute, AttributeField, SetAttribute
 from .collection import Collection
-from .filter import Filter, SearchFilter, SelectedItemsFilter, DeletedFilter
+from .filter import (
+    Filter,
+    FilterPipeline,
+    SearchFilter,
+    SelectedItemsFilter,
+    DeletedFilter,
+)
 from .sorter import Sorter, TreeSorter
 from .owner import DomainObjectOwnerMetaclass
 from .appearance import (
@@ -39,11 +45,13 @@ from .appearance import (
 
 __all__ = [
     "Attribute",
+    "AttributeField",
     "Collection",
     "CompositeObject",
     "DeletedFilter",
     "DomainObjectOwnerMetaclass",
     "Filter",
+    "FilterPipeline",
     "Object",
     "SearchFilter",
     "SelectedItemsFilter",
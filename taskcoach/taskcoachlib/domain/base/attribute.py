@@ -66,7 +66,8 @@ class Attribute(object):
         Args :
             value : La valeur initiale de l'attribut.
             owner : L'objet propriétaire de l'attribut. Une référence faible à cet objet est stockée.
-            setEvent : La fonction de gestionnaire d'événements à appeler lorsque l'attribut est défini.
+            setEvent : La méthode de l'objet propriétaire à appeler lorsque
+                l'attribut est défini.
         """
         super().__init__()
         self.__value = value
@@ -157,7 +158,10 @@ class Attribute(object):
         # nous vérifions que l’objet self est une instance de __objclass__
         # (si une classe a été spécifiée comme parent) et levons une TypeError dans le cas contraire.
 
-        self.__setEvent = setEvent
+        # Seule la fonction de la méthode est gardée, comme dans SetAttribute :
+        # set() la rappelle avec le propriétaire. Cela évite une méthode liée
+        # (et une référence forte au propriétaire) par attribut.
+        self.__setEvent = setEvent.__func__
 
     def get(self):
         """
@@ -185,13 +189,123 @@ class Attribute(object):
             if value == self.__value:
                 return False
             self.__value = value
-            # self.__setEvent(owner, event)  # ❌ trop d'arguments
-            self.__setEvent(
-                event
-            )  # ✅ juste l'event, self est déjà lié via owner
+            self.__setEvent(owner, event)
             return True
 
 
+class AttributeField(object):
+    """
+    Descripteur de classe qui tient lieu d'Attribute tant qu'un objet garde
+    la valeur par défaut de l'attribut.
+
+    Beaucoup d'attributs (couleurs, police, icônes, champs d'apparence
+    calculés...) gardent leur valeur par défaut pour la plupart des objets.
+    Plutôt que de créer un Attribute par objet dans __init__, la classe
+    déclare le champ sous le nom (privé) de l'attribut :
+
+        class Object(...):
+            __fgColor = AttributeField(None, "appearanceChangedEvent")
+
+    Tant que l'objet n'a pas son propre Attribute, self.__fgColor renvoie
+    un Attribute provisoire qui lit la valeur par défaut. Le premier set()
+    d'une autre valeur crée l'Attribute de l'objet, rangé sous le même nom
+    dans l'objet, puis le modifie : l'événement est le même que si
+    l'Attribute avait été créé dans __init__. Les accès suivants trouvent
+    directement l'Attribute de l'objet.
+    """
+
+    __slots__ = ("__name", "__value", "__setEventName")
+
+    def __init__(self, value, setEventName):
+        """
+        Args :
+            value : La valeur par défaut de l'attribut, partagée par les
+                objets qui ne l'ont pas modifiée.
+            setEventName (str) : Le nom de la méthode de l'objet à appeler
+                lorsque l'attribut est défini.
+        """
+        self.__name = None
+        self.__value = value
+        self.__setEventName = setEventName
+
+    def __set_name__(self, ownerClass, name):
+        self.__name = name
+
+    def __get__(self, owner, ownerClass=None):
+        if owner is None:
+            return self
+        return _DefaultAttribute(self, owner)
+
+    def initialize(self, owner, value):
+        """
+        Définit la valeur initiale de l'attribut pour l'objet, sans
+        événement. Un Attribute déjà construit est gardé tel quel ; sinon
+        l'Attribute de l'objet n'est créé que si la valeur n'est pas la
+        valeur par défaut.
+
+        Args :
+            owner : L'objet propriétaire, en cours d'initialisation.
+            value : La valeur initiale, ou un Attribute.
+        """
+        if isinstance(value, Attribute):
+            vars(owner)[self.__name] = value
+        elif value != self.__value:
+            vars(owner)[self.__name] = Attribute(
+                value, owner, getattr(owner, self.__setEventName)
+            )
+
+    def get(self, owner):
+        """
+        Renvoie la valeur de l'attribut pour l'objet.
+
+        Args :
+            owner : L'objet propriétaire.
+        """
+        attribute = vars(owner).get(self.__name)
+        return self.__value if attribute is None else attribute.get()
+
+    def set(self, owner, value, event=None):
+        """
+        Définit la valeur de l'attribut pour l'objet. L'Attribute de l'objet
+        n'est créé, avec la valeur par défaut, que si la valeur change.
+
+        Args :
+            owner : L'objet propriétaire.
+            value : La nouvelle valeur.
+            event : Données d'événement facultatives.
+        Returns :
+            Vrai si la valeur a changé, faux sinon.
+        """
+        attribute = vars(owner).get(self.__name)
+        if attribute is None:
+            if value == self.__value:
+                return False
+            attribute = Attribute(
+                self.__value, owner, getattr(owner, self.__setEventName)
+            )
+            vars(owner)[self.__name] = attribute
+        return attribute.set(value, event=event)
+
+
+class _DefaultAttribute(object):
+    """
+    Attribute provisoire renvoyé par AttributeField pour un objet qui n'a
+    pas encore son propre Attribute.
+    """
+
+    __slots__ = ("__field", "__owner")
+
+    def __init__(self, field, owner):
+        self.__field = field
+        self.__owner = owner
+
+    def get(self):
+        return self.__field.get(self.__owner)
+
+    def set(self, value, event=None):
+        return self.__field.set(self.__owner, value, event=event)
+
+
 class SetAttribute(object):
     """
     Une classe pour gérer un ensemble d'attributs avec la gestion des événements.
@@ -18,10 +18,13 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 import logging
 import re
+import time
 
 # import sre_constants # inutile avec re sous python 3
 from taskcoachlib import patterns
 from taskcoachlib.domain.base import object as domainobject
+from taskcoachlib.domain.base.searchindex import SearchIndex
+from taskcoachlib.tools import tracing
 
 log = logging.getLogger(__name__)
 
@@ -54,6 +57,10 @@ class Filter(patterns.SetDecorator):
         # Track items added as ancestors to maintain tree hierarchy, not because
         # they matched filter criteria. Used by outer filters for orphan cleanup.
         self.__filterForced = set()
+        # Éléments qui satisfont eux-mêmes les critères du filtre (sans les
+        # ancêtres ajoutés en mode arborescence), tenus à jour par reset()
+        # et resetItems().
+        self.__matches = set()
         super().__init__(*args, **kwargs)
         self.reset()
 
@@ -61,11 +68,9 @@ class Filter(patterns.SetDecorator):
         """
         Dégèle le filtre, réactivant le filtrage après un gel.
         """
-        log.debug("Filter.thaw : degèle le filtre.")
         super().thaw()  # Boucle entre ici et patterns.observer.CollectionDecorator.thaw
         if not self.isFrozen():
             self.reset()
-        log.debug("Filter.thaw : filtre dégelé !")
 
     def setTreeMode(self, treeMode):
         """
@@ -88,11 +93,11 @@ class Filter(patterns.SetDecorator):
         Return :
             Un booléen indiquant si le filtre fonctionne en mode arborescence.
         """
-        log.debug(
-            f"Filter.treeMode : renvoie le mode d'arborescence actuel de {self.__class__.__name__}: {self.__treeMode}."
-        )
         return self.__treeMode
 
+    @tracing.traced(
+        "Filter.reset", itemCount=lambda self, *args, **kwargs: len(self)
+    )
     @patterns.eventSource
     def reset(self, event=None):
         """
@@ -101,34 +106,93 @@ class Filter(patterns.SetDecorator):
         Args :
             event : Un objet d'événement facultatif à passer aux gestionnaires d'événements.
         """
-        log.debug(
-            f"Filter.reset : réinitialisation du filtre pour self={self.__class__.__name__}, event={event}."
-        )
         if self.isFrozen():
-            log.debug(
-                f"Filter.reset : self={self.__class__.__name__} est Gelé !."
-            )
             return
 
         filteredItems = set(self.filterItems(self.observable()))
-        log.debug(f"Filter.reset : l'attribut filteredItems={filteredItems}")
+        self.__matches = set(filteredItems)
         if self.treeMode():
-            log.debug(
-                f"Filter.reset : remet à jour filteredItems car self.treeMode est {self.treeMode()}"
-            )
-            for item in filteredItems.copy():
-                log.debug(f"Filter.reset : pour item={item}")
-                filteredItems.update(set(item.ancestors()))  # Erreur !
-                log.debug(f"filteredItems devient {filteredItems}.")
-        log.debug(f"Filter.reset : filteredItems est devenu {filteredItems}.")
+            for item in self.__matches:
+                filteredItems.update(self.__iterAncestorsOf(item))
         self.removeItemsFromSelf(
             [item for item in self if item not in filteredItems], event=event
         )
         self.extendSelf(
             [item for item in filteredItems if item not in self], event=event
         )
-        log.debug(f"Filter.reset : self est devenu {self}.")
-        log.debug("Filter.reset : filtre réinitialisé !")
+
+    @tracing.traced(
+        "Filter.resetItems",
+        itemCount=lambda self, items, *args, **kwargs: len(items),
+    )
+    @patterns.eventSource
+    def resetItems(self, items, event=None):
+        """
+        Réapplique les critères du filtre aux seuls éléments donnés et à
+        leurs ancêtres, dont le résultat peut dépendre des éléments donnés
+        (description des enfants, tâche composite...).
+
+        Le résultat est le même que celui de reset() tant que les critères
+        d'un élément ne dépendent que de lui-même, de ses ancêtres et de ses
+        descendants. Les sous-classes dont les critères dépendent d'autres
+        éléments doivent redéfinir cette méthode pour appeler reset().
+
+        Args :
+            items : Les éléments ajoutés à ou supprimés de l'ensemble observé.
+            event : Un objet d'événement facultatif à passer aux
+                gestionnaires d'événements.
+        """
+        if self.isFrozen():
+            return
+
+        observable = self.observable()
+        affected = set(items)
+        for item in items:
+            affected.update(self.__ancestorsOf(item))
+        candidates = [item for item in affected if item in observable]
+        matches = set(self.filterItems(candidates)) & set(candidates)
+        self.__matches -= affected
+        self.__matches |= matches
+
+        # En mode arborescence, un élément est aussi conservé lorsqu'un de
+        # ses enfants l'est : on traite les éléments du plus profond au moins
+        # profond pour connaître le sort des enfants avant celui du parent.
+        keep = set()
+        if self.treeMode():
+            depth = {
+                item: len(self.__ancestorsOf(item)) for item in affected
+            }
+            for item in sorted(affected, key=depth.get, reverse=True):
+                if item in matches or any(
+                    child in keep if child in affected else child in self
+                    for child in item.children()
+                ):
+                    keep.add(item)
+        else:
+            keep = matches
+        self.removeItemsFromSelf(
+            [item for item in affected if item in self and item not in keep],
+            event=event,
+        )
+        self.extendSelf(
+            [item for item in keep if item not in self], event=event
+        )
+
+    @staticmethod
+    def __ancestorsOf(item):
+        """Renvoie les ancêtres de l'élément, ou une liste vide pour les
+        éléments sans hiérarchie."""
+        try:
+            return item.ancestors()
+        except AttributeError:
+            return []
+
+    @staticmethod
+    def __iterAncestorsOf(item):
+        """Parcourt les ancêtres de l'élément sans construire de liste
+        lorsque l'élément le permet (voir Composite.iterAncestors)."""
+        iterAncestors = getattr(item, "iterAncestors", None)
+        return iterAncestors() if iterAncestors else item.ancestors()
 
     def getFilterForced(self):
         """Return items that were added as ancestors, not directly matched.
@@ -180,10 +244,7 @@ class Filter(patterns.SetDecorator):
 
         Return : Une liste d'éléments qui n'ont pas de parent.
         """
-        rootItems_to_return = [item for item in self if item.parent() is None]
-        log.debug(f"Filter.rootItems : renvoie {rootItems_to_return}")
-        # return [item for item in self if item.parent() is None]
-        return rootItems_to_return
+        return [item for item in self if item.parent() is None]
 
     def onAddItem(self, event):
         """
@@ -192,7 +253,7 @@ class Filter(patterns.SetDecorator):
         Args :
             event : Un objet d'événement contenant des informations sur l'élément ajouté.
         """
-        self.reset()
+        self.resetItems(list(event.values()))
 
     def onRemoveItem(self, event):
         """
@@ -201,8 +262,7 @@ class Filter(patterns.SetDecorator):
         Args :
             event : Un objet d'événement contenant des informations sur l'élément supprimé.
         """
-        self.reset()
-        # self.reset(event)
+        self.resetItems(list(event.values()))
 
 
 class SelectedItemsFilter(Filter):
@@ -244,6 +304,18 @@ class SelectedItemsFilter(Filter):
         if not self.__selectedItems:
             self.extendSelf(self.observable(), event)
 
+    def resetItems(self, items, event=None):
+        """
+        Réapplique les critères du filtre à tout l'ensemble observé : sans
+        sélection, le résultat de filterItems dépend du contenu du filtre.
+
+        Args :
+            items : Les éléments ajoutés à ou supprimés de l'ensemble observé.
+            event : Un objet d'événement facultatif à passer aux
+                gestionnaires d'événements.
+        """
+        self.reset(event=event)
+
     def filterItems(self, items):
         """
         Filtre les éléments donnés, ne renvoyant que ceux qui sont sélectionnés ou sont des ancêtres des articles sélectionnés.
@@ -275,12 +347,10 @@ class SelectedItemsFilter(Filter):
         Return :
             bool : Vrai si l'article ou l'un de ses ancêtres est dans les éléments sélectionnés, faux autrement.
         """
-        if item in self.__selectedItems:
-            return True
-        elif item.parent():
-            return self.itemOrAncestorInSelectedItems(item.parent())
-        else:
-            return False
+        selectedItems = self.__selectedItems
+        return item in selectedItems or any(
+            ancestor in selectedItems for ancestor in item.iterAncestors()
+        )
 
 
 class SearchFilter(Filter):
@@ -297,8 +367,16 @@ class SearchFilter(Filter):
         __searchDescription : Un booléen indiquant s'il faut rechercher dans la description de l'article.
         __regularExpression : Un booléen indiquant si la chaîne de recherche est une expression régulière.
         __searchPredicate : Un texte appelant un texte et renvoie True si l'élément correspond aux critères de recherche.
+        __searchString : La chaîne recherchée lorsqu'il s'agit d'une simple
+            sous-chaîne, auquel cas la recherche passe par l'index, ou None.
+        __index : L'index des mots du texte des éléments observés, construit
+            à la première recherche de sous-chaîne.
     """
 
+    # Une expression régulière sans ces caractères est une simple
+    # sous-chaîne.
+    regularExpressionCharacters = frozenset(".^$*+?{}[]\\|()")
+
     def __init__(self, *args, **kwargs):
         """
         Initialise une nouvelle instance SearchFilter.
@@ -322,6 +400,9 @@ class SearchFilter(Filter):
         # self.__searchDescription = searchDescription = kwargs.pop("searchDescription", False)
         regularExpression = kwargs.pop("regularExpression", False)
         # self.__regularExpression = regularExpression = kwargs.pop("regularExpression", False)
+        self.__index = None
+        self.__indexedClasses = set()
+        self.__ownMatches = None
 
         self.setSearchFilter(
             searchString,
@@ -361,6 +442,8 @@ class SearchFilter(Filter):
         self.__searchPredicate = self.__compileSearchPredicate(
             searchString, matchCase, regularExpression
         )
+        self.__searchString = self.__substring(searchString, regularExpression)
+        self.__ownMatches = None
         if doReset:
             self.reset()
 
@@ -395,24 +478,201 @@ class SearchFilter(Filter):
         else:
             return lambda x: x.lower().find(searchString.lower()) != -1
 
+    @classmethod
+    def __substring(cls, searchString, regularExpression):
+        """
+        Renvoie la chaîne recherchée si elle peut être cherchée comme une
+        simple sous-chaîne, sinon None.
+
+        Args :
+            searchString : La chaîne à rechercher.
+            regularExpression : Un booléen indiquant si la chaîne de
+                recherche est une expression régulière.
+        Return :
+            La chaîne recherchée ou None.
+        """
+        if not searchString:
+            return None
+        if not regularExpression or cls.regularExpressionCharacters.isdisjoint(
+            searchString
+        ):
+            return searchString
+        try:
+            re.compile(searchString)
+        except re.error:
+            # __compileSearchPredicate cherche alors une simple sous-chaîne.
+            return searchString
+        return None
+
+    def detach(self):
+        """
+        Détache le filtre et cesse de suivre les modifications du texte des
+        éléments.
+        """
+        self.removeObserver(self.onItemTextChanged)
+        super().detach()
+
+    def onAddItem(self, event):
+        """
+        Indexe les éléments ajoutés avant de les filtrer.
+
+        Args :
+            event : Un objet d'événement contenant les éléments ajoutés.
+        """
+        if self.__index is not None:
+            for item in event.values():
+                self.__indexItem(item)
+            self.__ownMatches = None
+        super().onAddItem(event)
+
+    def onRemoveItem(self, event):
+        """
+        Retire de l'index les éléments supprimés avant de les filtrer.
+
+        Args :
+            event : Un objet d'événement contenant les éléments supprimés.
+        """
+        if self.__index is not None:
+            for item in event.values():
+                self.__index.remove(item)
+            self.__ownMatches = None
+        super().onRemoveItem(event)
+
+    def onItemTextChanged(self, event):
+        """
+        Réindexe les éléments dont le sujet ou la description a changé.
+
+        Comme auparavant, le filtre n'est réappliqué qu'à la prochaine
+        réinitialisation.
+
+        Args :
+            event : Un objet d'événement dont les sources sont les éléments
+                modifiés.
+        """
+        for item in event.sources():
+            if item in self.__index:
+                self.__indexItem(item)
+        self.__ownMatches = None
+
+    def __indexItem(self, item):
+        """
+        Indexe l'élément si son texte propre est le sien (le sujet d'un
+        effort, par exemple, est celui de sa tâche) et suit les
+        modifications du texte des éléments de sa classe.
+
+        Args :
+            item : L'élément à indexer.
+        """
+        itemClass = type(item)
+        if not (
+            isinstance(item, domainobject.CompositeObject)
+            and itemClass.subject is domainobject.CompositeObject.subject
+            and itemClass.getDescription
+            is domainobject.CompositeObject.getDescription
+        ):
+            return
+        self.__index.add(item, item.subject(), item.getDescription())
+        if itemClass not in self.__indexedClasses:
+            self.__indexedClasses.add(itemClass)
+            for eventType in (
+                itemClass.subjectChangedEventType(),
+                itemClass.descriptionChangedEventType(),
+            ):
+                self.registerObserver(
+                    self.onItemTextChanged, eventType=eventType
+                )
+
+    def __searchIndex(self):
+        """
+        Renvoie l'index des éléments observés, construit au premier appel.
+
+        Return :
+            L'index de recherche.
+        """
+        if self.__index is None:
+            self.__index = SearchIndex()
+            for item in self.observable():
+                self.__indexItem(item)
+        return self.__index
+
+    def __matchingItems(self):
+        """
+        Renvoie les éléments observés dont le texte propre contient la
+        sous-chaîne recherchée.
+
+        Les candidats proposés par l'index sont vérifiés avec le prédicat de
+        recherche, et le résultat est gardé jusqu'à la prochaine
+        modification de la recherche ou des éléments indexés. Les éléments
+        que l'index ne couvre pas sont vérifiés à chaque appel.
+
+        Return :
+            L'ensemble des éléments correspondants.
+        """
+        index = self.__searchIndex()
+        if self.__ownMatches is None:
+            self.__ownMatches = {
+                item
+                for item in index.candidates(self.__searchString)
+                if self.__searchPredicate(self.__itemOwnText(item))
+            }
+        return self.__ownMatches.union(
+            item
+            for item in self.observable()
+            if item not in index
+            and self.__searchPredicate(self.__itemOwnText(item))
+        )
+
     def filterItems(self, items):
         """
         Filtre les éléments donnés, ne renvoyant que ceux qui correspondent aux critères de recherche.
 
+        Les recherches de simples sous-chaînes passent par l'index ; les
+        expressions régulières sont évaluées sur le texte de chaque élément.
+
         Args :
             items : Un itérable d'articles à filtrer.
         Return :
             Une liste d'éléments qui correspondent aux critères de recherche.
         """
-        return (
-            [
+        if not self.__searchPredicate:
+            return items
+        if self.__searchString is None:
+            return [
                 item
                 for item in items
                 if self.__searchPredicate(self.__itemText(item))
             ]
-            if self.__searchPredicate
-            else items
-        )
+        matches = self.__matchingItems()
+        if self.treeMode():
+            # Un élément dont un descendant correspond est retenu.
+            for item in list(matches):
+                matches.update(item.ancestors())
+        return [
+            item
+            for item in items
+            if item in matches
+            or (
+                self.__includeSubItems
+                and any(
+                    self.__ancestorMatches(ancestor)
+                    for ancestor in item.ancestors()
+                )
+            )
+        ]
+
+    def __ancestorMatches(self, ancestor):
+        """
+        Indique si le texte propre de l'ancêtre contient la sous-chaîne
+        recherchée, l'ancêtre pouvant ne pas être indexé.
+
+        Args :
+            ancestor : L'ancêtre à vérifier.
+        Return :
+            True si l'ancêtre correspond.
+        """
+        if ancestor in self.__index:
+            return ancestor in self.__ownMatches
+        return bool(self.__searchPredicate(self.__itemOwnText(ancestor)))
 
     def __itemText(self, item):
         """
@@ -433,11 +693,12 @@ class SearchFilter(Filter):
                 text += self.__itemOwnText(parent)
                 parent = parent.parent()
         if self.treeMode():
+            observable = self.observable()
             text += " ".join(
                 [
                     self.__itemOwnText(child)
-                    for child in item.children(recursive=True)
-                    if child in self.observable()
+                    for child in item.iterChildren(recursive=True)
+                    if child in observable
                 ]
             )
         return text
@@ -508,3 +769,132 @@ class DeletedFilter(Filter):
         """
 
         return [item for item in items if not item.isDeleted()]
+
+
+class FilterStage(object):
+    """
+    Étape d'un FilterPipeline : une classe de filtres et les statistiques
+    qui servent à ordonner les étapes.
+
+    Ivar :
+        filterClass : La classe dont la méthode filterItems est appliquée.
+        cost : Coût moyen, en secondes, de l'évaluation d'un élément.
+        passRate : Proportion moyenne d'éléments retenus par l'étape.
+    """
+
+    __slots__ = ("filterClass", "cost", "passRate")
+
+    # Poids des nouvelles mesures dans les moyennes mobiles.
+    smoothing = 0.3
+
+    def __init__(self, filterClass):
+        self.filterClass = filterClass
+        self.cost = 0.0
+        self.passRate = None
+
+    def rank(self):
+        """
+        Renvoie le rang de l'étape : les étapes de plus petit rang, les moins
+        coûteuses et les plus sélectives, sont appliquées en premier.
+
+        Return :
+            float : Le coût par élément écarté.
+        """
+        if self.passRate is None:
+            return 0.0
+        return self.cost / max(1.0 - self.passRate, 0.01)
+
+    def update(self, nrItems, nrSelected, duration):
+        """
+        Met à jour les statistiques après l'évaluation de nrItems éléments.
+
+        Args :
+            nrItems (int) : Nombre d'éléments évalués (non nul).
+            nrSelected (int) : Nombre d'éléments retenus.
+            duration (float) : Durée de l'évaluation en secondes.
+        """
+        cost = duration / nrItems
+        passRate = nrSelected / nrItems
+        if self.passRate is None:
+            self.cost, self.passRate = cost, passRate
+        else:
+            self.cost += self.smoothing * (cost - self.cost)
+            self.passRate += self.smoothing * (passRate - self.passRate)
+
+
+class FilterPipeline(Filter):
+    """
+    Filtre qui fusionne plusieurs filtres en un seul décorateur.
+
+    Les filtres à fusionner sont les classes de base d'une sous-classe :
+    par exemple, `class TaskFilterPipeline(FilterPipeline, SearchFilter,
+    ViewFilter, DeletedFilter)`. L'instance accepte les arguments de
+    chacun des filtres, expose leurs méthodes (setSearchFilter,
+    hideTaskStatus...) et se réinitialise lorsque l'un de leurs critères
+    change, comme le ferait la pile des filtres correspondants.
+
+    Au lieu que chaque filtre de la pile garde son propre ensemble et
+    observe le filtre qu'il décore, le pipeline garde un seul ensemble et
+    applique en une passe les méthodes filterItems des filtres : chaque
+    étape n'évalue que les éléments retenus par les précédentes, les moins
+    coûteuses et les plus sélectives d'abord. En mode arborescence, les
+    ancêtres ne sont ajoutés qu'à la fin, à ceux des éléments qui
+    satisfont tous les critères.
+
+    Les filtres dont la méthode filterItems dépend du contenu du filtre
+    (SelectedItemsFilter) ne peuvent pas être fusionnés.
+    """
+
+    def __init__(self, *args, **kwargs):
+        """
+        Initialise le pipeline avec une étape par classe de filtres fusionnée.
+
+        Args :
+            args : Arguments de position transmis au constructeur de la
+                superclasse.
+            *kwargs : Arguments de mots clés des filtres fusionnés.
+        """
+        self.__stages = [
+            FilterStage(filterClass)
+            for filterClass in type(self).__mro__
+            if issubclass(filterClass, Filter)
+            and filterClass not in (Filter, FilterPipeline)
+            and "filterItems" in vars(filterClass)
+        ]
+        super().__init__(*args, **kwargs)
+
+    def stages(self):
+        """
+        Renvoie les étapes dans l'ordre où elles seront appliquées.
+
+        Return :
+            list : Les étapes (FilterStage).
+        """
+        return sorted(self.__stages, key=FilterStage.rank)
+
+    def filterItems(self, items):
+        """
+        Applique les étapes les unes après les autres, chacune aux seuls
+        éléments retenus par les précédentes.
+
+        Args :
+            items : Un itérable d'articles à filtrer.
+        Return :
+            Une liste des éléments qui passent toutes les étapes.
+        """
+        items = list(items)
+        for stage in self.stages():
+            if not items:
+                break
+            start = time.perf_counter()
+            selected = stage.filterClass.filterItems(self, items)
+            if selected is not items:
+                # Certains filtres (CategoryFilter) renvoient tous les
+                # éléments observés qui correspondent, pas seulement ceux
+                # qui leur sont donnés.
+                selected = set(selected)
+                selected = [item for item in items if item in selected]
+            duration = time.perf_counter() - start
+            stage.update(len(items), len(selected), duration)
+            items = selected
+        return items
@@ -188,7 +188,6 @@ import logging
 import sys
 import uuid
 import re
-import weakref
 from pubsub import pub
 from taskcoachlib import patterns
 from taskcoachlib.domain.attribute import icon
@@ -196,6 +195,7 @@ from taskcoachlib.domain.date import DateTime, Now
 
 # from taskcoachlib.domain.task.task import Task
 from . import attribute
+from .attribute import AttributeField
 from .appearance import FIELD_DEFAULTS, FIELD_NO_VALUE_SOURCE
 
 log = logging.getLogger(__name__)
@@ -557,6 +557,51 @@ class Object(SynchronizedObject):
     else:
         _long_zero = 0
 
+    # Attributs qui gardent souvent leur valeur par défaut : l'Attribute
+    # d'un objet n'est créé que lorsqu'il change de valeur.
+    __description = AttributeField("", "descriptionChangedEvent")
+    __fgColor = AttributeField(None, "appearanceChangedEvent")
+    __bgColor = AttributeField(None, "appearanceChangedEvent")
+    __font = AttributeField(None, "appearanceChangedEvent")
+    __icon = AttributeField("", "appearanceChangedEvent")
+    __selectedIcon = AttributeField("", "appearanceChangedEvent")
+
+    # Derived SSOT fields (value + source for each appearance type)
+    __derivedFgColorValue = AttributeField(None, "_onDerivedFgColorChanged")
+    __derivedFgColorSource = AttributeField(None, "_onDerivedFgColorChanged")
+    __derivedBgColorValue = AttributeField(None, "_onDerivedBgColorChanged")
+    __derivedBgColorSource = AttributeField(None, "_onDerivedBgColorChanged")
+    __derivedIconValue = AttributeField(None, "_onDerivedIconChanged")
+    __derivedIconSource = AttributeField(None, "_onDerivedIconChanged")
+    __derivedFontValue = AttributeField(None, "_onDerivedFontChanged")
+    __derivedFontSource = AttributeField(None, "_onDerivedFontChanged")
+
+    # Effective SSOT fields (value + source + default for colors/font,
+    # value + source for icon)
+    __effectiveFgColorValue = AttributeField(
+        None, "_onEffectiveFgColorChanged"
+    )
+    __effectiveFgColorSource = AttributeField(
+        None, "_onEffectiveFgColorChanged"
+    )
+    __effectiveFgColorDefault = AttributeField(
+        None, "_onEffectiveFgColorChanged"
+    )
+    __effectiveBgColorValue = AttributeField(
+        None, "_onEffectiveBgColorChanged"
+    )
+    __effectiveBgColorSource = AttributeField(
+        None, "_onEffectiveBgColorChanged"
+    )
+    __effectiveBgColorDefault = AttributeField(
+        None, "_onEffectiveBgColorChanged"
+    )
+    __effectiveIconValue = AttributeField(None, "_onEffectiveIconChanged")
+    __effectiveIconSource = AttributeField(None, "_onEffectiveIconChanged")
+    __effectiveFontValue = AttributeField(None, "_onEffectiveFontChanged")
+    __effectiveFontSource = AttributeField(None, "_onEffectiveFontChanged")
+    __effectiveFontDefault = AttributeField(None, "_onEffectiveFontChanged")
+
     def __init__(self, *args, **kwargs):
         """
         Initialisez l'instance d'objet.
@@ -579,9 +624,6 @@ class Object(SynchronizedObject):
         # print(f"Object.__init__ : Attribute={Attribute}")
         # print(f"Object.__init__ : kwargs={kwargs}")
 
-        # Création d'une référence faible à self, utilisée pour éviter les cycles de références
-        selfRef = weakref.ref(self)
-
         # On récupère la liste des clés à traiter localement
         accepted_keys = [
             "id",
@@ -610,215 +652,53 @@ class Object(SynchronizedObject):
         # Appel sécurisé au constructeur parent (sans kwargs dangereux)
         super().__init__(*args, **kwargs)
 
-        def setSubjectEvent(event):
-            obj = selfRef()
-            if obj is not None:
-                obj.subjectChangedEvent(event)
-
-        # Fonction de rappel personnalisée pour les changements de description
-        def setDescriptionEvent(event):
-            obj = selfRef()  # Récupère l'objet si encore en mémoire
-            if obj is not None:
-                obj.descriptionChangedEvent(event)  # Déclenche l'événement
-
-        def setAppearanceEvent(event):
-            obj = selfRef()
-            if obj is not None:
-                obj.appearanceChangedEvent(event)
-
-        def setOrderingEvent(event):
-            obj = selfRef()
-            if obj is not None:
-                obj.orderingChangedEvent(event)
-
-        # On extrait d'abord les données utiles pour Object
-        # Attributs principaux, initialisés avec leurs gestionnaires d'événements
-        # self.__creationDateTime = kwargs.pop("creationDateTime", None) or Now()
+        # Attributs principaux, initialisés avec leurs gestionnaires
+        # d'événements. Ceux qui sont déclarés par un AttributeField
+        # n'ont leur propre Attribute que si leur valeur n'est pas la
+        # valeur par défaut.
         self.__creationDateTime = (
             local_kwargs.pop("creationDateTime", None) or Now()
         )
-        # self.__modificationDateTime = kwargs.pop("modificationDateTime", DateTime.min)
         self.__modificationDateTime = local_kwargs.pop(
             "modificationDateTime", DateTime.min
         )
-        # self.__subject = Attribute(
-        #     kwargs.pop("subject", ""), self, self.subjectChangedEvent
-        # )
-        # self.__subject = Attribute(
-        #     kwargs.pop("subject", ""), self, setSubjectEvent
-        # )
-        # subject_value = kwargs.pop("subject", "")
         subject_value = local_kwargs.pop("subject", "")
         log.debug(f"Object.__init__ : subject_value={subject_value}")
         if isinstance(subject_value, attribute.Attribute):
             self.__subject = subject_value
         else:
-            self.__subject = Attribute(subject_value, self, setSubjectEvent)
-        # log.debug(f"[DEBUG] Object.__init__() → subject reçu: {self.__subject!r}")
-        log.debug(
-            f"[DEBUG] Object.__init__() → subject reçu: {self.__subject.get()}"
-        )
-        # self.__description = Attribute(
-        #     kwargs.pop("description", ""), self, self.descriptionChangedEvent
-        # )
-        # self.__description = Attribute(
-        #     kwargs.pop("description", ""), self, setDescriptionEvent
-        # )
-        # description_value = kwargs.pop("description", "")
-        description_value = local_kwargs.pop("description", "")
-        if isinstance(description_value, attribute.Attribute):
-            self.__description = description_value
-        else:
-            self.__description = Attribute(
-                description_value, self, setDescriptionEvent
+            self.__subject = Attribute(
+                subject_value, self, self.subjectChangedEvent
             )
         log.debug(
-            f"Object.__init__() : description reçu: {self.__description}"
+            f"[DEBUG] Object.__init__() → subject reçu: {self.__subject.get()}"
         )
-        # self.__fgColor = Attribute(
-        #     kwargs.pop("fgColor", None), self, self.appearanceChangedEvent
-        # )
-        # self.__fgColor = Attribute(
-        #     kwargs.pop("fgColor", None), self, setAppearanceEvent
-        # )
-        # fgColor_value = kwargs.pop("fgColor", None)
-        fgColor_value = local_kwargs.pop("fgColor", None)
-        if isinstance(fgColor_value, attribute.Attribute):
-            self.__fgColor = fgColor_value
-        else:
-            self.__fgColor = Attribute(fgColor_value, self, setAppearanceEvent)
-        # self.__bgColor = Attribute(
-        #     kwargs.pop("bgColor", None), self, self.appearanceChangedEvent
-        # )
-        # self.__bgColor = Attribute(
-        #     kwargs.pop("bgColor", None), self, setAppearanceEvent
-        # )
-        # bgColor_value = kwargs.pop("bgColor", None)
-        bgColor_value = local_kwargs.pop("bgColor", None)
-        if isinstance(bgColor_value, attribute.Attribute):
-            self.__bgColor = bgColor_value
-        else:
-            self.__bgColor = Attribute(bgColor_value, self, setAppearanceEvent)
-        # self.__font = Attribute(
-        #     kwargs.pop("font", None), self, self.appearanceChangedEvent
-        # )
-        # self.__font = Attribute(
-        #     kwargs.pop("font", None), self, setAppearanceEvent
-        # )
-        # font_value = kwargs.pop("font", None)
-        font_value = local_kwargs.pop("font", None)
-        if isinstance(font_value, attribute.Attribute):
-            self.__font = font_value
-        else:
-            self.__font = Attribute(font_value, self, setAppearanceEvent)
-        # self.__icon = Attribute(
-        #     kwargs.pop("icon", ""), self, self.appearanceChangedEvent
-        # )
-        # self.__icon = Attribute(
-        #     kwargs.pop("icon", ""), self, setAppearanceEvent
-        # )
-        # icon_value = kwargs.pop("icon", "")
-        icon_value = local_kwargs.pop("icon", "")
-        if isinstance(icon_value, attribute.Attribute):
-            self.__icon = icon_value
-        else:
-            self.__icon = Attribute(icon_value, self, setAppearanceEvent)
-        # self.__selectedIcon = Attribute(
-        #     kwargs.pop("selectedIcon", ""), self, self.appearanceChangedEvent
-        # )
-        # self.__selectedIcon = Attribute(
-        #     kwargs.pop("selectedIcon", ""), self, setAppearanceEvent
-        # )
-        # selectedIcon_value = kwargs.pop("selectedIcon", "")
-        selectedIcon_value = local_kwargs.pop("selectedIcon", "")
-        if isinstance(selectedIcon_value, attribute.Attribute):
-            self.__selectedIcon = selectedIcon_value
-        else:
-            self.__selectedIcon = Attribute(
-                selectedIcon_value, self, setAppearanceEvent
-            )
-        # self.__ordering = Attribute(
-        #     kwargs.pop("ordering", Object._long_zero),
-        #     self,
-        #     self.orderingChangedEvent,
-        # )
-        # self.__ordering = Attribute(
-        #     kwargs.pop("ordering", Object._long_zero),
-        #     self,
-        #     setOrderingEvent,
-        # )
+        for name, field in (
+            ("description", Object.__description),
+            ("fgColor", Object.__fgColor),
+            ("bgColor", Object.__bgColor),
+            ("font", Object.__font),
+            ("icon", Object.__icon),
+            ("selectedIcon", Object.__selectedIcon),
+        ):
+            if name in local_kwargs:
+                field.initialize(self, local_kwargs.pop(name))
         self.__ordering = Attribute(
             local_kwargs.pop("ordering", Object._long_zero),
             self,
-            setOrderingEvent,
+            self.orderingChangedEvent,
         )
         # self.__id = kwargs.pop("id", None or str(uuid.uuid1()))  # ID unique
-        self.__id = local_kwargs.pop(
-            "id", None or str(uuid.uuid1())
+        # Task.__init__ transmet id=None lorsqu'aucun id n'est donné :
+        self.__id = local_kwargs.pop("id", None) or str(
+            uuid.uuid1()
         )  # ID unique
         log.debug(f"Object.__init__() : id reçu: {self.__id}.")
         # self.__id = local_kwargs.pop("id", str(uuid.uuid1()))  # ID unique, TODO : à essayer
 
-        # Derived SSOT fields (value + source for each appearance type)
-        self.__derivedFgColorValue = Attribute(
-            None, self, self._onDerivedFgColorChanged
-        )
-        self.__derivedFgColorSource = Attribute(
-            None, self, self._onDerivedFgColorChanged
-        )
-        self.__derivedBgColorValue = Attribute(
-            None, self, self._onDerivedBgColorChanged
-        )
-        self.__derivedBgColorSource = Attribute(
-            None, self, self._onDerivedBgColorChanged
-        )
-        self.__derivedIconValue = Attribute(
-            None, self, self._onDerivedIconChanged
-        )
-        self.__derivedIconSource = Attribute(
-            None, self, self._onDerivedIconChanged
-        )
-        self.__derivedFontValue = Attribute(
-            None, self, self._onDerivedFontChanged
-        )
-        self.__derivedFontSource = Attribute(
-            None, self, self._onDerivedFontChanged
-        )
-
-        # Effective SSOT fields (value + source + default for colors/font, value + source for icon)
-        self.__effectiveFgColorValue = Attribute(
-            None, self, self._onEffectiveFgColorChanged
-        )
-        self.__effectiveFgColorSource = Attribute(
-            None, self, self._onEffectiveFgColorChanged
-        )
-        self.__effectiveFgColorDefault = Attribute(
-            None, self, self._onEffectiveFgColorChanged
-        )
-        self.__effectiveBgColorValue = Attribute(
-            None, self, self._onEffectiveBgColorChanged
-        )
-        self.__effectiveBgColorSource = Attribute(
-            None, self, self._onEffectiveBgColorChanged
-        )
-        self.__effectiveBgColorDefault = Attribute(
-            None, self, self._onEffectiveBgColorChanged
-        )
-        self.__effectiveIconValue = Attribute(
-            None, self, self._onEffectiveIconChanged
-        )
-        self.__effectiveIconSource = Attribute(
-            None, self, self._onEffectiveIconChanged
-        )
-        self.__effectiveFontValue = Attribute(
-            None, self, self._onEffectiveFontChanged
-        )
-        self.__effectiveFontSource = Attribute(
-            None, self, self._onEffectiveFontChanged
-        )
-        self.__effectiveFontDefault = Attribute(
-            None, self, self._onEffectiveFontChanged
-        )
+        # Les champs SSOT dérivés et effectifs (valeur + source) sont des
+        # AttributeField de la classe : ils ne sont créés qu'au premier
+        # calcul de l'apparence de l'objet.
 
         # Initialisation du parent
         # super().__init__(*args, **kwargs)  # Appelle le constructeur de la classe parente
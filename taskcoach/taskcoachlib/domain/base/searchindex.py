@@ -0,0 +1,173 @@
+"""
+Task Coach - Your friendly task manager
+Copyright (C) 2004-2016 Task Coach developers <developers@taskcoach.org>
+
+Task Coach is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Task Coach is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import re
+
+# Un mot est une suite de caractères alphanumériques : une recherche de
+# sous-chaîne qui contient un fragment de mot ne peut correspondre qu'à un
+# texte dont un des mots contient ce fragment.
+_wordPattern = re.compile(r"\w+", re.UNICODE)
+
+# Les mots sont aussi indexés par leurs fragments d'au plus gramLength
+# caractères : les mots qui contiennent un fragment plus long contiennent
+# chacun de ses fragments de cette longueur.
+gramLength = 3
+
+
+def _grams(word):
+    """Renvoie les fragments d'au plus gramLength caractères du mot."""
+    return {
+        word[start : start + length]
+        for length in range(1, min(gramLength, len(word)) + 1)
+        for start in range(len(word) - length + 1)
+    }
+
+
+class SearchIndex(object):
+    """
+    Index inversé des mots du texte propre (sujet et description) des
+    éléments, utilisé par SearchFilter pour les recherches de sous-chaînes.
+
+    Chaque mot, en minuscules, renvoie aux éléments dont le texte le
+    contient, et chaque fragment de mot court renvoie aux mots qui le
+    contiennent. Une recherche renvoie des candidats : un sur-ensemble des
+    éléments dont le texte contient la chaîne recherchée, que l'appelant
+    vérifie ensuite avec son propre prédicat.
+    """
+
+    def __init__(self):
+        self.__texts = {}  # élément -> (sujet, description)
+        self.__words = {}  # élément -> mots indexés pour l'élément
+        self.__postings = {}  # mot -> éléments dont le texte contient le mot
+        self.__grams = {}  # fragment -> mots indexés qui le contiennent
+
+    def __contains__(self, item):
+        return item in self.__texts
+
+    def __len__(self):
+        return len(self.__texts)
+
+    def add(self, item, subject, description):
+        """
+        Indexe (ou réindexe) le texte de l'élément.
+
+        Le sujet et la description sont indexés séparément et aussi mis bout
+        à bout, comme SearchFilter les concatène lorsqu'il cherche dans la
+        description.
+
+        Args :
+            item : L'élément à indexer.
+            subject (str) : Le sujet de l'élément.
+            description (str) : La description de l'élément.
+        """
+        if item in self.__texts:
+            self.remove(item)
+        self.__texts[item] = (subject, description)
+        words = set(_wordPattern.findall(subject.lower()))
+        words.update(_wordPattern.findall((subject + description).lower()))
+        self.__words[item] = words
+        for word in words:
+            if word not in self.__postings:
+                self.__postings[word] = set()
+                for gram in _grams(word):
+                    self.__grams.setdefault(gram, set()).add(word)
+            self.__postings[word].add(item)
+
+    def remove(self, item):
+        """
+        Retire l'élément de l'index, s'il y est.
+
+        Args :
+            item : L'élément à retirer.
+        """
+        if self.__texts.pop(item, None) is None:
+            return
+        for word in self.__words.pop(item):
+            items = self.__postings[word]
+            items.discard(item)
+            if not items:
+                del self.__postings[word]
+                for gram in _grams(word):
+                    words = self.__grams[gram]
+                    words.discard(word)
+                    if not words:
+                        del self.__grams[gram]
+
+    def clear(self):
+        """Vide l'index."""
+        self.__texts.clear()
+        self.__words.clear()
+        self.__postings.clear()
+        self.__grams.clear()
+
+    def items(self):
+        """Renvoie les éléments indexés."""
+        return self.__texts.keys()
+
+    def texts(self, item):
+        """
+        Renvoie le texte indexé de l'élément.
+
+        Args :
+            item : Un élément indexé.
+        Returns :
+            (tuple) : Le sujet et la description de l'élément.
+        """
+        return self.__texts[item]
+
+    def candidates(self, searchString):
+        """
+        Renvoie les éléments dont le texte peut contenir searchString, sans
+        tenir compte de la casse.
+
+        Le plus long fragment de mot de la chaîne recherchée doit apparaître
+        dans un des mots du texte : seuls les éléments qui contiennent un
+        tel mot sont candidats. Ces mots sont trouvés par l'index des
+        fragments, sans parcourir tout le vocabulaire. Une chaîne sans
+        caractère alphanumérique ne permet pas de restreindre la recherche.
+
+        Args :
+            searchString (str) : La chaîne recherchée.
+        Returns :
+            Les éléments candidats.
+        """
+        fragments = _wordPattern.findall(searchString.lower())
+        if not fragments:
+            return self.__texts.keys()
+        fragment = max(fragments, key=len)
+        candidates = set()
+        for word in self.__wordsContaining(fragment):
+            candidates |= self.__postings[word]
+        return candidates
+
+    def __wordsContaining(self, fragment):
+        if len(fragment) <= gramLength:
+            return self.__grams.get(fragment, ())
+        wordSets = []
+        for gram in _grams(fragment):
+            if len(gram) == gramLength:
+                words = self.__grams.get(gram)
+                if not words:
+                    return ()
+                wordSets.append(words)
+        wordSets.sort(key=len)
+        return [
+            word
+            for word in wordSets[0].intersection(*wordSets[1:])
+            if fragment in word
+        ]
@@ -16,8 +16,11 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import functools
+import heapq
 import logging
 from taskcoachlib import patterns
+from taskcoachlib.tools import tracing
 
 # try:
 #    from taskcoachlib.thirdparty.pubsub import pub
@@ -29,6 +32,23 @@ from pubsub import pub
 log = logging.getLogger(__name__)
 
 
+class _ReversedSortValue(object):
+    """Valeur de clé de tri dont l'ordre est inversé, pour trier en une
+    seule passe sur une clé composée dont certaines composantes sont
+    décroissantes."""
+
+    __slots__ = ("value",)
+
+    def __init__(self, value):
+        self.value = value
+
+    def __eq__(self, other):
+        return self.value == other.value
+
+    def __lt__(self, other):
+        return other.value < self.value
+
+
 class Sorter(patterns.ListDecorator):  # classe enfant
     """This class decorates a list and sorts its contents."""
 
@@ -37,6 +57,19 @@ class Sorter(patterns.ListDecorator):  # classe enfant
     def __init__(self, *args, **kwargs):
         self._sortKeys = kwargs.pop("sortBy", ["subject"])
         self._sortCaseSensitive = kwargs.pop("sortCaseSensitive", True)
+        # Par clé de tri : la fonction de clé et les valeurs déjà calculées
+        # pour chaque élément. Une valeur n'est recalculée que lorsqu'un
+        # événement signale que l'élément a changé, ou que le tri lui-même
+        # (clés, casse, mode arborescence...) change. Les valeurs sont
+        # indexées par identité, avec l'élément qui les garde en vie : deux
+        # éléments égaux (même identifiant) ne partagent pas leurs valeurs.
+        self.__sortKeyFunctions = {}
+        self.__sortKeyValues = {}
+        # En mode fenêtré, seuls les __sortedCount premiers éléments sont à
+        # leur place : le reste de la liste n'est trié qu'à la demande, par
+        # sortedItems(), itemWithIndex() et indexOfItem().
+        self.__windowed = kwargs.pop("windowed", False)
+        self.__sortedCount = 0
         super().__init__(
             *args, **kwargs
         )  # Cela appelle CollectionDecorator.__init__
@@ -72,9 +105,36 @@ class Sorter(patterns.ListDecorator):  # classe enfant
     def sortKeys(self):
         return self._sortKeys
 
-    # We don't implement removeItemsFromSelf() because there is no need
-    # to resort when items are removed since after removing items the
-    # remaining items are still in the right order.
+    # There is no need to resort when items are removed since after
+    # removing items the remaining items are still in the right order.
+    @patterns.eventSource
+    def removeItemsFromSelf(self, items, event=None):
+        self._forgetSortKeyValues(items)
+        if self.__sortedCount:
+            removedIds = {id(item) for item in items}
+            self.__sortedCount -= sum(
+                1
+                for item in self[: self.__sortedCount]
+                if id(item) in removedIds
+            )
+        return super().removeItemsFromSelf(items, event=event)
+
+    def isWindowed(self):
+        """Indique si la liste n'est triée qu'à la demande, par fenêtres."""
+        return self.__windowed
+
+    def setWindowed(self, windowed=True):
+        """
+        Active ou désactive le mode fenêtré.
+
+        Args :
+            windowed (bool) : En mode fenêtré, reset() ne trie plus la
+                liste : les lignes demandées par sortedItems() sont
+                sélectionnées au besoin, et le tri est affiné à mesure que
+                des lignes plus lointaines sont demandées.
+        """
+        self.__windowed = windowed
+        self.reset(forceEvent=True)
 
     def sortBy(self, sortKey):
         if self._sortKeys and self._sortKeys[0] == sortKey:
@@ -93,10 +153,12 @@ class Sorter(patterns.ListDecorator):  # classe enfant
             self._sortKeys.insert(0, sortKey)
             self._registerObserverForAttribute(sortKey)
 
+        self.invalidateSortKeys()
         self.reset()
 
     def sortCaseSensitive(self, sortCaseSensitive):
         self._sortCaseSensitive = sortCaseSensitive
+        self.invalidateSortKeys()
         self.reset()
 
     def sortAscending(self, ascending=True):
@@ -112,17 +174,302 @@ class Sorter(patterns.ListDecorator):  # classe enfant
         if self.isFrozen():
             return
 
+        if self.isWindowed():
+            # Sans trier, on ne sait pas si l'ordre a changé : les
+            # observateurs sont toujours prévenus.
+            self.__sortedCount = 0
+            pub.sendMessage(self.sortEventType(), sender=self)
+            return
         oldSelf = self[:]
-        # XXXTODO: create only one function with all keys ? Reversing may
-        # be problematic.
-        for sortKey in reversed(self._sortKeys):
-            self.sort(
-                key=self.createSortKeyFunction(sortKey.lstrip("-")),
-                reverse=sortKey.startswith("-"),
-            )
+        if self._sortKeys:
+            keyFunction, reverse = self._compositeSortKeyFunction()
+            self.sort(key=keyFunction, reverse=reverse)
         if forceEvent or self != oldSelf:
             pub.sendMessage(self.sortEventType(), sender=self)
 
+    @tracing.traced(
+        "Sorter.resetItems",
+        itemCount=lambda self, items, *args, **kwargs: len(items),
+    )
+    def resetItems(self, items):
+        """
+        Replace les éléments donnés, et ceux dont la clé de tri dépend
+        d'eux, sans retrier toute la liste.
+
+        Les éléments à replacer sont retirés de la liste, qui reste triée,
+        puis réinsérés par recherche dichotomique. L'ordre obtenu est celui
+        que donnerait reset() : les éléments de même clé restent dans leur
+        ordre précédent. Lorsqu'un des éléments donnés n'est pas dans la
+        liste, ou que trop d'éléments sont concernés, la liste est retriée
+        entièrement.
+
+        Args :
+            items : Les éléments dont la clé de tri a pu changer.
+        """
+        affected = set()
+        for item in items:
+            affected.update(self._itemsAffectedBy(item))
+        # Même gelée, la liste doit oublier les clés périmées : thaw() les
+        # recalculera en retriant.
+        self._forgetSortKeyValues(affected)
+        if self.isFrozen():
+            return
+        if self.isWindowed():
+            self.reset()
+            return
+
+        ids = [id(item) for item in self]
+        positions = {}
+        for item in affected:
+            try:
+                positions[item] = ids.index(id(item))
+            except ValueError:
+                pass
+        if (
+            not positions
+            or any(item not in positions for item in items)
+            or len(positions) * 16 > len(self)
+        ):
+            self.reset()
+            return
+
+        oldSelf = self[:]
+        movedItems = sorted(positions, key=positions.get)
+        for item in reversed(movedItems):
+            del self[positions[item]]
+
+        keyFunction, reverse = self._compositeSortKeyFunction()
+        keys = {}
+
+        def keyOf(item):
+            try:
+                return keys[item]
+            except KeyError:
+                key = keys[item] = keyFunction(item)
+                return key
+
+        def compare(key, otherKey):
+            order = (otherKey < key) - (key < otherKey)
+            return -order if reverse else order
+
+        insertions = []
+        for rank, item in enumerate(movedItems):
+            key = keyOf(item)
+            low = self.__bisect(key, keyOf, compare, right=False)
+            high = self.__bisect(key, keyOf, compare, right=True)
+            # Parmi les éléments de même clé, l'élément garde sa place : il
+            # suit ceux qui le précédaient avant d'être retiré.
+            position = min(max(positions[item] - rank, low), high)
+            insertions.append((position, item))
+
+        def compareInsertions(insertion, otherInsertion):
+            return (
+                (insertion[0] > otherInsertion[0])
+                - (insertion[0] < otherInsertion[0])
+                or compare(keyOf(insertion[1]), keyOf(otherInsertion[1]))
+                or positions[insertion[1]] - positions[otherInsertion[1]]
+            )
+
+        insertions.sort(key=functools.cmp_to_key(compareInsertions))
+        for position, item in reversed(insertions):
+            self.insert(position, item)
+        if self != oldSelf:
+            pub.sendMessage(self.sortEventType(), sender=self)
+
+    def sortedItems(self, start=0, stop=None):
+        """
+        Renvoie les éléments triés des positions start à stop (exclue).
+
+        Hors mode fenêtré, la liste est déjà triée. En mode fenêtré, la
+        partie triée de la liste est étendue jusqu'à stop au moins : les
+        éléments suivants sont sélectionnés parmi ceux qui restent
+        (heapq.nsmallest, stable comme list.sort), et la partie triée
+        double au moins à chaque extension, pour que le défilement de toute
+        la liste coûte au plus quelques tris complets. Au-delà de la moitié
+        de la liste, le reste est trié d'un coup.
+
+        Args :
+            start (int) : La première position.
+            stop (int) : La position qui suit la dernière, ou None pour la
+                fin de la liste.
+        Returns :
+            (list) : Les éléments triés de la fenêtre.
+        """
+        stop = len(self) if stop is None else min(stop, len(self))
+        if self.isWindowed() and not self.isFrozen():
+            self.__sortUpTo(stop)
+        return self[start:stop]
+
+    def itemWithIndex(self, index):
+        """
+        Renvoie l'élément à la position index de la liste triée.
+
+        Args :
+            index (int) : La position de l'élément.
+        Returns :
+            L'élément.
+        """
+        if index < 0:
+            index += len(self)
+        if not 0 <= index < len(self):
+            raise IndexError("Sorter index out of range")
+        return self.sortedItems(index, index + 1)[0]
+
+    def indexOfItem(self, item):
+        """
+        Renvoie la position de l'élément dans la liste triée.
+
+        Args :
+            item : Un élément de la liste.
+        Returns :
+            (int) : La position de l'élément.
+        """
+        index = self.__identityIndex(item)
+        if self.isWindowed() and index >= self.__sortedCount:
+            # L'élément n'est pas encore à sa place : il faut trier la
+            # liste jusqu'à lui, c'est-à-dire toute la liste.
+            self.sortedItems()
+            index = self.__identityIndex(item)
+        return index
+
+    def __identityIndex(self, item):
+        """Renvoie la position de l'élément lui-même, et non du premier
+        élément égal (de même identifiant)."""
+        for index, eachItem in enumerate(self):
+            if eachItem is item:
+                return index
+        raise ValueError(f"{item!r} is not in the sorter")
+
+    def __sortUpTo(self, stop):
+        """Étend la partie triée de la liste jusqu'à stop au moins."""
+        if stop <= self.__sortedCount:
+            return
+        if not self._sortKeys:
+            self.__sortedCount = len(self)
+            return
+        keyFunction, reverse = self._compositeSortKeyFunction()
+        sortedCount = self.__sortedCount
+        target = max(stop, 2 * sortedCount, 64)
+        if 2 * target >= len(self):
+            rest = self[sortedCount:]
+            rest.sort(key=keyFunction, reverse=reverse)
+            self[sortedCount:] = rest
+            self.__sortedCount = len(self)
+            return
+        rest = self[sortedCount:]
+        select = heapq.nlargest if reverse else heapq.nsmallest
+        selected = select(target - sortedCount, rest, key=keyFunction)
+        selectedIds = {id(item) for item in selected}
+        self[sortedCount:] = selected + [
+            item for item in rest if id(item) not in selectedIds
+        ]
+        self.__sortedCount = target
+
+    def __bisect(self, key, keyOf, compare, right):
+        """Renvoie la première position de la liste triée où un élément de
+        clé key peut être inséré, avant (right=False) ou après (right=True)
+        les éléments de même clé."""
+        low, high = 0, len(self)
+        while low < high:
+            middle = (low + high) // 2
+            order = compare(key, keyOf(self[middle]))
+            if order > 0 or (right and order == 0):
+                low = middle + 1
+            else:
+                high = middle
+        return low
+
+    def _itemsAffectedBy(self, item):
+        """
+        Renvoie les éléments dont la clé de tri peut changer lorsqu'un
+        attribut de l'élément change : l'élément lui-même, ses ancêtres
+        (clés récursives) et ses descendants.
+
+        Args :
+            item : L'élément modifié.
+        Returns :
+            (list) : Les éléments concernés.
+        """
+        try:
+            return (
+                [item] + item.ancestors() + item.children(recursive=True)
+            )
+        except AttributeError:
+            return [item]
+
+    def invalidateSortKeys(self):
+        """Oublie toutes les valeurs de clé de tri. À appeler lorsque la
+        façon de trier change, avant de retrier."""
+        self.__sortKeyFunctions.clear()
+        self.__sortKeyValues.clear()
+
+    def _forgetSortKeyValues(self, items):
+        """Oublie les valeurs de clé de tri des éléments donnés."""
+        for values in self.__sortKeyValues.values():
+            for item in items:
+                values.pop(id(item), None)
+
+    def _compositeSortKeyFunction(self):
+        """
+        Compile les clés de tri en une seule fonction de clé, pour trier en
+        une passe ce que l'on triait auparavant par un tri stable par clé,
+        de la dernière à la première.
+
+        Avec plusieurs clés, la clé composée est le tuple des valeurs de
+        chaque clé. Lorsque toutes les clés sont décroissantes, le tri entier
+        est inversé (list.sort reste stable avec reverse=True) ; sinon les
+        valeurs des seules clés décroissantes sont enveloppées pour en
+        inverser l'ordre.
+
+        Returns :
+            (tuple) : La fonction de clé et l'argument reverse de list.sort.
+        """
+        reverses = [sortKey.startswith("-") for sortKey in self._sortKeys]
+        keyFunctions = [
+            self.__cachedSortKeyFunction(sortKey.lstrip("-"))
+            for sortKey in self._sortKeys
+        ]
+        if len(keyFunctions) == 1:
+            return keyFunctions[0], reverses[0]
+        if all(reverses):
+            components, reverse = keyFunctions, True
+        else:
+            components = [
+                self.__reversedKeyFunction(function) if reverse else function
+                for function, reverse in zip(keyFunctions, reverses)
+            ]
+            reverse = False
+
+        def compositeKeyFunction(item):
+            return tuple([function(item) for function in components])
+
+        return compositeKeyFunction, reverse
+
+    @staticmethod
+    def __reversedKeyFunction(keyFunction):
+        return lambda item: _ReversedSortValue(keyFunction(item))
+
+    def __cachedSortKeyFunction(self, sortKey):
+        """Renvoie la fonction de clé de sortKey, qui ne calcule la valeur
+        de la clé d'un élément que si elle n'est pas déjà connue."""
+        try:
+            return self.__sortKeyFunctions[sortKey]
+        except KeyError:
+            pass
+        keyFunction = self.createSortKeyFunction(sortKey)
+        values = self.__sortKeyValues.setdefault(sortKey, {})
+
+        def cachedKeyFunction(item):
+            try:
+                return values[id(item)][1]
+            except KeyError:
+                value = keyFunction(item)
+                values[id(item)] = (item, value)
+                return value
+
+        self.__sortKeyFunctions[sortKey] = cachedKeyFunction
+        return cachedKeyFunction
+
     def createSortKeyFunction(self, sortKey):
         """createSortKeyFunction returns a function that is passed to the
         builtin list.sort method to extract the sort key from each element
@@ -159,10 +506,10 @@ class Sorter(patterns.ListDecorator):  # classe enfant
                 )
 
     def onAttributeChanged(self, newValue, sender):  # pylint: disable=W0613
-        self.reset()
+        self.resetItems([sender])
 
     def onAttributeChanged_Deprecated(self, event):  # pylint: disable=W0613
-        self.reset()
+        self.resetItems(list(event.sources()))
 
     def _getSortEventTypes(self, attribute):
         try:
@@ -177,14 +524,33 @@ class Sorter(patterns.ListDecorator):  # classe enfant
 
 
 class TreeSorter(Sorter):
+    """
+    Trieur d'éléments composites.
+
+    En mode arborescence, seuls les frères sont comparés entre eux : le
+    trieur garde, pour chaque parent, la liste triée de ses enfants
+    présents dans la liste, et la liste elle-même est le parcours en
+    profondeur de ces listes de frères. Un changement ne retrie que les
+    groupes de frères des éléments concernés.
+    """
+
     def __init__(self, *args, **kwargs):
         self.__rootItems = None  # Cached root items
+        # id(parent) (id(None) pour les racines) -> enfants triés, ou None
+        # lorsque les groupes de frères sont à reconstruire. Les parents
+        # sont indexés par identité : deux éléments égaux (même
+        # identifiant) ont chacun leurs enfants.
+        self.__children = None
         super().__init__(*args, **kwargs)
 
     # @staticmethod
     def treeMode(self):
         return True
 
+    def isWindowed(self):
+        # Les groupes de frères sont toujours triés entièrement.
+        return super().isWindowed() and not self.treeMode()
+
     def createSortKeyFunction(self, key):
         """createSortKeyFunction returns a function that is passed to the
         builtin list.sort method to extract the sort key from each element
@@ -195,13 +561,79 @@ class TreeSorter(Sorter):
             sortCaseSensitive=self._sortCaseSensitive, treeMode=self.treeMode()
         )
 
-    def reset(self, *args, **kwargs):  # pylint: disable=W0221
+    def reset(self, forceEvent=False):  # pylint: disable=W0221
+        self.__invalidateRootItemCache()
+        if not self.treeMode():
+            self.__children = None
+            return super().reset(forceEvent=forceEvent)
+        if self.isFrozen():
+            return
+
+        oldSelf = self[:]
+        children = self.__groupChildren()
+        if self._sortKeys:
+            keyFunction, reverse = self._compositeSortKeyFunction()
+            for siblings in children.values():
+                siblings.sort(key=keyFunction, reverse=reverse)
+        self.__children = children
+        self.__flatten()
+        if forceEvent or self != oldSelf:
+            pub.sendMessage(self.sortEventType(), sender=self)
+
+    @tracing.traced(
+        "TreeSorter.resetItems",
+        itemCount=lambda self, items, *args, **kwargs: len(items),
+    )
+    def resetItems(self, items):
+        """
+        En mode arborescence, retrie les seuls groupes de frères des
+        éléments donnés et des éléments dont la clé de tri dépend d'eux.
+
+        Args :
+            items : Les éléments dont la clé de tri a pu changer.
+        """
         self.__invalidateRootItemCache()
-        return super().reset(*args, **kwargs)
+        if not self.treeMode():
+            return super().resetItems(items)
+
+        affected = set()
+        for item in items:
+            affected.update(self._itemsAffectedBy(item))
+        self._forgetSortKeyValues(affected)
+        if self.isFrozen():
+            return
+        if self.__children is None or not self._sortKeys:
+            self.reset()
+            return
+
+        # Un élément donné absent de son groupe de frères (ajouté pendant
+        # que la liste était gelée, par exemple) : tout est retrié.
+        for item in items:
+            siblings = self.__children.get(id(item.parent()), [])
+            if not any(sibling is item for sibling in siblings):
+                self.reset()
+                return
+        groups = {}
+        for item in affected:
+            parentId = id(item.parent())
+            if parentId not in groups and parentId in self.__children:
+                groups[parentId] = self.__children[parentId]
+
+        keyFunction, reverse = self._compositeSortKeyFunction()
+        changed = False
+        for siblings in groups.values():
+            oldOrder = [id(sibling) for sibling in siblings]
+            siblings.sort(key=keyFunction, reverse=reverse)
+            if oldOrder != [id(sibling) for sibling in siblings]:
+                changed = True
+        if changed:
+            self.__flatten()
+            pub.sendMessage(self.sortEventType(), sender=self)
 
     @patterns.eventSource
     def extendSelf(self, items, event=None):
         self.__invalidateRootItemCache()
+        self.__children = None
         return super().extendSelf(items, event=event)
 
     @patterns.eventSource
@@ -213,19 +645,77 @@ class TreeSorter(Sorter):
             for item in itemsToRemove.copy():
                 itemsToRemove.update(item.children(recursive=True))
         itemsToRemove = [item for item in itemsToRemove if item in self]
+        if self.__children is not None:
+            # Retirer des éléments laisse les groupes de frères triés.
+            removedIds = {id(item) for item in itemsToRemove}
+            for item in itemsToRemove:
+                self.__children.pop(id(item), None)
+                siblings = self.__children.get(id(item.parent()))
+                if siblings:
+                    siblings[:] = [
+                        sibling
+                        for sibling in siblings
+                        if id(sibling) not in removedIds
+                    ]
         return super().removeItemsFromSelf(itemsToRemove, event=event)
 
     def rootItems(self):
         """Return the root items, i.e. items without a parent."""
-        log.debug(
-            f"TreeSorter.rootItems : self.__rootItems={self.__rootItems}."
-        )
+        if self.treeMode():
+            return self.childrenOf(None)
         if self.__rootItems is None:
-            self.__rootItems = [item for item in self if item.parent() is None]
-        log.debug(
-            f"TreeSorter.rootItems : retourne self.__rootItems : {self.__rootItems}."
-        )
+            self.__rootItems = self.__computeRootItems()
         return self.__rootItems
 
+    def childrenOf(self, parent):
+        """
+        Renvoie les enfants de parent présents dans la liste, triés.
+
+        Args :
+            parent : L'élément parent, ou None pour les éléments racines.
+        Returns :
+            (list) : Les enfants triés.
+        """
+        if not self.treeMode():
+            return [item for item in self if item.parent() is parent]
+        if self.__children is None:
+            # Les éléments ont été ajoutés pendant que la liste était
+            # gelée : l'ordre des groupes est celui de la liste.
+            self.__children = self.__groupChildren()
+        return list(self.__children.get(id(parent), []))
+
+    @tracing.traced("TreeSorter.rootItems", itemCount=len)
+    def __computeRootItems(self):
+        return [item for item in self if item.parent() is None]
+
     def __invalidateRootItemCache(self):
         self.__rootItems = None
+
+    def __groupChildren(self):
+        """Regroupe les éléments par parent, dans l'ordre de la liste."""
+        children = {id(None): []}
+        for item in self:
+            children.setdefault(id(item.parent()), []).append(item)
+        return children
+
+    def __flatten(self):
+        """Remplace le contenu de la liste par le parcours en profondeur des
+        groupes de frères. Les enfants dont le parent n'est pas dans la
+        liste suivent, groupe par groupe."""
+        items = []
+
+        def appendSubtrees(siblings):
+            for item in siblings:
+                items.append(item)
+                grandchildren = self.__children.get(id(item))
+                if grandchildren:
+                    appendSubtrees(grandchildren)
+
+        appendSubtrees(self.__children[id(None)])
+        if len(items) < len(self):
+            members = {id(item) for item in self}
+            members.add(id(None))
+            for parentId, siblings in self.__children.items():
+                if parentId not in members:
+                    appendSubtrees(siblings)
+        self[:] = items
@@ -31,66 +31,127 @@ from .category import Category
 
 
 class CategoryFilter(base.Filter):
+    """
+    Filtre qui ne garde que les éléments des catégories filtrées.
+
+    Pour chaque catégorie, l'ensemble des éléments qui lui appartiennent
+    (ceux de la catégorie et de ses sous-catégories, et leurs descendants)
+    est mis en cache. Le cache d'une catégorie est invalidé lorsque des
+    éléments lui sont ajoutés ou retirés, lorsque l'arborescence des
+    catégories change ou lorsqu'un élément qu'il contient gagne ou perd un
+    enfant : activer ou désactiver le filtre d'une catégorie ne recalcule
+    rien.
+    """
+
     def __init__(self, *args, **kwargs):
         self.__categories = kwargs.pop("categories")
         self.__filterOnlyWhenAllCategoriesMatch = kwargs.pop(
             "filterOnlyWhenAllCategoriesMatch", False
         )
+        self.__closures = {}  # catégorie -> éléments qui lui appartiennent
+        self.__observedClasses = set()
         for eventType in (
             self.__categories.addItemEventType(),
             self.__categories.removeItemEventType(),
         ):
             patterns.Publisher().registerObserver(
-                self.onCategoryChanged,
+                self.onCategoriesChanged,
                 eventType=eventType,
                 eventSource=self.__categories,
             )
-        eventTypes = (
+        for eventType in (
             Category.categorizableAddedEventType(),
             Category.categorizableRemovedEventType(),
-            Category.filterChangedEventType(),
-        )
-        for eventType in eventTypes:
+            Category.addChildEventType(),
+            Category.removeChildEventType(),
+        ):
             patterns.Publisher().registerObserver(
-                self.onCategoryChanged, eventType=eventType
+                self.onCategoryContentsChanged, eventType=eventType
             )
+        patterns.Publisher().registerObserver(
+            self.onCategoryChanged, eventType=Category.filterChangedEventType()
+        )
         pub.subscribe(
             self.onFilterMatchingChanged,
             "settings.view.categoryfiltermatchall",
         )
         super().__init__(*args, **kwargs)
+        self.__observeTreeChanges(self.observable())
 
     def detach(self):
         super().detach()
         self.removeObserver(self.onCategoryChanged)
+        self.removeObserver(self.onCategoriesChanged)
+        self.removeObserver(self.onCategoryContentsChanged)
+        self.removeObserver(self.onCategorizableTreeChanged)
 
     def filterItems(self, categorizables):
         filteredCategories = self.__categories.filteredCategories()
         if not filteredCategories:
             return categorizables
 
+        closures = [
+            self.__categorizablesBelongingToCategory(category)
+            for category in filteredCategories
+        ]
         if self.__filterOnlyWhenAllCategoriesMatch:
-            filteredCategorizables = set(categorizables)
-            for category in filteredCategories:
-                filteredCategorizables &= (
-                    self.__categorizablesBelongingToCategory(category)
-                )
+            filteredCategorizables = set(categorizables).intersection(
+                *closures
+            )
         else:
-            filteredCategorizables = set()
-            for category in filteredCategories:
-                filteredCategorizables |= (
-                    self.__categorizablesBelongingToCategory(category)
-                )
+            filteredCategorizables = set().union(*closures)
 
         filteredCategorizables &= self.observable()
         return filteredCategorizables
 
-    @staticmethod
-    def __categorizablesBelongingToCategory(category):
+    def __categorizablesBelongingToCategory(self, category):
+        try:
+            return self.__closures[category]
+        except KeyError:
+            pass
         categorizables = category.categorizables(recursive=True)
         for categorizable in categorizables.copy():
-            categorizables |= set(categorizable.children(recursive=True))
-        return categorizables
+            categorizables.update(categorizable.children(recursive=True))
+        closure = self.__closures[category] = frozenset(categorizables)
+        self.__observeTreeChanges(closure)
+        return closure
+
+    def __observeTreeChanges(self, categorizables):
+        """Suit l'ajout et le retrait d'enfants des éléments de la classe de
+        chacun des éléments donnés : ceux du filtre, dès leur ajout, et ceux
+        des catégories, dont les descendants peuvent être dans le
+        filtre."""
+        for categorizableClass in {type(item) for item in categorizables}:
+            if categorizableClass in self.__observedClasses:
+                continue
+            self.__observedClasses.add(categorizableClass)
+            for eventType in (
+                categorizableClass.addChildEventType(),
+                categorizableClass.removeChildEventType(),
+            ):
+                patterns.Publisher().registerObserver(
+                    self.onCategorizableTreeChanged, eventType=eventType
+                )
+
+    def __forgetCategorizables(self, categorizables):
+        """Invalide le cache des catégories qui contiennent un des éléments
+        donnés. Renvoie True si le cache d'une catégorie a été invalidé."""
+        categorizables = set(categorizables)
+        forgotten = False
+        for category, closure in list(self.__closures.items()):
+            if not closure.isdisjoint(categorizables):
+                del self.__closures[category]
+                forgotten = True
+        return forgotten
+
+    def onAddItem(self, event):
+        self.__observeTreeChanges(event.values())
+        super().onAddItem(event)
+
+    def onRemoveItem(self, event):
+        # Ne pas garder en vie, dans le cache, les éléments supprimés.
+        self.__forgetCategorizables(event.values())
+        super().onRemoveItem(event)
 
     def onFilterMatchingChanged(self, value):
         self.__filterOnlyWhenAllCategoriesMatch = value
@@ -98,3 +159,22 @@ class CategoryFilter(base.Filter):
 
     def onCategoryChanged(self, event):  # pylint: disable=W0613
         self.reset()
+
+    def onCategoriesChanged(self, event):  # pylint: disable=W0613
+        self.__closures.clear()
+        self.reset()
+
+    def onCategoryContentsChanged(self, event):
+        # Les éléments d'une catégorie appartiennent aussi à ses ancêtres.
+        for category in event.sources():
+            self.__closures.pop(category, None)
+            for ancestor in category.ancestors():
+                self.__closures.pop(ancestor, None)
+        self.reset()
+
+    def onCategorizableTreeChanged(self, event):
+        # Les descendants d'un élément appartiennent à ses catégories : le
+        # parent qui gagne ou perd un enfant est la source de l'événement.
+        # Si aucune catégorie ne le contient, le filtre ne change pas.
+        if self.__forgetCategorizables(event.sources()):
+            self.reset()
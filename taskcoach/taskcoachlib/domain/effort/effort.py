@@ -52,15 +52,9 @@ class Effort(baseeffort.BaseEffort, base.object.Object):
         )
         self.__updateDurationCache()
 
-    def __getattribute__(self, name):
-        """Override to prevent methods from being shadowed by instance attributes.
-
-        During copy/paste operations, kwargs from __getcopystate__ can end up
-        as instance attributes that shadow the class methods. This override
-        ensures method lookups always find the class method, not instance attrs.
-        """
-        # Methods that might get shadowed - check directly to avoid recursion
-        _protected = (
+    # Methods that copy/paste must not shadow with instance attributes.
+    _protectedMethodNames = frozenset(
+        (
             "id",
             "task",
             "subject",
@@ -74,16 +68,19 @@ class Effort(baseeffort.BaseEffort, base.object.Object):
             "creationDateTime",
             "modificationDateTime",
         )
-        if name in _protected:
-            # Get the method from the class, not the instance
-            for cls in type(self).__mro__:
-                if name in cls.__dict__:
-                    method = cls.__dict__[name]
-                    if callable(method):
-                        # Return bound method
-                        return method.__get__(self, type(self))
-                    break
-        return object.__getattribute__(self, name)
+    )
+
+    def __setattr__(self, name, value):
+        """Prevent methods from being shadowed by instance attributes.
+
+        During copy/paste operations, kwargs from __getcopystate__ can end up
+        as instance attributes that shadow the class methods. Such
+        assignments are ignored here, when the attribute is set, so that
+        reading an attribute of an effort is a plain attribute lookup.
+        """
+        if name in Effort._protectedMethodNames:
+            return
+        super().__setattr__(name, value)
 
     def setTask(self, task):
         if self._task is None:
@@ -235,7 +232,7 @@ class Effort(baseeffort.BaseEffort, base.object.Object):
 
     def duration(self, now=date.DateTime.now):
         return (
-            now() - self._start
+            now() - self._start.get()
             if self.__cachedDuration is None
             else self.__cachedDuration
         )
@@ -336,8 +333,9 @@ class Effort(baseeffort.BaseEffort, base.object.Object):
         # self.__cachedDuration = (
         #     self._stop - self._start if self._stop else None
         # )
+        stop = self._stop.get()
         self.__cachedDuration = (
-            self._stop.get() - self._start.get() if self._stop else None
+            stop - self._start.get() if stop is not None else None
         )
 
     def isBeingTracked(self, recursive=False):  # pylint: disable=W0613
@@ -18,6 +18,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 
 from .task import Task  # noqa: F401
 from .tasklist import TaskList
+from .dependencygraph import DependencyGraph
 from .status import TaskStatus, inactive, late, active, duesoon, overdue, completed
 from . import filter  # pylint: disable=W0622
 from . import sorter
@@ -25,6 +26,7 @@ from . import sorter
 __all__ = [
     "Task",
     "TaskList",
+    "DependencyGraph",
     "TaskStatus",
     "inactive",
     "late",
@@ -0,0 +1,286 @@
+"""
+Task Coach - Your friendly task manager
+Copyright (C) 2004-2016 Task Coach developers <developers@taskcoach.org>
+
+Task Coach is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Task Coach is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+
+class DependencyGraph(object):
+    """
+    Graphe des conditions préalables des tâches d'une liste de tâches.
+
+    Pour chaque tâche ajoutée, le graphe garde ses conditions préalables
+    (les arcs de la tâche vers ses prérequis) et, dans l'autre sens, les
+    dépendances de chaque prérequis. Il tient à jour le nombre de
+    conditions préalables non terminées de chaque tâche : l'achèvement
+    d'un prérequis, signalé par updateCompletion(), ne touche que ses
+    dépendances.
+
+    Les arcs sont ceux de Task.prerequisites() : ils sont relus par add()
+    et update() quand les conditions préalables d'une tâche changent. Un
+    prérequis qui n'a pas été ajouté au graphe y est tout de même suivi
+    tant qu'une tâche du graphe en dépend.
+
+    Les tâches sont indexées par identité (id()) et non par Object.__eq__,
+    qui compare les identifiants : deux tâches distinctes ne se confondent
+    jamais dans le graphe.
+    """
+
+    def __init__(self, tasks=()):
+        self.__tasks = {}  # id(tâche) -> tâche, nœuds et prérequis suivis
+        self.__prerequisites = {}  # id(tâche) -> id de ses prérequis
+        self.__dependencies = {}  # id(prérequis) -> id de ses dépendances
+        self.__completed = {}  # id(prérequis) -> achevé au dernier comptage
+        self.__incompleteCounts = {}  # id(tâche) -> prérequis non terminés
+        self.add(tasks)
+
+    def __contains__(self, task):
+        return id(task) in self.__prerequisites
+
+    def __len__(self):
+        return len(self.__prerequisites)
+
+    def add(self, tasks):
+        """
+        Ajoute les tâches au graphe, avec leurs conditions préalables. Les
+        arcs d'une tâche déjà dans le graphe sont relus.
+
+        Args :
+            tasks : Les tâches à ajouter.
+        """
+        for task in tasks:
+            self.__tasks[id(task)] = task
+            self.__incompleteCounts.setdefault(id(task), 0)
+            self.__setPrerequisites(task, task.prerequisites())
+
+    def remove(self, tasks):
+        """
+        Retire les tâches du graphe, avec les arcs vers leurs conditions
+        préalables. Une tâche retirée reste suivie comme prérequis tant
+        qu'une tâche du graphe en dépend.
+
+        Args :
+            tasks : Les tâches à retirer.
+        """
+        for task in tasks:
+            key = id(task)
+            if key in self.__prerequisites:
+                self.__setPrerequisites(task, ())
+                del self.__prerequisites[key]
+                del self.__incompleteCounts[key]
+                self.__forget(key)
+
+    def update(self, task):
+        """
+        Relit les conditions préalables de la tâche, si elle est dans le
+        graphe.
+
+        Args :
+            task (Task) : La tâche dont les conditions préalables ont changé.
+        """
+        if id(task) in self.__prerequisites:
+            self.__setPrerequisites(task, task.prerequisites())
+
+    def updateCompletion(self, prerequisite):
+        """
+        Met à jour le nombre de conditions préalables non terminées des
+        dépendances du prérequis, si son achèvement a changé.
+
+        Args :
+            prerequisite (Task) : La tâche dont l'achèvement a pu changer.
+        Returns :
+            (list) : Les tâches du graphe qui n'ont plus, ou ont à nouveau,
+                des conditions préalables non terminées.
+        """
+        key = id(prerequisite)
+        dependencies = self.__dependencies.get(key)
+        if not dependencies:
+            return []
+        completed = self.__isCompleted(prerequisite)
+        if completed == self.__completed[key]:
+            return []
+        self.__completed[key] = completed
+        delta = -1 if completed else 1
+        changedTasks = []
+        for dependency in dependencies:
+            count = self.__incompleteCounts[dependency]
+            self.__incompleteCounts[dependency] = count + delta
+            if (count == 0) != (count + delta == 0):
+                changedTasks.append(self.__tasks[dependency])
+        return changedTasks
+
+    def prerequisites(self, task):
+        """Renvoie les conditions préalables de la tâche dans le graphe."""
+        return self.__tasksOf(self.__prerequisites.get(id(task), ()))
+
+    def dependencies(self, task):
+        """Renvoie les tâches du graphe qui dépendent de la tâche."""
+        return self.__tasksOf(self.__dependencies.get(id(task), ()))
+
+    def incompletePrerequisiteCount(self, task):
+        """
+        Renvoie le nombre de conditions préalables non terminées de la
+        tâche, sans celles de ses ancêtres.
+
+        Args :
+            task (Task) : Une tâche du graphe.
+        Returns :
+            (int) : Le nombre de prérequis non terminés.
+        """
+        return self.__incompleteCounts[id(task)]
+
+    def hasIncompletePrerequisites(self, task):
+        """
+        Renvoie True si l'une des conditions préalables de la tâche ou de
+        ses ancêtres n'est pas terminée, comme Task.status() le détermine.
+        Les ancêtres qui ne sont pas dans le graphe sont examinés
+        directement.
+
+        Args :
+            task (Task) : Une tâche.
+        Returns :
+            (bool) : True s'il reste un prérequis non terminé.
+        """
+        while task is not None:
+            try:
+                if self.__incompleteCounts[id(task)]:
+                    return True
+            except KeyError:
+                if not all(
+                    self.__isCompleted(prerequisite)
+                    for prerequisite in task.prerequisites()
+                ):
+                    return True
+            task = task.parent()
+        return False
+
+    def findCycle(self):
+        """
+        Cherche un cycle de conditions préalables entre les tâches du
+        graphe, par un parcours en profondeur en O(V+E).
+
+        Returns :
+            (list) : Les tâches d'un cycle, chacune étant une condition
+                préalable de la précédente et la première une condition
+                préalable de la dernière, ou None s'il n'y a pas de cycle.
+        """
+        visited = set()
+        for start in self.__prerequisites:
+            if start in visited:
+                continue
+            visited.add(start)
+            path = [start]
+            onPath = {start}
+            stack = [iter(self.__prerequisites[start])]
+            while stack:
+                for prerequisite in stack[-1]:
+                    if prerequisite in onPath:
+                        return self.__tasksOf(
+                            path[path.index(prerequisite):], list
+                        )
+                    if (
+                        prerequisite not in visited
+                        and prerequisite in self.__prerequisites
+                    ):
+                        visited.add(prerequisite)
+                        path.append(prerequisite)
+                        onPath.add(prerequisite)
+                        stack.append(iter(self.__prerequisites[prerequisite]))
+                        break
+                else:
+                    stack.pop()
+                    onPath.discard(path.pop())
+        return None
+
+    def topologicalOrder(self):
+        """
+        Renvoie les tâches du graphe rangées de sorte que chaque tâche vienne
+        après ses conditions préalables, en O(V+E), par exemple pour les
+        traiter en bloc au chargement d'un fichier.
+
+        Les conditions préalables mutuelles sont permises : les tâches qui
+        sont sur un cycle, ou qui en dépendent, viennent à la fin, dans
+        l'ordre où elles ont été ajoutées.
+
+        Returns :
+            (list) : Les tâches du graphe.
+        """
+        inDegrees = {
+            task: sum(
+                1
+                for prerequisite in prerequisites
+                if prerequisite in self.__prerequisites
+            )
+            for task, prerequisites in self.__prerequisites.items()
+        }
+        order = [task for task, inDegree in inDegrees.items() if not inDegree]
+        for task in order:  # order s'allonge pendant le parcours
+            for dependency in self.__dependencies.get(task, ()):
+                inDegrees[dependency] -= 1
+                if not inDegrees[dependency]:
+                    order.append(dependency)
+        if len(order) < len(inDegrees):
+            ordered = set(order)
+            order.extend(
+                task for task in self.__prerequisites if task not in ordered
+            )
+        return self.__tasksOf(order, list)
+
+    def __tasksOf(self, keys, factory=frozenset):
+        return factory(self.__tasks[key] for key in keys)
+
+    def __forget(self, key):
+        if key not in self.__prerequisites and key not in self.__dependencies:
+            del self.__tasks[key]
+
+    def __setPrerequisites(self, task, prerequisites):
+        key = id(task)
+        oldPrerequisites = self.__prerequisites.get(key, set())
+        newPrerequisites = {}
+        for prerequisite in prerequisites:
+            newPrerequisites[id(prerequisite)] = prerequisite
+        for prerequisite in oldPrerequisites - newPrerequisites.keys():
+            self.__unlink(key, prerequisite)
+        for prerequisite in newPrerequisites.keys() - oldPrerequisites:
+            self.__link(key, newPrerequisites[prerequisite])
+        self.__prerequisites[key] = set(newPrerequisites)
+
+    def __link(self, key, prerequisite):
+        prerequisiteKey = id(prerequisite)
+        dependencies = self.__dependencies.setdefault(prerequisiteKey, set())
+        if not dependencies:
+            self.__tasks[prerequisiteKey] = prerequisite
+            self.__completed[prerequisiteKey] = self.__isCompleted(
+                prerequisite
+            )
+        dependencies.add(key)
+        if not self.__completed[prerequisiteKey]:
+            self.__incompleteCounts[key] += 1
+
+    def __unlink(self, key, prerequisiteKey):
+        dependencies = self.__dependencies[prerequisiteKey]
+        dependencies.discard(key)
+        if not self.__completed[prerequisiteKey]:
+            self.__incompleteCounts[key] -= 1
+        if not dependencies:
+            del self.__dependencies[prerequisiteKey]
+            del self.__completed[prerequisiteKey]
+            self.__forget(prerequisiteKey)
+
+    @staticmethod
+    def __isCompleted(task):
+        # Don't call task.completed(): it computes the status of the task,
+        # which leads to infinite recursion with circular dependencies.
+        return task.completionDateTime() != task.maxDateTime
@@ -17,7 +17,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from taskcoachlib import patterns
-from taskcoachlib.domain import base, date
+from taskcoachlib.domain import base, category, date
 
 # try:
 #    from taskcoachlib.thirdparty.pubsub import pub
@@ -39,6 +39,7 @@ class ViewFilter(tasklist.TaskListQueryMixin, base.Filter):
     def registerObservers(self):
         registerObserver = patterns.Publisher().registerObserver
         for eventType in (
+            task.Task.statusChangedEventType(),
             task.Task.plannedStartDateTimeChangedEventType(),
             task.Task.dueDateTimeChangedEventType(),
             task.Task.actualStartDateTimeChangedEventType(),
@@ -69,23 +70,43 @@ class ViewFilter(tasklist.TaskListQueryMixin, base.Filter):
 
     def atMidnight(self):
         """Whether tasks are included in the filter or not may change at
-        midnight."""
-        self.reset()
+        midnight. A TaskList signals the tasks whose status changes with
+        time itself, so only other collections need a full reset."""
+        if self.__taskList() is None:
+            self.reset()
 
     def onTaskStatusChange(self, newValue, sender):  # pylint: disable=W0613
-        self.reset()
+        # Le statut des dépendances dépend de l'achèvement de leurs
+        # prérequis.
+        self.resetItems([sender] + list(sender.dependencies()))
 
     def onTaskStatusChange_Deprecated(
         self, event=None
     ):  # pylint: disable=W0613
-        self.reset()
+        if event is None:
+            self.reset()
+        else:
+            self.resetItems(list(event.sources()))
 
     def hideTaskStatus(self, status, hide=True):
         if hide:
             self.__statusesToHide.add(status)
         else:
             self.__statusesToHide.discard(status)
-        self.reset()
+        # Seules les tâches qui ont ce statut peuvent apparaître ou
+        # disparaître : la liste de tâches les connaît sans recalculer le
+        # statut de toutes les tâches.
+        taskList = self.__taskList()
+        if taskList is None:
+            self.reset()
+        else:
+            self.resetItems(taskList.tasksWithStatus(status))
+
+    def __taskList(self):
+        """Renvoie la liste de tâches observée, si elle range ses tâches par
+        statut, sinon None."""
+        observable = self.observable(recursive=True)
+        return observable if hasattr(observable, "tasksWithStatus") else None
 
     def hideCompositeTasks(self, hide=True):
         self.__hideCompositeTasks = hide
@@ -119,7 +140,15 @@ class ViewFilter(tasklist.TaskListQueryMixin, base.Filter):
         """
         # Call parent reset first (does normal filtering + ancestor addition)
         super().reset(event=event)
+        self.__removeOrphanAncestors(event)
+
+    @patterns.eventSource
+    def resetItems(self, items, event=None):
+        """Override resetItems to apply the same orphan cleanup as reset."""
+        super().resetItems(items, event=event)
+        self.__removeOrphanAncestors(event)
 
+    def __removeOrphanAncestors(self, event):
         if not self.treeMode():
             return
 
@@ -175,3 +204,14 @@ class ViewFilter(tasklist.TaskListQueryMixin, base.Filter):
         return len(self.__statusesToHide) != 0 or (
             self.__hideCompositeTasks and not self.treeMode()
         )
+
+
+class TaskFilterPipeline(
+    base.FilterPipeline,
+    base.SearchFilter,
+    category.filter.CategoryFilter,
+    ViewFilter,
+    base.DeletedFilter,
+):
+    """Les filtres des visionneuses de tâches (recherche, catégories,
+    statuts, tâches supprimées) fusionnés en un seul décorateur."""
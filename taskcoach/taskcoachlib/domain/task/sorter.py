@@ -53,6 +53,10 @@ class Sorter(base.TreeSorter):
             task.Task.plannedStartDateTimeChangedEventType(),
             task.Task.actualStartDateTimeChangedEventType(),
             task.Task.completionDateTimeChangedEventType(),
+            # Le statut change aussi avec le temps (une tâche devient active,
+            # en retard...) : la clé de tri par statut d'abord doit alors
+            # être recalculée.
+            task.Task.statusChangedEventType(),
         ):
             pub.subscribe(self.onAttributeChanged, eventType)
             # pubsub.core.callables.ListenerMismatchError: Listener "Sorter.onAttributeChanged"
@@ -65,6 +69,7 @@ class Sorter(base.TreeSorter):
             self.observable().setTreeMode(treeMode)
         except AttributeError:
             pass
+        self.invalidateSortKeys()
         self.reset(forceEvent=True)
 
     def treeMode(self):
@@ -72,6 +77,7 @@ class Sorter(base.TreeSorter):
 
     def sortByTaskStatusFirst(self, sortByTaskStatusFirst):
         self.__sortByTaskStatusFirst = sortByTaskStatusFirst
+        self.invalidateSortKeys()
         # We don't need to invoke self.reset() here since when this property is
         # changed, the sort order also changes which in turn will cause
         # self.reset() to be called.
@@ -102,6 +108,16 @@ class Sorter(base.TreeSorter):
         else:
             return lambda the_task: []
 
+    def _itemsAffectedBy(self, item):
+        # Le statut des dépendances, et donc leur clé de tri lorsque les
+        # tâches sont triées par statut, dépend de l'achèvement de leurs
+        # prérequis.
+        items = super()._itemsAffectedBy(item)
+        for dependency in item.dependencies():
+            items.append(dependency)
+            items.extend(dependency.children(recursive=True))
+        return items
+
     def _registerObserverForAttribute(self, attribute):
         # log.debug(f"Registering observer for attribute {attribute}.")
         # Sorter is always observing task dates and prerequisites because
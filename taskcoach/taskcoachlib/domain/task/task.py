@@ -60,6 +60,7 @@ Dépendances :
 # Multi-GUI : task.py ne plante plus s'il est importé
 # dans un environnement sans wx (comme le futur mode Tkinter),
 # car il renvoie des chaînes hexadécimales pour les couleurs au lieu d'objets wx.Colour.
+import itertools
 import logging
 import ast
 import weakref
@@ -118,6 +119,11 @@ class Task(
     """
 
     maxDateTime = date.DateTime()
+    # Agrégats récursifs en cache (voir __aggregate). La génération change
+    # lorsqu'un réglage dont dépendent les agrégats change.
+    __aggregatesGeneration = 0
+    __aggregatesVersion = None
+    __aggregates = None
 
     def __init__(
         self,
@@ -214,6 +220,10 @@ class Task(
         #     print("Task.__init__ : ⚠️ La tâche a une date d'achèvement, on force son statut à 'completed'")
         #     status = mod_status.completed  # 🛠️ Corrige le statut à 2 (completed)
         self.__status = status
+        # Validité du statut en cache : version de la structure des tâches
+        # et moment où le statut peut changer avec le temps (voir status()).
+        self.__statusStructureVersion = None
+        self.__statusValidUntil = None
         # print(f"✅ Task.__init__ : après self.__status = {self.__status} ({type(self.__status)})")
 
         # print(f"✅ Task.__init__ : avant super() initialisation de self.__status = status = {self.__status}")
@@ -939,7 +949,11 @@ class Task(
     @staticmethod
     def timeLeftSortFunction(**kwargs):
         recursive = kwargs.get("treeMode", False)
-        return lambda task: task.timeLeft(recursive=recursive)
+        # Le temps restant est l'échéance moins l'instant présent : trier sur
+        # l'échéance donne le même ordre, avec une clé qui ne dépend pas de
+        # l'heure à laquelle elle est calculée et peut donc être gardée en
+        # cache par le trieur.
+        return lambda task: task.dueDateTime(recursive=recursive)
 
     @classmethod
     def timeLeftSortEventTypes(class_):
@@ -992,7 +1006,7 @@ class Task(
             return
         self.__actualStartDateTime = actualStartDateTime
         if recursive:
-            for child in self.children(recursive=True):
+            for child in self.iterChildren(recursive=True):
                 child.setActualStartDateTime(actualStartDateTime)
         # self.__actualStartDateTime.set(actualStartDateTime, event=event)
         if hasattr(self.__actualStartDateTime, "set"):
@@ -1090,14 +1104,21 @@ class Task(
         #     completionDateTime or date.Now(), event=event
         # )
         if hasattr(self.__completionDateTime, "set"):
+            # _onCompletionDateTimeChanged() fait le reste lorsque la date
+            # change. Ne pas continuer : la suite remplacerait l'attribut
+            # par la valeur brute.
             self.__completionDateTime.set(
                 completionDateTime or date.Now(), event=event
             )
+            return
         else:
             # Si c'est déjà une valeur DateTime, on la remplace directement
             self.__completionDateTime = completionDateTime or date.Now()
             # Note: Si c'est une valeur brute, les événements de mise à jour
             # de l'UI ne seront pas envoyés, mais au moins ça ne crash plus.
+            # Le statut gardé en cache, lui, doit être oublié : la suite
+            # peut s'arrêter avant recomputeAppearance().
+            self.__status = None
         completionDateTime = completionDateTime or date.Now()
         if completionDateTime == self.__completionDateTime:
             return
@@ -1150,6 +1171,8 @@ class Task(
 
     def _onCompletionDateTimeChanged(self, event):
         self.__status = None
+        # La priorité récursive des ancêtres ignore les enfants achevés.
+        self._invalidateAggregates("priority")
         # Use direct datetime comparison instead of self.completed() because
         # computedStatus() cache is stale at this point (not yet recomputed).
         completionDateTime = self.completionDateTime()
@@ -1233,6 +1256,7 @@ class Task(
     def onMarkParentCompletedWhenAllChildrenCompletedChanged(self, value):
         """When the global setting changes, send a percentage completed
         changed if necessary."""
+        Task.__aggregatesGeneration += 1
         if self.shouldMarkCompletedWhenAllChildrenCompleted() is None and any(
             [child.percentageComplete(True) for child in self.children()]
         ):
@@ -1305,76 +1329,76 @@ class Task(
     def status(self):
         """Retourne l'état actuel de la tâche sous forme d'une instance de TaskStatus.
 
-        Retourne toujours une instance de TaskStatus.
+        Le statut, calculé par computeStatus(), est gardé en cache avec le
+        moment où il peut changer avec le seul passage du temps
+        (nextStatusTransition()). Il est recalculé lorsque l'horloge
+        atteint ce moment, lorsque la structure des tâches change, ou
+        lorsque recomputeAppearance() l'oublie : changement d'une date,
+        d'une condition préalable ou de l'achèvement d'une condition
+        préalable.
 
         Returns :
             TaskStatus : Statut actuel de la tâche.
         """
-        # print(f"DEBUG - Task.status() appelé pour {self} - self.__status = {self.__status} ({type(self.__status)})")
-        # if not isinstance(self.__status, mod_status.TaskStatus):
-        #     raise TypeError(f"Task.status : self.__status est invalide : {self.__status} ({type(self.__status)})")
-
-        # print(f"Task.status : 🔍 Calcul du statut pour {self.subject()} :")
-        # print(f"   - completionDateTime = {self.completionDateTime()}")
-        # print(f"   - maxDateTime = {self.maxDateTime}")
-        # print(f"   - dueDateTime = {self.dueDateTime()}")
-        # print(f"   - actualStartDateTime = {self.actualStartDateTime()}")
-        # print(f"   - plannedStartDateTime = {self.plannedStartDateTime()}")
-        # print(f"   - prerequisites = {[p.subject() for p in self.prerequisites(recursive=True, upwards=True)]}")
-
-        # if self.__status:
-        #     # print(f"Task.status :    ✅ Statut de {self.subject()} déjà défini : {self.__status}")
-        #     # if isinstance(self.__status, int):  # Vérifie si self.__status est un entier
-        #     #     # print(
-        #     #     #     f"Task.status : ⚠️ Correction nécessaire: self.__status = {self.__status} est un int, conversion en TaskStatus requise.")
-        #     #     self.__status = mod_status.from_int(self.__status)  # Convertit l'entier en TaskStatus
-        #     # print(f"Task.status : ✅ Correction effectuée: self.__status = {self.__status}")
-        #     return self.__status
-        # print(f"Task.status : completionDateTime = {self.completionDateTime()}, maxDateTime = {self.maxDateTime}")
-
-        # # if self.completionDateTime() != self.maxDateTime:
-        # if self.completionDateTime() == self.maxDateTime:
-        #     # print(f"Task.status :    ✅ Statut de {self.subject()} = completed (2)")
-        #     self.__status = mod_status.completed
-        #     # print(f"Task.status() : self.__status devient {self.__status} normalement {mod_status.completed}")
+        now = date.Now()
         if (
-            self.completionDateTime()
-            and self.completionDateTime() != self.maxDateTime
+            self.__status is not None
+            and self.__statusStructureVersion
+            == patterns.Composite.structureVersion()
+            and now < self.__statusValidUntil
         ):
-            # print(f"✅ Task.status : {self.subject()} est terminé (completed)")
-            self.__status = mod_status.completed
-        else:
-            # print("Task.status :    ⚠️ La tâche n'est pas terminée, on continue l'analyse...")
-            now = date.Now()
-            if self.dueDateTime() < now:
-                # print(f"Task.status :    ✅ Statut de {self.subject()} = overdue (3)")
-                self.__status = mod_status.overdue
-            elif 0 <= self.timeLeft().hours() < self.__dueSoonHours:
-                # print(f"Task.status :    ✅ Statut de {self.subject()} = duesoon (4)")
-                self.__status = mod_status.duesoon
-            elif self.actualStartDateTime() <= now:
-                # print(f"Task.status :    ✅ Statut de {self.subject()} = active (1)")
-                self.__status = mod_status.active
-            # Don't call prerequisite.completed() because it will lead to infinite
-            # recursion in the case of circular dependencies:
-            elif any(
-                [
-                    prerequisite.completionDateTime() == self.maxDateTime
-                    for prerequisite in self.prerequisites(
-                        recursive=True, upwards=True
-                    )
-                ]
-            ):
-                # print("Task.status :    ✅ Statut = inactive (0) (à cause des prérequis)")
-                self.__status = mod_status.inactive
-            elif self.plannedStartDateTime() < now:
-                # print("Task.status :    ✅ Statut = late (5)")
-                self.__status = mod_status.late
-            else:
-                # print("Task.status :    ✅ Statut = inactive (0)")
-                self.__status = mod_status.inactive
+            return self.__status
+        # Don't call prerequisite.completed() because it will lead to infinite
+        # recursion in the case of circular dependencies:
+        self.__status = self.computeStatus(
+            completionDT=self.completionDateTime(),
+            dueDT=self.dueDateTime(),
+            actualStartDT=self.actualStartDateTime(),
+            plannedStartDT=self.plannedStartDateTime(),
+            dueSoonHours=self.__dueSoonHours,
+            hasIncompletePrerequisites=self.__hasIncompletePrerequisites(),
+            now=now,
+            maxDateTime=self.maxDateTime,
+        )[0]
+        self.__statusStructureVersion = patterns.Composite.structureVersion()
+        self.__statusValidUntil = (
+            self.nextStatusTransition(now) or self.maxDateTime
+        )
         return self.__status
 
+    def nextStatusTransition(self, now=None):
+        """
+        Renvoie le prochain moment où le statut de la tâche peut changer
+        avec le seul passage du temps : le début de la période « bientôt
+        due », l'échéance, et les dates de début effectif et prévue.
+
+        Args :
+            now (DateTime) : (facultatif) Le moment présent.
+        Returns :
+            (DateTime) : Le plus proche de ces moments qui n'est pas passé,
+                ou None si le statut de la tâche ne dépend plus du temps.
+        """
+        if self.completionDateTime() != self.maxDateTime:
+            return None
+        if now is None:
+            now = date.Now()
+        dueDateTime = self.dueDateTime()
+        transitions = [
+            self.actualStartDateTime(),
+            self.plannedStartDateTime(),
+            dueDateTime,
+        ]
+        if dueDateTime != self.maxDateTime:
+            transitions.append(
+                dueDateTime - date.TimeDelta(hours=self.__dueSoonHours)
+            )
+        upcoming = [
+            transition
+            for transition in transitions
+            if now <= transition < self.maxDateTime
+        ]
+        return min(upcoming) if upcoming else None
+
     @classmethod
     def statusChangedEventType(class_):
         return "pubsub.task.status"
@@ -1456,12 +1480,7 @@ class Task(
         Fires statusChangedEventType if status actually changed.
         """
         # Check prerequisites
-        hasIncompletePrereqs = any(
-            prerequisite.completionDateTime() == self.maxDateTime
-            for prerequisite in self.prerequisites(
-                recursive=True, upwards=True
-            )
-        )
+        hasIncompletePrereqs = self.__hasIncompletePrerequisites()
 
         # Call the single source of truth
         newStatus, newSource = self.computeStatus(
@@ -1540,6 +1559,51 @@ class Task(
             date.Scheduler().schedule(self.onDueSoon, newDueSoonDateTime)
         self.recomputeAppearance()
 
+    # Recursive aggregates
+
+    def __aggregate(self, name, compute):
+        """
+        Renvoie la valeur en cache de l'agrégat récursif name (temps passé,
+        budget, priorité...), calculée par compute() si elle est à
+        recalculer.
+
+        Les valeurs sont oubliées par _invalidateAggregates(), de la tâche
+        modifiée jusqu'à la racine, et toutes à la fois lorsque la structure
+        des tâches (parents et enfants) change.
+
+        Args :
+            name (str) : Le nom de l'agrégat.
+            compute : La fonction qui calcule l'agrégat.
+        Returns :
+            La valeur de l'agrégat.
+        """
+        version = (
+            patterns.Composite.structureVersion(),
+            Task.__aggregatesGeneration,
+        )
+        if self.__aggregatesVersion != version:
+            self.__aggregates = {}
+            self.__aggregatesVersion = version
+        try:
+            return self.__aggregates[name]
+        except KeyError:
+            value = self.__aggregates[name] = compute()
+            return value
+
+    def _invalidateAggregates(self, *names):
+        """
+        Oublie les agrégats récursifs donnés de la tâche et de ses ancêtres.
+
+        Args :
+            names (str) : Les noms des agrégats.
+        """
+        task = self
+        while task is not None:
+            if task.__aggregates:
+                for name in names:
+                    task.__aggregates.pop(name, None)
+            task = task.parent()
+
     # effort related methods:
 
     def efforts(self, recursive=False):
@@ -1550,7 +1614,14 @@ class Task(
         return self._efforts + childEfforts
 
     def isBeingTracked(self, recursive=False):
-        return self.activeEfforts(recursive)
+        # S'arrête au premier effort suivi, sans construire la liste des
+        # efforts du sous-arbre comme activeEfforts().
+        tasks = self.walk() if recursive else (self,)
+        return any(
+            effort.isBeingTracked()
+            for task in tasks
+            for effort in task._efforts
+        )
 
     def activeEfforts(self, recursive=False):
         return [
@@ -1571,11 +1642,12 @@ class Task(
         wasTracking = self.isBeingTracked()
         oldValue = self._efforts[:]
         self._efforts.append(effort)
+        self._invalidateAggregates("timeSpent", "revenue")
         if effort.getStart() < self.actualStartDateTime():
             self.setActualStartDateTime(effort.getStart())
         pub.sendMessage(
             self.effortsChangedEventType(),
-            newValue=(self._efforts, oldValue),
+            newValue=(self._efforts[:], oldValue),
             sender=self,
         )
         if effort.isBeingTracked() and not wasTracking:
@@ -1587,6 +1659,7 @@ class Task(
         return "pubsub.task.efforts"
 
     def sendTrackingChangedMessage(self, tracking):
+        self._invalidateAggregates("timeSpent", "revenue")
         self.recomputeAppearance()
         pub.sendMessage(
             self.trackingChangedEventType(), newValue=tracking, sender=self
@@ -1609,9 +1682,10 @@ class Task(
             return
         oldValue = self._efforts[:]
         self._efforts.remove(effort)
+        self._invalidateAggregates("timeSpent", "revenue")
         pub.sendMessage(
             self.effortsChangedEventType(),
-            newValue=(self._efforts, oldValue),
+            newValue=(self._efforts[:], oldValue),
             sender=self,
         )
         if effort.isBeingTracked() and not self.isBeingTracked():
@@ -1627,9 +1701,10 @@ class Task(
             return
         oldValue = self._efforts[:]
         self._efforts = efforts
+        self._invalidateAggregates("timeSpent", "revenue")
         pub.sendMessage(
             self.effortsChangedEventType(),
-            newValue=(self._efforts, oldValue),
+            newValue=(self._efforts[:], oldValue),
             sender=self,
         )
         self.sendTimeSpentChangedMessage()
@@ -1641,12 +1716,38 @@ class Task(
     # Time spent
 
     def timeSpent(self, recursive=False):
+        if recursive:
+            stopped, tracked = self.__timeSpentParts()
+            return sum((effort.duration() for effort in tracked), stopped)
         return sum(
-            (effort.duration() for effort in self.efforts(recursive)),
+            (effort.duration() for effort in self.efforts()),
             date.TimeDelta(),
         )
 
+    def __timeSpentParts(self):
+        """
+        Renvoie, pour le sous-arbre de la tâche, la durée totale des
+        efforts arrêtés et les efforts en cours, dont la durée change avec
+        le temps et doit être calculée à chaque fois.
+        """
+        return self.__aggregate("timeSpent", self.__computeTimeSpentParts)
+
+    def __computeTimeSpentParts(self):
+        stopped = date.TimeDelta()
+        tracked = []
+        for effort in self._efforts:
+            if effort.getStop() is None:
+                tracked.append(effort)
+            else:
+                stopped += effort.duration()
+        for child in self.children():
+            childStopped, childTracked = child.__timeSpentParts()
+            stopped += childStopped
+            tracked.extend(childTracked)
+        return stopped, tuple(tracked)
+
     def sendTimeSpentChangedMessage(self):
+        self._invalidateAggregates("timeSpent", "revenue")
         pub.sendMessage(
             self.timeSpentChangedEventType(),
             newValue=self.timeSpent(),
@@ -1686,10 +1787,14 @@ class Task(
         Args :
             recursive (bool) : Si vrai, prend en compte les sous-tâches.
         """
-        result = self.__budget
         if recursive:
-            for task in self.children():
-                result += task.budget(recursive)
+            return self.__aggregate("budget", self.__computeBudget)
+        return self.__budget
+
+    def __computeBudget(self):
+        result = self.__budget
+        for task in self.children():
+            result += task.budget(recursive=True)
         return result
 
     def setBudget(self, budget):
@@ -1702,6 +1807,7 @@ class Task(
         if budget == self.__budget:
             return
         self.__budget = budget
+        self._invalidateAggregates("budget")
         self.sendBudgetChangedMessage()
         self.sendBudgetLeftChangedMessage()
 
@@ -2181,30 +2287,37 @@ class Task(
 
     def percentageComplete(self, recursive=False):
         if recursive:
-            if self.shouldMarkCompletedWhenAllChildrenCompleted() is None:
-                # pylint: disable=E1101
-                ignore_me = self.settings.getboolean(
-                    "behavior", "markparentcompletedwhenallchildrencompleted"
-                )
-            else:
-                ignore_me = self.shouldMarkCompletedWhenAllChildrenCompleted()
-            percentages = []
-            if self.__percentageComplete > 0 or not ignore_me:
-                percentages.append(self.__percentageComplete)
-            percentages.extend(
-                [
-                    child.percentageComplete(recursive)
-                    for child in self.children()
-                ]
+            return self.__aggregate(
+                "percentageComplete", self.__computePercentageComplete
             )
-            return sum(percentages) // len(percentages) if percentages else 0
         else:
-            return self.__percentageComplete
+            return self.__percentageComplete.get()
+
+    def __computePercentageComplete(self):
+        if self.shouldMarkCompletedWhenAllChildrenCompleted() is None:
+            # pylint: disable=E1101
+            ignore_me = self.settings.getboolean(
+                "behavior", "markparentcompletedwhenallchildrencompleted"
+            )
+        else:
+            ignore_me = self.shouldMarkCompletedWhenAllChildrenCompleted()
+        percentages = []
+        percentageComplete = self.__percentageComplete.get()
+        if percentageComplete > 0 or not ignore_me:
+            percentages.append(percentageComplete)
+        percentages.extend(
+            [
+                child.percentageComplete(recursive=True)
+                for child in self.children()
+            ]
+        )
+        return sum(percentages) // len(percentages) if percentages else 0
 
     def setPercentageComplete(self, percentage, event=None):
         self.__percentageComplete.set(percentage, event=event)
 
     def _onPercentageCompleteChanged(self, event):
+        self._invalidateAggregates("percentageComplete")
         percentage = self.__percentageComplete.get()
         if percentage == 100 and self.completionDateTime() == self.maxDateTime:
             self.setCompletionDateTime(date.Now())
@@ -2256,15 +2369,18 @@ class Task(
             recursive (bool) : Si vrai, prend en compte les sous-tâches.
         """
         if recursive:
-            childPriorities = [
-                child.priority(recursive=True)
-                for child in self.children()
-                if not child.completed()
-            ]
-            return max(childPriorities + [self.__priority])
+            return self.__aggregate("priority", self.__computePriority)
         else:
             return self.__priority
 
+    def __computePriority(self):
+        childPriorities = [
+            child.priority(recursive=True)
+            for child in self.children()
+            if not child.completed()
+        ]
+        return max(childPriorities + [self.__priority])
+
     def setPriority(self, priority):
         """
         Définit la priorité de la tâche.
@@ -2275,6 +2391,7 @@ class Task(
         if priority == self.__priority:
             return
         self.__priority = priority
+        self._invalidateAggregates("priority")
         self.sendPriorityChangedMessage()
 
     def sendPriorityChangedMessage(self):
@@ -2313,6 +2430,7 @@ class Task(
         if hourlyFee == self.__hourlyFee:
             return
         self.__hourlyFee = hourlyFee
+        self._invalidateAggregates("revenue")
         pub.sendMessage(
             self.hourlyFeeChangedEventType(), newValue=hourlyFee, sender=self
         )
@@ -2337,17 +2455,20 @@ class Task(
     # Fixed fee
 
     def fixedFee(self, recursive=False):
-        childFixedFees = (
-            sum(child.fixedFee(recursive) for child in self.children())
-            if recursive
-            else 0
+        if recursive:
+            return self.__aggregate("fixedFee", self.__computeFixedFee)
+        return self.__fixedFee
+
+    def __computeFixedFee(self):
+        return self.__fixedFee + sum(
+            child.fixedFee(recursive=True) for child in self.children()
         )
-        return self.__fixedFee + childFixedFees
 
     def setFixedFee(self, fixedFee):
         if fixedFee == self.__fixedFee:
             return
         self.__fixedFee = fixedFee
+        self._invalidateAggregates("fixedFee", "revenue")
         pub.sendMessage(
             self.fixedFeeChangedEventType(), newValue=fixedFee, sender=self
         )
@@ -2376,6 +2497,15 @@ class Task(
     # Revenue
 
     def revenue(self, recursive=False):
+        if recursive and not self.__timeSpentParts()[1]:
+            # Sans effort en cours dans le sous-arbre, le revenu ne dépend
+            # pas de l'heure : il peut être gardé en cache.
+            return self.__aggregate(
+                "revenue", lambda: self.__computeRevenue(recursive=True)
+            )
+        return self.__computeRevenue(recursive)
+
+    def __computeRevenue(self, recursive):
         childRevenues = (
             sum(child.revenue(recursive) for child in self.children())
             if recursive
@@ -2592,10 +2722,20 @@ class Task(
                 recursive=True, upwards=True
             )
         elif recursive and not upwards:
-            for child in self.children(recursive=True):
+            for child in self.iterChildren(recursive=True):
                 prerequisites |= child.prerequisites()
         return prerequisites
 
+    def __hasIncompletePrerequisites(self):
+        """Renvoie True si l'une des conditions préalables de la tâche ou de
+        ses ancêtres (prerequisites(recursive=True, upwards=True)) n'est pas
+        terminée. S'arrête à la première trouvée."""
+        for task in itertools.chain((self,), self.iterAncestors()):
+            for prerequisite in task.prerequisites():
+                if prerequisite.completionDateTime() == self.maxDateTime:
+                    return True
+        return False
+
     def setPrerequisites(self, prerequisites):
         prerequisites = set(prerequisites)
         if prerequisites == self.prerequisites():
@@ -2688,7 +2828,7 @@ class Task(
                 recursive=True, upwards=True
             )
         elif recursive and not upwards:
-            for child in self.children(recursive=True):
+            for child in self.iterChildren(recursive=True):
                 dependencies |= child.dependencies()
         return dependencies
 
@@ -2774,6 +2914,7 @@ class Task(
         if newValue == self.__shouldMarkCompletedWhenAllChildrenCompleted:
             return
         self.__shouldMarkCompletedWhenAllChildrenCompleted = newValue
+        self._invalidateAggregates("percentageComplete")
         pub.sendMessage(
             self.shouldMarkCompletedWhenAllChildrenCompletedChangedEventType(),
             newValue=newValue,
@@ -2904,3 +3045,7 @@ class Task(
     @classmethod
     def notesChangedEventType(cls):
         pass
+
+
+# Les messages pubsub.task.efforts portent (efforts, anciens efforts).
+patterns.Publisher.registerDeltaTopic(Task.effortsChangedEventType())
@@ -20,10 +20,15 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 # from builtins import object
+import heapq
+import itertools
 from taskcoachlib.i18n import _
-from taskcoachlib.domain import categorizable
+from pubsub import pub
+from taskcoachlib.domain import categorizable, date
 from taskcoachlib import help, operating_system  # pylint: disable=W0622
+from taskcoachlib import patterns
 from . import task
+from .dependencygraph import DependencyGraph
 
 
 class TaskListQueryMixin(object):
@@ -41,12 +46,28 @@ class TaskListQueryMixin(object):
         Returns :
             count (dict) : Un dictionnaire dont les clés sont les statuts possibles.
         """
-        statuses = [
-            eachTask.status() for eachTask in self if not eachTask.isDeleted()
-        ]
+        try:
+            taskList = self.observable(recursive=True)
+            tasksWithStatus = taskList.tasksWithStatus
+        except AttributeError:
+            statuses = [
+                eachTask.status()
+                for eachTask in self
+                if not eachTask.isDeleted()
+            ]
+            count = dict()
+            for status in task.Task.possibleStatuses():
+                count[status] = statuses.count(status)
+            return count
+        # Les tâches sont déjà rangées par statut dans la liste de tâches :
+        # il suffit de compter celles qui sont aussi dans cette collection.
         count = dict()
         for status in task.Task.possibleStatuses():
-            count[status] = statuses.count(status)
+            count[status] = sum(
+                1
+                for eachTask in tasksWithStatus(status) & self
+                if not eachTask.isDeleted()
+            )
         return count
 
 
@@ -101,6 +122,236 @@ class TaskList(TaskListQueryMixin, categorizable.CategorizableContainer):
     # TypeError: unsupported operand type(s) for +: 'NoneType' and 'str'
     newItemHelpText = help.taskNew
 
+    def __init__(self, *args, **kwargs):
+        # Le statut de chaque tâche lors de sa dernière mise à jour, les
+        # tâches rangées par statut et les tâches supprimées. Ils sont mis à
+        # jour tâche par tâche, à partir des événements qui peuvent changer
+        # le statut d'une tâche et des transitions de statut dues au seul
+        # passage du temps.
+        self.__statuses = {}
+        self.__tasksWithStatus = {
+            status: set() for status in task.Task.possibleStatuses()
+        }
+        self.__deletedTasks = set()
+        # Les prochaines transitions de statut, dans un tas trié par date et
+        # heure. Les entrées périmées (tâche retirée, transition déplacée)
+        # sont ignorées lorsqu'elles arrivent en tête du tas.
+        self.__transitions = []
+        self.__nextTransitions = {}  # tâche -> sa prochaine transition
+        self.__transitionCounter = itertools.count()
+        # Les conditions préalables des tâches, dans les deux sens, avec le
+        # nombre de prérequis non terminés de chaque tâche.
+        self.__dependencyGraph = DependencyGraph()
+        super().__init__(*args, **kwargs)
+        for eventType in (
+            task.Task.statusChangedEventType(),
+            task.Task.plannedStartDateTimeChangedEventType(),
+            task.Task.dueDateTimeChangedEventType(),
+            task.Task.actualStartDateTimeChangedEventType(),
+        ):
+            pub.subscribe(self.onTaskStatusMayHaveChanged, eventType)
+        pub.subscribe(
+            self.onCompletionDateTimeChanged,
+            task.Task.completionDateTimeChangedEventType(),
+        )
+        pub.subscribe(
+            self.onPrerequisitesChanged,
+            task.Task.prerequisitesChangedEventType(),
+        )
+        for eventType in (
+            task.Task.appearanceChangedEventType(),  # Proxy for status changes
+            task.Task.markDeletedEventType(),
+            task.Task.markNotDeletedEventType(),
+        ):
+            patterns.Publisher().registerObserver(
+                self.onTasksChanged, eventType=eventType
+            )
+        pub.subscribe(self.onDateChanged, "timer.date")
+        pub.subscribe(self.onEverySecond, "timer.second")
+
+    @patterns.eventSource
+    def extend(self, tasks, event=None):
+        super().extend(tasks, event=event)
+        tasks = self._compositesAndAllChildren(tasks)
+        self.__dependencyGraph.add(
+            eachTask for eachTask in tasks if eachTask in self
+        )
+        self.__updateStatuses(tasks)
+
+    @patterns.eventSource
+    def removeItems(self, tasks, event=None):
+        super().removeItems(tasks, event=event)
+        tasks = self._compositesAndAllChildren(tasks)
+        self.__dependencyGraph.remove(
+            eachTask for eachTask in tasks if eachTask not in self
+        )
+        self.__updateStatuses(tasks)
+
+    @patterns.eventSource
+    def clear(self, event=None):
+        tasks = tuple(self)
+        super().clear(event=event)
+        self.__dependencyGraph.remove(tasks)
+        self.__updateStatuses(tasks)
+
+    def dependencyGraph(self):
+        """
+        Renvoie le graphe des conditions préalables des tâches de la liste.
+
+        Returns :
+            (DependencyGraph) : Le graphe, tenu à jour par la liste.
+        """
+        return self.__dependencyGraph
+
+    def tasksWithStatus(self, status):
+        """
+        Renvoie les tâches qui ont le statut donné, y compris celles qui
+        sont marquées supprimées, sans recalculer le statut des tâches.
+
+        Args :
+            status (TaskStatus) : Le statut recherché.
+        Returns :
+            (frozenset) : Les tâches qui ont ce statut.
+        """
+        return frozenset(self.__tasksWithStatus[status])
+
+    def nrOfTasksPerStatus(self):
+        """
+        Renvoie le nombre de tâches non supprimées pour chaque statut
+        possible, à partir des tâches rangées par statut.
+
+        Returns :
+            count (dict) : Un dictionnaire dont les clés sont les statuts
+                possibles.
+        """
+        return {
+            status: len(tasks) - len(tasks & self.__deletedTasks)
+            for status, tasks in self.__tasksWithStatus.items()
+        }
+
+    def onTaskStatusMayHaveChanged(self, newValue, sender):
+        # pylint: disable=W0613
+        self.__updateStatuses([sender])
+
+    def onCompletionDateTimeChanged(self, newValue, sender):
+        # pylint: disable=W0613
+        # Le statut des dépendances ne change que si elles n'ont plus, ou à
+        # nouveau, de prérequis non terminé. Celui de leurs sous-tâches
+        # aussi : elles héritent des prérequis de leurs ancêtres.
+        tasks = [sender]
+        for dependency in self.__dependencyGraph.updateCompletion(sender):
+            tasks.append(dependency)
+            tasks.extend(dependency.children(recursive=True))
+        self.__updateStatuses(tasks)
+
+    def onPrerequisitesChanged(self, newValue, sender):
+        # pylint: disable=W0613
+        self.__dependencyGraph.update(sender)
+        self.__updateStatuses([sender] + sender.children(recursive=True))
+
+    def onTasksChanged(self, event):
+        self.__updateStatuses(event.sources())
+
+    def onDateChanged(self, timestamp):
+        self.updateStatusTransitions(timestamp)
+
+    def onEverySecond(self, timestamp):
+        self.updateStatusTransitions(timestamp)
+
+    def nextStatusTransition(self):
+        """
+        Renvoie le prochain moment où le statut d'une tâche de la liste
+        peut changer avec le seul passage du temps.
+
+        Returns :
+            (DateTime) : Ce moment, ou None s'il n'y en a pas.
+        """
+        self.__dropStaleTransitions()
+        return self.__transitions[0][0] if self.__transitions else None
+
+    def updateStatusTransitions(self, now=None):
+        """
+        Recalcule le statut des seules tâches dont une transition de statut
+        est passée, et signale celles dont le statut a changé. Tant que la
+        prochaine transition n'est pas passée, il n'y a rien à faire.
+
+        Args :
+            now (DateTime) : (facultatif) Le moment présent.
+        Returns :
+            (list) : Les tâches dont le statut a changé.
+        """
+        now = now or date.Now()
+        dueTasks = []
+        while self.__transitions and self.__transitions[0][0] < now:
+            transition, counter, eachTask = heapq.heappop(self.__transitions)
+            if self.__nextTransitions.get(eachTask) == transition:
+                del self.__nextTransitions[eachTask]
+                dueTasks.append(eachTask)
+        changedTasks = self.__updateStatuses(dueTasks, now)
+        for eachTask in changedTasks:
+            pub.sendMessage(
+                eachTask.statusChangedEventType(),
+                newValue=self.__statuses[eachTask],
+                sender=eachTask,
+            )
+        return changedTasks
+
+    def __updateStatuses(self, tasks, now=None):
+        """
+        Recalcule le statut et la prochaine transition de statut des tâches
+        données et les range à nouveau.
+
+        Args :
+            tasks : Les tâches dont le statut a pu changer. Celles qui ne
+                sont pas (ou plus) dans la liste sont retirées du
+                rangement.
+            now (DateTime) : (facultatif) Le moment présent.
+        Returns :
+            (list) : Les tâches de la liste dont le statut a changé.
+        """
+        changedTasks = []
+        for eachTask in tasks:
+            oldStatus = self.__statuses.pop(eachTask, None)
+            if oldStatus is not None:
+                self.__tasksWithStatus[oldStatus].discard(eachTask)
+                self.__deletedTasks.discard(eachTask)
+            if eachTask not in self:
+                self.__nextTransitions.pop(eachTask, None)
+                continue
+            newStatus = self.__statuses[eachTask] = eachTask.status()
+            self.__tasksWithStatus[newStatus].add(eachTask)
+            if eachTask.isDeleted():
+                self.__deletedTasks.add(eachTask)
+            if newStatus != oldStatus:
+                changedTasks.append(eachTask)
+            self.__scheduleTransition(eachTask, now)
+        return changedTasks
+
+    def __scheduleTransition(self, eachTask, now):
+        transition = eachTask.nextStatusTransition(now)
+        if transition is None:
+            self.__nextTransitions.pop(eachTask, None)
+        elif self.__nextTransitions.get(eachTask) != transition:
+            self.__nextTransitions[eachTask] = transition
+            heapq.heappush(
+                self.__transitions,
+                (transition, next(self.__transitionCounter), eachTask),
+            )
+            if len(self.__transitions) > 2 * len(self.__nextTransitions) + 64:
+                self.__transitions = [
+                    entry
+                    for entry in self.__transitions
+                    if self.__nextTransitions.get(entry[2]) == entry[0]
+                ]
+                heapq.heapify(self.__transitions)
+
+    def __dropStaleTransitions(self):
+        while self.__transitions:
+            transition, counter, eachTask = self.__transitions[0]
+            if self.__nextTransitions.get(eachTask) == transition:
+                return
+            heapq.heappop(self.__transitions)
+
     def nrBeingTracked(self):
         return len(self.tasksBeingTracked())
 
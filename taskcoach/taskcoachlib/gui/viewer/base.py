@@ -673,7 +673,7 @@ class Viewer(wx.Panel, patterns.Observer, metaclass=PreViewer):
                 # During bulk operation, collect items to refresh later
                 self.__pendingRefreshItems.add(sender)
             else:
-                self.refreshItems(sender)
+                patterns.DeliveryQueue().deliver(self.refreshItems, sender)
 
     def onAttributeChanged_Deprecated(self, event):
         log.debug(
@@ -686,7 +686,9 @@ class Viewer(wx.Panel, patterns.Observer, metaclass=PreViewer):
             # During bulk operation, collect items to refresh later
             self.__pendingRefreshItems.update(event.sources())
         else:
-            self.refreshItems(*event.sources())
+            patterns.DeliveryQueue().deliver(
+                self.refreshItems, *event.sources()
+            )
 
     def onNewItem(self, event):
         """Sélectionne un nouvel élément ajouté à la présentation.
@@ -795,6 +797,10 @@ class Viewer(wx.Panel, patterns.Observer, metaclass=PreViewer):
     # def refresh(self):
     def refresh(self, *args, **kwargs):
         """Rafraîchir les éléments affichés dans la visionneuse."""
+        # La visionneuse peut avoir été détruite avant la livraison différée
+        # de ce rafraîchissement (voir patterns.DeliveryQueue).
+        if not self:
+            return
         log.debug(
             f"Viewer.refresh : Appel de refresh pour {self.__class__.__name__} !"
         )
@@ -869,7 +875,9 @@ class Viewer(wx.Panel, patterns.Observer, metaclass=PreViewer):
         log.debug(
             f"Viewer.refreshItems : Appel de refreshItems pour {self.__class__.__name__} avec items={items}."
         )
-        if not self.__freezeCount:
+        # La visionneuse peut avoir été détruite avant la livraison différée
+        # de ce rafraîchissement (voir patterns.DeliveryQueue).
+        if self and not self.__freezeCount:
             items = [item for item in items if item in self.presentation()]
             log.debug(
                 f"Viewer.refreshItems : Items à rafraîchir après filtrage : {items}."
@@ -994,6 +1002,18 @@ class Viewer(wx.Panel, patterns.Observer, metaclass=PreViewer):
         # return False
         raise NotImplementedError
 
+    # @staticmethod
+    def isVirtualListViewer(self):
+        """
+        Indique si la vue affiche la présentation dans une liste virtuelle,
+        qui ne demande que les lignes visibles.
+
+        Returns :
+            (bool) : True si la présentation peut n'être triée qu'à la
+            demande, par fenêtres.
+        """
+        return False
+
     # @staticmethod
     def isViewerContainer(self):
         return False
@@ -1369,15 +1389,35 @@ class ListViewer(Viewer):  # pylint: disable=W0223
         """
         return False
 
+    # @staticmethod
+    def isVirtualListViewer(self):
+        return True
+
     def visibleItems(self):
         """
         Itère sur les éléments visibles dans la présentation.
 
+        Un trieur fenêtré n'est trié qu'au fur et à mesure de l'itération,
+        par blocs de lignes.
+
         Yields :
             Chaque objet visible dans la présentation.
         """
-        for item in self.presentation():
-            yield item
+        presentation = self.presentation()
+        try:
+            sortedItems = presentation.sortedItems
+        except AttributeError:
+            for item in presentation:
+                yield item
+            return
+        start = 0
+        while start < len(presentation):
+            items = sortedItems(start, start + 100)
+            if not items:
+                return
+            for item in items:
+                yield item
+            start += len(items)
 
     def getItemWithIndex(self, index):
         # def getItemWithIndex(self, index) -> object:
@@ -1390,7 +1430,11 @@ class ListViewer(Viewer):  # pylint: disable=W0223
         Returns :
             L'objet à l'index spécifié.
         """
-        return self.presentation()[index]
+        presentation = self.presentation()
+        try:
+            return presentation.itemWithIndex(index)
+        except AttributeError:
+            return presentation[index]
 
     def getIndexOfItem(self, item):
         # def getIndexOfItem(self, item) -> int:
@@ -1403,7 +1447,11 @@ class ListViewer(Viewer):  # pylint: disable=W0223
         Returns :
             (int) : L'index de l'objet dans la présentation.
         """
-        return self.presentation().index(item)
+        presentation = self.presentation()
+        try:
+            return presentation.indexOfItem(item)
+        except AttributeError:
+            return presentation.index(item)
 
     def selectNextItemsAfterRemoval(self, removedItems):
         """
@@ -1765,8 +1813,12 @@ class TreeViewer(Viewer):  # pylint: disable=W0223
             )
             result = presentation
         else:
-            # result = list(presentation.childrenOf(parent))
-            result = parent.children()
+            # Les trieurs arborescents gardent les enfants de chaque parent
+            # triés : inutile de filtrer et trier toute la présentation.
+            try:
+                result = presentation.childrenOf(parent)
+            except AttributeError:
+                result = parent.children()
             log.debug(
                 f"TreeViewer.children : parent est {parent}, retourne les enfants {result} de ce parent."
             )
@@ -796,8 +796,8 @@ class EffortViewer(
     def __hasRepeatedPeriod(self, anEffort):
         """Return whether the effort has the same period as the previous
         effort record."""
-        index = self.presentation().index(anEffort)
-        previousEffort = index > 0 and self.presentation()[index - 1] or None
+        index = self.getIndexOfItem(anEffort)
+        previousEffort = index > 0 and self.getItemWithIndex(index - 1) or None
         if not previousEffort:
             return False
         if anEffort.getStart() != previousEffort.getStart():
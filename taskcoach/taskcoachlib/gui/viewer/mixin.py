@@ -370,7 +370,9 @@ class SortableViewerMixin(object):
 
     def sorterOptions(self):
         return dict(
-            sortBy=self.sortKey(), sortCaseSensitive=self.isSortCaseSensitive()
+            sortBy=self.sortKey(),
+            sortCaseSensitive=self.isSortCaseSensitive(),
+            windowed=self.isVirtualListViewer(),
         )
 
     def sortBy(self, sortKey):
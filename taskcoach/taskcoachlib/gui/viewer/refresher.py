@@ -58,11 +58,29 @@ class MinuteRefresher(object):
         date.Scheduler().unschedule(self.onEveryMinute)
 
     def onEveryMinute(self):
+        # Seul le temps restant des tâches qui ont une échéance change
+        # chaque minute. Les changements de statut dus au passage du temps
+        # sont signalés tâche par tâche par la liste de tâches.
         if self.__viewer:
-            self.__viewer.refresh()
+            patterns.DeliveryQueue().deliver(
+                self.__viewer.refreshItems,
+                *[
+                    item
+                    for item in self.__viewer.presentation()
+                    if self.hasTimeLeft(item)
+                ],
+            )
         else:
             self.stopClock()
 
+    @staticmethod
+    def hasTimeLeft(item):
+        """Renvoie True si le temps restant de l'élément est affiché."""
+        return (
+            item.dueDateTime(recursive=True) != date.DateTime.max
+            and not item.completed()
+        )
+
 
 class SecondRefresher(patterns.Observer, wx.EvtHandler):
     """Cette classe peut être utilisée par les téléspectateurs pour se rafraîchir chaque seconde
@@ -134,7 +152,9 @@ class SecondRefresher(patterns.Observer, wx.EvtHandler):
 
     def refreshItems(self, items):
         if self.__viewer:
-            self.__viewer.refreshItems(*items)  # pylint: disable=W0142
+            patterns.DeliveryQueue().deliver(
+                self.__viewer.refreshItems, *items
+            )  # pylint: disable=W0142
         else:
             self.stopClock()
 
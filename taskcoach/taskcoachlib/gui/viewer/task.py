@@ -430,6 +430,18 @@ class BaseTaskViewer(
         Returns :
             Une méthode super de la création de filtre sur les tâches supprimées.
         """
+        if self.settings.getboolean("feature", "fusedfilters"):
+            # Recherche, catégories, statuts et tâches supprimées évalués en
+            # une seule passe par un seul décorateur.
+            return domain.task.filter.TaskFilterPipeline(
+                taskList,
+                categories=self.taskFile.categories(),
+                filterOnlyWhenAllCategoriesMatch=self.settings.getboolean(
+                    "view", "categoryfiltermatchall"
+                ),
+                **self.viewFilterOptions(),
+                **self.searchOptions(),
+            )
         log.debug(
             "BaseTaskViewer.createFilter : Création d'un filtre pour les tâches supprimées."
         )
@@ -20,6 +20,7 @@ from taskcoachlib.patterns.singleton import Singleton
 from taskcoachlib.patterns.observer import (
     CollectionDecorator,
     Decorator,
+    DeliveryQueue,
     Event,
     eventSource,
     List,
@@ -58,6 +59,7 @@ __all__ = [
     "CompositeList",
     "CompositeSet",
     "Decorator",
+    "DeliveryQueue",
     "Event",
     "eventSource",
     "List",
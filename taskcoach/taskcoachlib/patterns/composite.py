@@ -31,8 +31,22 @@ class Composite(object):
     Attributs :
         __parent (weakref) : Référence faible au composite parent.
         __children (list) : Liste des composites enfants.
+        __descendants (tuple | None) : Cache des descendants, invalidé par
+            addChild, removeChild et __setstate__ de ce composite ou d'un
+            de ses descendants.
+        __ancestors (tuple | None) : Cache des ancêtres, valide tant que
+            __ancestorsVersion est égal à __structureVersion.
+        __structureVersion (int) : Compteur de classe incrémenté à chaque
+            modification de la structure (addChild, removeChild, setParent).
     """
 
+    __structureVersion = 0
+    # Valeurs par défaut des caches, pour les composites dont __init__
+    # n'a pas encore été appelé (setParent ou __setstate__ avant __init__).
+    __descendants = None
+    __ancestors = ()
+    __ancestorsVersion = -1
+
     def __init__(self, children=None, parent=None):
         """
         Initialisez le composite avec une liste facultative d'enfants et de parents.
@@ -52,6 +66,9 @@ class Composite(object):
             # self.__parent = parent if parent is None else weakref.ref(parent)
             self.__parent = parent
         self.__children = children or []
+        self.__descendants = None
+        self.__ancestors = None
+        self.__ancestorsVersion = -1
         log.debug(
             f"Composite : self.__parent = {self.__parent} et self.__children = {self.__children}."
         )
@@ -96,6 +113,7 @@ class Composite(object):
         log.debug(
             f"Composite.__setstate__ : self.__children = {self.__children}"
         )
+        self.__structureChanged()
 
     def __getcopystate__(self):
         """
@@ -135,8 +153,57 @@ class Composite(object):
         Renvoie :
             (list) : La liste des ancêtres.
         """
+        return list(self.__ancestorsTuple())
+
+    def __ancestorsTuple(self):
+        """
+        Renvoie le tuple des ancêtres, de la racine au parent, en le
+        recalculant si la structure a changé depuis le dernier calcul.
+        """
+        version = Composite.__structureVersion
+        if self.__ancestorsVersion == version:
+            return self.__ancestors
+        # Remonte jusqu'à la racine ou jusqu'à un ancêtre dont le cache est
+        # à jour, sans reconstruire de liste à chaque niveau.
+        parents = []
+        ancestors = ()
         parent = self.parent()
-        return parent.ancestors() + [parent] if parent else []
+        while parent is not None:
+            if parent.__ancestorsVersion == version:
+                ancestors = parent.__ancestors + (parent,)
+                break
+            parents.append(parent)
+            parent = parent.parent()
+        parents.reverse()
+        self.__ancestors = ancestors + tuple(parents)
+        self.__ancestorsVersion = version
+        return self.__ancestors
+
+    def __structureChanged(self):
+        """
+        Incrémente la version de la structure et invalide le cache des
+        descendants de ce composite et de ses ancêtres.
+
+        Un composite dont le cache des descendants est rempli a forcément
+        des enfants dont le cache est rempli : la remontée s'arrête donc au
+        premier composite sans cache.
+        """
+        Composite.__structureVersion += 1
+        composite = self
+        while composite is not None and composite.__descendants is not None:
+            composite.__descendants = None
+            composite = composite.parent()
+
+    @classmethod
+    def structureVersion(class_):
+        """
+        Renvoie le numéro de version de la structure des composites, qui
+        change à chaque addChild, removeChild ou setParent.
+
+        Returns :
+            (int) : La version de la structure.
+        """
+        return Composite.__structureVersion
 
     def family(self):
         """
@@ -156,6 +223,7 @@ class Composite(object):
         """
         # self.__parent = None if parent is None else weakref.ref(parent)
         self.__parent = parent  # Référence forte (suppression des weakrefs)
+        Composite.__structureVersion += 1
 
     def children(self, recursive=False) -> list | None:
         """
@@ -168,14 +236,82 @@ class Composite(object):
             (list) : La liste des enfants.
         """
         if recursive:
-            result = self.__children[:]
-            for child in self.__children:
-                # log.debug(f"Composite.children : Ajout de l'enfant {child.id()} à {self.id()}")
-                result.extend(child.children(recursive=True))
-            return result
+            return list(self.__descendantsTuple())
         else:
             return self.__children
 
+    def __descendantsTuple(self):
+        """
+        Renvoie le tuple des descendants (parcours en profondeur, préfixe
+        par enfant), depuis le cache s'il est à jour.
+        """
+        if self.__descendants is None:
+            result = []
+            result.extend(self.__children)
+            for child in self.__children:
+                result.extend(child.__descendantsTuple())
+            self.__descendants = tuple(result)
+        return self.__descendants
+
+    def iterChildren(self, recursive=False, prune=None):
+        """
+        Parcourt les enfants du composite sans construire de liste.
+
+        Le parcours récursif est en profondeur d'abord, chaque enfant étant
+        suivi de ses descendants. Arrêter l'itération (any, next, break)
+        évite de parcourir le reste du sous-arbre.
+
+        Args :
+            recursive (bool) : (facultatif) Si True, parcourt aussi les
+                descendants.
+            prune (callable | None) : (facultatif) Fonction appelée avec
+                chaque enfant parcouru ; si elle renvoie True, les
+                descendants de cet enfant sont ignorés.
+
+        Yields :
+            (Composite) : Les enfants, puis leurs descendants.
+        """
+        if not recursive:
+            yield from self.__children
+            return
+        stack = [iter(self.__children)]
+        while stack:
+            for child in stack[-1]:
+                yield child
+                if child.__children and not (prune and prune(child)):
+                    stack.append(iter(child.__children))
+                    break
+            else:
+                stack.pop()
+
+    def iterAncestors(self):
+        """
+        Parcourt les ancêtres du composite, du parent jusqu'à la racine,
+        sans construire de liste.
+
+        Yields :
+            (Composite) : Le parent, puis le grand-parent, etc.
+        """
+        parent = self.parent()
+        while parent is not None:
+            yield parent
+            parent = parent.parent()
+
+    def walk(self, prune=None):
+        """
+        Parcourt le composite puis ses descendants, en profondeur d'abord.
+
+        Args :
+            prune (callable | None) : (facultatif) Voir iterChildren ; si
+                prune(self) renvoie True, seul le composite est renvoyé.
+
+        Yields :
+            (Composite) : Le composite puis ses descendants.
+        """
+        yield self
+        if not (prune and prune(self)):
+            yield from self.iterChildren(recursive=True, prune=prune)
+
     def siblings(self, recursive=False):
         """
         Obtenez les frères et sœurs du composite.
@@ -226,6 +362,7 @@ class Composite(object):
             child (Composite) : Le composite enfant à ajouter.
         """
         self.__children.append(child)
+        self.__structureChanged()
         child.setParent(self)
 
     def removeChild(self, child):
@@ -236,6 +373,7 @@ class Composite(object):
             child (Composite) : Le composite enfant à supprimer.
         """
         self.__children.remove(child)
+        self.__structureChanged()
         # We don't reset the parent of the child, because that makes restoring
         # the parent-child relationship easier.
 
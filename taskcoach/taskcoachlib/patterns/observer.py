@@ -17,10 +17,14 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 # from . import singleton
+import contextlib
 import logging
 from collections.abc import Iterable
 from taskcoachlib.patterns import singleton
+from taskcoachlib.tools import tracing
 import functools
+import types
+import weakref
 
 # from taskcoachlib.thirdparty.pubsub import pub
 from pubsub import pub
@@ -405,6 +409,11 @@ class MethodProxy(object):
     les méthodes d'instance sont égales lorsque leurs instances sont égales, ce qui n'est pas
     le comportement nécessaire pour les rappels. Cette classe encapsule les rappels pour restaurer ou
     pour récupérer l'ancien comportement.
+
+    L'instance de la méthode est référencée faiblement, de sorte qu'un
+    observateur oublié (visionneuse fermée, filtre détaché...) n'est pas
+    maintenu en vie par le registre de Publisher. Si l'instance ne supporte
+    pas les références faibles, elle est référencée normalement.
     """
 
     def __init__(self, method):
@@ -414,7 +423,15 @@ class MethodProxy(object):
         Args :
             method (fonction) : La méthode à envelopper.
         """
-        self.method = method
+        instance = method.__self__
+        self.__func = method.__func__
+        try:
+            self.__instanceRef = weakref.ref(instance)
+        except TypeError:
+            self.__instanceRef = lambda: instance
+        self.__deathRef = None
+        # Can't use the instance for the hash, it might be mutable
+        self.__hash = hash((instance.__class__, id(instance), self.__func))
 
     # def __repr__(self) -> str:
     def __repr__(self):
@@ -423,7 +440,8 @@ class MethodProxy(object):
 
     def __call__(self, *args, **kwargs):
         """
-        Appelez la méthode encapsulée.
+        Appelez la méthode encapsulée. Ne fait rien si l'instance de la
+        méthode n'existe plus.
 
         Args :
             *args : liste d'arguments de longueur variable.
@@ -432,7 +450,10 @@ class MethodProxy(object):
         Returns :
             objet : le résultat de l’appel de méthode.
         """
-        return self.method(*args, **kwargs)
+        instance = self.__instanceRef()
+        if instance is None:
+            return None
+        return self.__func(instance, *args, **kwargs)
 
     # def __eq__(self, other) -> bool:
     def __eq__(self, other):
@@ -446,9 +467,9 @@ class MethodProxy(object):
             bool : True si les MethodProxies sont égaux, False sinon .
         """
         return (
-            self.method.__self__.__class__ is other.method.__self__.__class__
-            and self.method.__self__ is other.method.__self__
-            and self.method.__func__ is other.method.__func__
+            self.__hash == other.__hash
+            and self.__func is other.__func
+            and self.__instanceRef() is other.__instanceRef()
         )
 
     # def __ne__(self, other) -> bool:
@@ -472,27 +493,61 @@ class MethodProxy(object):
         Returns :
             int : Le hachage du MethodProxy.
         """
-        # Can't use self.method.__self__ for the hash, it might be mutable
-        return hash(
-            (
-                self.method.__self__.__class__,
-                id(self.method.__self__),
-                self.method.__func__,
-            )
-        )
+        return self.__hash
+
+    def get_method(self):
+        """
+        Récupère la méthode liée encapsulée.
+
+        Renvoie :
+            (method | None) : La méthode, ou None si son instance n'existe plus.
+        """
+        instance = self.__instanceRef()
+        return None if instance is None else types.MethodType(self.__func, instance)
+
+    method = property(get_method)
 
     def get_im_self(self):
         """
         Récupère l'instance associée à la méthode.
 
         Renvoie :
-            object : L'instance associée à la méthode.
+            object : L'instance associée à la méthode, ou None si elle n'existe plus.
         """
-        return self.method.__self__
+        return self.__instanceRef()
 
     im_self = property(get_im_self)
     __self__ = im_self
 
+    def isAlive(self):
+        """
+        Renvoie True tant que l'instance de la méthode existe.
+        """
+        return self.__instanceRef() is not None
+
+    def onDeath(self, callback):
+        """
+        Demandez à être prévenu quand l'instance de la méthode disparaît.
+
+        Args :
+            callback (fonction) : Appelée avec ce MethodProxy en argument.
+        """
+        instance = self.__instanceRef()
+        if instance is None:
+            callback(self)
+            return
+        proxyRef = weakref.ref(self)
+
+        def notify(ref):  # pylint: disable=W0613
+            proxy = proxyRef()
+            if proxy is not None:
+                callback(proxy)
+
+        try:
+            self.__deathRef = weakref.ref(instance, notify)
+        except TypeError:
+            pass  # Instance référencée normalement, elle ne disparaîtra pas
+
 
 def wrapObserver(decoratedMethod):
     """
@@ -527,11 +582,24 @@ def unwrapObservers(decoratedMethod):
 
     def decorator(*args, **kwargs):
         observers = decoratedMethod(*args, **kwargs)
-        return [proxy.method for proxy in observers]
+        return [proxy.method for proxy in observers if proxy.isAlive()]
 
     return decorator
 
 
+def _isDeltaEventType(eventType):
+    """
+    Renvoie True si les valeurs des événements de ce type sont des éléments
+    ajoutés ou supprimés (enfants, catégories, notes, pièces jointes...)
+    plutôt qu'une nouvelle valeur qui remplace la précédente.
+
+    Args :
+        eventType (str) : Le type d'événement.
+    """
+    suffix = eventType.rpartition(".")[2]
+    return suffix in ("add", "added", "remove", "removed")
+
+
 class Publisher(object, metaclass=singleton.Singleton):
     """
     Publisher est utilisé pour s’inscrire aux notifications d’événements.
@@ -549,23 +617,43 @@ class Publisher(object, metaclass=singleton.Singleton):
     peuvent atteindre tous les observateurs.
     """
 
+    # Sujets pubsub dont newValue est (nouvelle valeur, ancienne valeur),
+    # voir registerDeltaTopic() :
+    _deltaTopics = set()
+
     def __init__(self, *args, **kwargs):
         """
         Initialisez l'éditeur.
         """
         super().__init__(*args, **kwargs)
+        # Nombre de parcours ou de modifications du registre en cours, voir
+        # __registryInUse() :
+        self.__registryDepth = 0
         self.clear()
-        self.__observers = {}
+        # État du regroupement des événements, voir batch() :
+        self.__batchDepth = 0
+        self.__sendMessage = None
+        self.__pendingCollectionEvents = []  # [(type, source, [values])]
+        self.__pendingValuesByType = {}  # {type: {source: values}}
+        self.__pendingMessages = []  # [(topicName, msgData), ...]
+        self.__pendingMessageIndex = {}  # {(topicName, id(sender)): index}
 
     def clear(self):
         """
         Effacer le registre des observateurs. Principalement à des fins de tests.
         """
-        # observers = {(eventType, eventSource): set(callbacks)}
-        try:
-            self.__observers.clear()
-        except Exception:
-            self.__observers = {}  # pylint: disable=W0201
+        # Les observateurs sont indexés par type d'événement, puis par source :
+        # observersByType = {eventType: {eventSource: set(callbacks)}}
+        # La source None regroupe les observateurs inscrits pour toutes les
+        # sources de ce type d'événement.
+        self.__observersByType = {}  # pylint: disable=W0201
+        # Index inverse pour que la suppression d'un observateur ne parcoure
+        # que les clés sous lesquelles il est inscrit :
+        # keysByObserver = {observer: set([(eventType, eventSource), ...])}
+        self.__keysByObserver = {}  # pylint: disable=W0201
+        # Observateurs dont l'instance a disparu pendant un parcours du
+        # registre, purgés dès la fin de ce parcours :
+        self.__deadObservers = []  # pylint: disable=W0201
 
     @wrapObserver
     def registerObserver(self, observer, eventType, eventSource=None):
@@ -581,10 +669,15 @@ class Publisher(object, metaclass=singleton.Singleton):
             eventType (str) : le type d'événement à observer.
             eventSource (object, facultatif) : la source d'événement à observer.
         """
-        observers = self.__observers.setdefault(
-            (eventType, eventSource), set()
-        )
-        observers.add(observer)
+        with self.__registryInUse():
+            observersBySource = self.__observersByType.setdefault(
+                eventType, {}
+            )
+            observersBySource.setdefault(eventSource, set()).add(observer)
+            if observer not in self.__keysByObserver:
+                self.__keysByObserver[observer] = set()
+                observer.onDeath(self.__onObserverDeath)
+            self.__keysByObserver[observer].add((eventType, eventSource))
 
     @wrapObserver
     def removeObserver(self, observer, eventType=None, eventSource=None):
@@ -603,87 +696,341 @@ class Publisher(object, metaclass=singleton.Singleton):
             eventType (str, facultatif) : Le type d'événement à arrêter d'observer.
             eventSource (object, facultatif) : La source d'événement à arrêter d'observer.
         """
-        # pylint: disable=W0613
-
-        # First, create a match function that will select the combination of
-        # event source and event type we're looking for:
+        with self.__registryInUse():
+            self.__removeObserver(observer, eventType, eventSource)
 
+    def __removeObserver(self, observer, eventType=None, eventSource=None):
+        """
+        Supprimez un observateur déjà enveloppé dans un MethodProxy.
+        Voir removeObserver().
+        """
+        keys = self.__keysByObserver.get(observer)
+        if not keys:
+            return
         if eventType and eventSource:
-
-            def match(type, source):
-                return type == eventType and source == eventSource
-
+            matchingKeys = (
+                [(eventType, eventSource)]
+                if (eventType, eventSource) in keys
+                else []
+            )
         elif eventType:
-
-            def match(type, source):
-                return type == eventType
-
+            matchingKeys = [key for key in keys if key[0] == eventType]
         elif eventSource:
-
-            def match(type, source):
-                return source == eventSource
-
+            matchingKeys = [key for key in keys if key[1] == eventSource]
         else:
+            matchingKeys = list(keys)
+        for key in matchingKeys:
+            keys.discard(key)
+            type, source = key
+            observersBySource = self.__observersByType[type]
+            observers = observersBySource[source]
+            observers.discard(observer)
+            if not observers:
+                del observersBySource[source]
+                if not observersBySource:
+                    del self.__observersByType[type]
+        if not keys:
+            del self.__keysByObserver[observer]
+
+    def __onObserverDeath(self, observer):
+        """
+        Appelée quand l'instance d'un observateur disparaît. L'observateur
+        est retiré du registre aussitôt, avec les sources d'événement qu'il
+        y retenait, ou à la fin du parcours du registre en cours.
+
+        Args :
+            observer (MethodProxy) : L'observateur dont l'instance a disparu.
+        """
+        self.__deadObservers.append(observer)
+        if not self.__registryDepth:
+            self.__purgeDeadObservers()
 
-            def match(type, source):
-                return True
+    @contextlib.contextmanager
+    def __registryInUse(self):
+        """
+        Contexte des parcours et modifications du registre. Le ramasse-miettes
+        peut faire disparaître un observateur à tout moment ; sa purge est
+        alors reportée à la sortie du contexte le plus externe.
+        """
+        self.__registryDepth += 1
+        try:
+            yield
+        finally:
+            self.__registryDepth -= 1
+            if not self.__registryDepth and self.__deadObservers:
+                self.__purgeDeadObservers()
 
-        # Next, remove observers that are registered for the event source and
-        # event type we're looking for, i.e. that match:
-        matchingKeys = [key for key in self.__observers if match(*key)]
-        for key in matchingKeys:
-            self.__observers[key].discard(observer)
-            if not self.__observers[key]:
-                del self.__observers[key]
+    def __purgeDeadObservers(self):
+        """
+        Supprimez du registre les observateurs dont l'instance a disparu.
+        """
+        with self.__registryInUse():
+            while self.__deadObservers:
+                deadObservers = self.__deadObservers
+                self.__deadObservers = []  # pylint: disable=W0201
+                for observer in deadObservers:
+                    self.__removeObserver(observer)
 
     def notifyObservers(self, event):
         """
         Informer les observateurs de l'événement. Le type et les sources de l'événement sont
         extraits de l'événement.
 
+        Chaque observateur n'est appelé qu'une seule fois. Un observateur dont
+        l'inscription couvre tous les types et toutes les sources de l'événement
+        reçoit l'événement lui-même ; les autres reçoivent un sous-événement ne
+        contenant que les types et sources pour lesquels ils sont inscrits.
+
         Args :
             event (event) : L'événement dont il faut informer les observateurs.
         """
-        if not event.sources():
+        sourcesAndValuesByType = event.sourcesAndValuesByType()
+        if self.__batchDepth:
+            self.__queueEvent(sourcesAndValuesByType)
             return
-        # log.debug(
-        #     f"Publisher.notifyObservers : lancé par {self.__class__.__name__} pour informer les observateurs de l'événement {event} avec sources {event.sources()}."
-        # )
-        # Recueillir les observateurs *et* les types et sources pour lesquels ils sont enregistrés
-        observers = (
-            dict()
-        )  # {observer: set([(type, source), ...])}  liste set ou dict ? TODO !
-        # observers = set()
-        types = event.types()
-        # Inclure les observateurs non inscrits pour une source d'événement spécifique :
-        sources = event.sources() | {None}
-        # sources = event.sources() | set([None])
-        eventTypesAndSources = [
-            (type, source) for source in sources for type in types
-        ]
-        # log.debug(
-        #     f"Publisher.notifyObservers : pour chaque sources {sources} de chaque types {types} récupère {eventTypesAndSources}."
-        # )
-        for eventTypeAndSource in eventTypesAndSources:
-            for observer in self.__observers.get(eventTypeAndSource, set()):
-                # for observer in self.__observers.get(eventTypeAndSource, dict()):
-                observers.setdefault(observer, set()).add(
-                    eventTypeAndSource
-                )  # dict() a setdefault ! pas set().
-                # observers.setdefault(observer, []).append(eventTypeAndSource)
-        for (
-            observer,
-            eventTypesAndSources,
-        ) in (
-            observers.items()
-        ):  # AttributeError: 'set' object has no attribute 'items'
-            # for observer, eventTypesAndSources in observers.:
-            subEvent = event.subEvent(*eventTypesAndSources)
-            if subEvent.types():
-                observer(subEvent)
-        # log.debug(
-        #     f"Publisher.notifyObservers : observers={observers} et observers.items={observers.items()} sont définis !"
-        # )
+        with self.__registryInUse():
+            self.__dispatch(event, sourcesAndValuesByType)
+
+    def __dispatch(self, event, sourcesAndValuesByType):
+        """
+        Envoyer l'événement aux observateurs inscrits. Voir notifyObservers().
+
+        Args :
+            event (Event) : L'événement à envoyer.
+            sourcesAndValuesByType (dict) : Les données {type : {source : valeurs}}
+                de l'événement.
+        """
+        if len(sourcesAndValuesByType) == 1:
+            # Cas le plus fréquent (un attribut modifié) : pas de
+            # sous-événement à construire, chaque observateur trouvé est
+            # inscrit pour l'unique type de l'événement.
+            for eventType, sourcesAndValues in sourcesAndValuesByType.items():
+                if len(sourcesAndValues) == 1:
+                    observersBySource = self.__observersByType.get(eventType)
+                    if observersBySource:
+                        self.__notifySingleSource(
+                            event, observersBySource, sourcesAndValues
+                        )
+                    return
+        self.__notifyMultipleTypesOrSources(event, sourcesAndValuesByType)
+
+    @staticmethod
+    def __notifySingleSource(event, observersBySource, sourcesAndValues):
+        """
+        Informer les observateurs d'un événement qui n'a qu'un type et qu'une
+        source. Tout observateur trouvé couvre l'événement entier.
+
+        Args :
+            event (Event) : L'événement à envoyer.
+            observersBySource (dict) : Les observateurs du type de l'événement.
+            sourcesAndValues (dict) : L'unique source de l'événement et ses valeurs.
+        """
+        for source in sourcesAndValues:
+            anySourceObservers = observersBySource.get(None)
+            sourceObservers = observersBySource.get(source)
+            if anySourceObservers and sourceObservers:
+                observers = tuple(anySourceObservers | sourceObservers)
+            else:
+                # On copie pour que les observateurs puissent s'inscrire ou
+                # se désinscrire pendant la notification.
+                observers = tuple(anySourceObservers or sourceObservers or ())
+            for observer in observers:
+                observer(event)
+
+    def __notifyMultipleTypesOrSources(self, event, sourcesAndValuesByType):
+        """
+        Informer les observateurs d'un événement qui a plusieurs types ou
+        plusieurs sources.
+
+        Args :
+            event (Event) : L'événement à envoyer.
+            sourcesAndValuesByType (dict) : Les données {type : {source : valeurs}}
+                de l'événement.
+        """
+        # {observer: {type: None (toutes les sources) ou set(sources)}}
+        matches = {}
+        nrTypes = 0
+        for eventType, sourcesAndValues in sourcesAndValuesByType.items():
+            if not sourcesAndValues:
+                continue
+            nrTypes += 1
+            observersBySource = self.__observersByType.get(eventType)
+            if not observersBySource:
+                continue
+            for observer in observersBySource.get(None, ()):
+                matches.setdefault(observer, {})[eventType] = None
+            if len(observersBySource) > 1 or None not in observersBySource:
+                for source in sourcesAndValues:
+                    for observer in observersBySource.get(source, ()):
+                        sourcesForType = matches.setdefault(observer, {})
+                        if eventType not in sourcesForType:
+                            sourcesForType[eventType] = set()
+                        if sourcesForType[eventType] is not None:
+                            sourcesForType[eventType].add(source)
+        coversAllTypes = nrTypes == len(sourcesAndValuesByType)
+        for observer, sourcesByType in matches.items():
+            if coversAllTypes and len(sourcesByType) == nrTypes and all(
+                sources is None
+                or len(sources) == len(sourcesAndValuesByType[eventType])
+                for eventType, sources in sourcesByType.items()
+            ):
+                observer(event)
+            else:
+                observer(
+                    event.subEvent(
+                        *[
+                            (eventType, source)
+                            for eventType, sources in sourcesByType.items()
+                            for source in (sources or (None,))
+                        ]
+                    )
+                )
+
+    @contextlib.contextmanager
+    def batch(self):
+        """
+        Contexte de regroupement des événements pour les opérations en masse.
+
+        À l'intérieur du contexte, les événements Event et les messages pubsub
+        ne sont pas envoyés mais mis en attente. Les événements répétés pour un
+        même (type, source), ou un même (sujet, sender) pour pubsub, sont
+        fusionnés et seule la dernière valeur est conservée, sauf pour les
+        événements d'ajout ou de suppression (enfants, catégories...) dont
+        les valeurs sont cumulées, et pour les sujets déclarés par
+        registerDeltaTopic(). Les ajouts et suppressions d'éléments des
+        collections observables sont cumulés dans l'ordre. Tout est envoyé une
+        seule fois à la sortie du contexte le plus externe, même si une
+        exception s'est produite.
+
+        Exemple :
+            with patterns.Publisher().batch():
+                taskList.extend(tasks)
+        """
+        self.__batchDepth += 1
+        if self.__batchDepth == 1:
+            self.__sendMessage = pub.sendMessage
+            pub.sendMessage = self.__queueMessage
+        try:
+            yield
+        finally:
+            self.__batchDepth -= 1
+            if not self.__batchDepth:
+                pub.sendMessage = self.__sendMessage
+                self.__sendMessage = None
+                self.__flush()
+
+    def isBatching(self):
+        """
+        Renvoie True si les événements sont actuellement mis en attente par
+        batch().
+        """
+        return self.__batchDepth > 0
+
+    def __queueEvent(self, sourcesAndValuesByType):
+        """
+        Mettre en attente les données d'un événement pendant batch().
+
+        Args :
+            sourcesAndValuesByType (dict) : Les données {type : {source : valeurs}}
+                de l'événement.
+        """
+        for eventType, sourcesAndValues in sourcesAndValuesByType.items():
+            for source, values in sourcesAndValues.items():
+                if isinstance(source, ObservableCollection) and eventType in (
+                    source.addItemEventType(),
+                    source.removeItemEventType(),
+                ):
+                    # Les éléments ajoutés ou supprimés ne se remplacent pas
+                    # les uns les autres : on les cumule, en respectant l'ordre
+                    # des ajouts et des suppressions.
+                    pending = self.__pendingCollectionEvents
+                    if (
+                        pending
+                        and pending[-1][0] == eventType
+                        and pending[-1][1] is source
+                    ):
+                        pending[-1][2].extend(values)
+                    else:
+                        pending.append((eventType, source, list(values)))
+                else:
+                    pendingValues = self.__pendingValuesByType.setdefault(
+                        eventType, {}
+                    )
+                    if source in pendingValues and _isDeltaEventType(
+                        eventType
+                    ):
+                        # Les enfants, catégories, notes... ajoutés ou
+                        # supprimés se cumulent, comme dans Event.addSource.
+                        pendingValues[source] = tuple(
+                            pendingValues[source]
+                        ) + tuple(values)
+                    else:
+                        pendingValues[source] = values
+
+    def __queueMessage(self, topicName, **msgData):
+        """
+        Remplace pub.sendMessage pendant batch() : met le message en attente.
+        Un message ultérieur de même sujet et de même sender remplace le
+        précédent. Pour un sujet enregistré avec registerDeltaTopic(), dont
+        newValue est une paire (nouvelle valeur, ancienne valeur), le message
+        fusionné garde l'ancienne valeur du premier message et la nouvelle
+        valeur du dernier. Les messages sans sender sont tous conservés.
+
+        Args :
+            topicName (str) : Le sujet pubsub.
+            **msgData : Les données du message.
+        """
+        if "sender" not in msgData:
+            self.__pendingMessages.append((topicName, msgData))
+            return
+        key = (topicName, id(msgData["sender"]))
+        index = self.__pendingMessageIndex.get(key)
+        if index is None:
+            self.__pendingMessageIndex[key] = len(self.__pendingMessages)
+            self.__pendingMessages.append((topicName, msgData))
+        else:
+            if topicName in Publisher._deltaTopics:
+                oldValue = self.__pendingMessages[index][1]["newValue"][1]
+                msgData["newValue"] = (msgData["newValue"][0], oldValue)
+            self.__pendingMessages[index] = (topicName, msgData)
+
+    @classmethod
+    def registerDeltaTopic(class_, topicName):
+        """
+        Déclare un sujet pubsub dont les messages décrivent une modification
+        par rapport à la valeur précédente : newValue est une paire
+        (nouvelle valeur, ancienne valeur). Pendant batch(), les messages
+        répétés de ce sujet sont fusionnés sans perdre la modification des
+        messages remplacés.
+
+        Args :
+            topicName (str) : Le sujet pubsub.
+        """
+        class_._deltaTopics.add(topicName)
+
+    def __flush(self):
+        """
+        Envoyer les événements et messages mis en attente pendant batch().
+        Les ajouts et suppressions d'éléments sont envoyés en premier, puis les
+        autres événements en un seul Event, puis les messages pubsub.
+        """
+        collectionEvents = self.__pendingCollectionEvents
+        valuesByType = self.__pendingValuesByType
+        messages = self.__pendingMessages
+        self.__pendingCollectionEvents = []
+        self.__pendingValuesByType = {}
+        self.__pendingMessages = []
+        self.__pendingMessageIndex = {}
+        for eventType, source, values in collectionEvents:
+            self.notifyObservers(Event(eventType, source, *values))
+        if valuesByType:
+            event = Event()
+            for eventType, sourcesAndValues in valuesByType.items():
+                for source, values in sourcesAndValues.items():
+                    event.addSource(source, *values, type=eventType)
+            self.notifyObservers(event)
+        for topicName, msgData in messages:
+            pub.sendMessage(topicName, **msgData)
 
     @unwrapObservers
     def observers(self, eventType=None):
@@ -699,14 +1046,114 @@ class Publisher(object, metaclass=singleton.Singleton):
             result (set) : L'ensemble des observateurs.
         """
         if eventType:
-            return self.__observers.get((eventType, None), set())
+            return self.__observersByType.get(eventType, {}).get(None, set())
         else:
             result = set()
-            for observers in list(self.__observers.values()):
-                result |= observers
+            with self.__registryInUse():
+                for observersBySource in self.__observersByType.values():
+                    for observers in observersBySource.values():
+                        result |= observers
             return result
 
 
+class DeliveryQueue(object, metaclass=singleton.Singleton):
+    """
+    File de livraison différée des rafraîchissements d'affichage.
+
+    Les écouteurs modèle-modèle restent synchrones ; les visionneuses et les
+    rafraîchisseurs confient leurs rafraîchissements à cette file via
+    deliver(). Les livraisons sont dédoublonnées par rappel (les éléments
+    sont fusionnés) et exécutées une seule fois, par ordre de priorité, au
+    prochain cycle d'inactivité.
+
+    La file est inactive tant qu'aucun planificateur n'est défini : deliver()
+    appelle alors le rappel immédiatement. L'application installe
+    wx.CallAfter comme planificateur.
+    """
+
+    # Les priorités les plus basses sont livrées en premier.
+    PRIORITY_REFRESH = 0
+    PRIORITY_REFRESH_ITEMS = 10
+
+    def __init__(self, *args, **kwargs):
+        super().__init__(*args, **kwargs)
+        self.__scheduler = None
+        self.__drainScheduled = False
+        # {rappel : [priorité, {élément: None}]}, dans l'ordre d'arrivée
+        self.__pending = {}
+
+    def setScheduler(self, scheduler):
+        """
+        Définit le planificateur de la file.
+
+        Args :
+            scheduler (callable | None) : Fonction qui reçoit drain() et le
+                fait exécuter au prochain cycle d'inactivité (par exemple
+                wx.CallAfter). None désactive la file et oublie les
+                livraisons en attente.
+        """
+        self.__scheduler = scheduler
+        if scheduler is None:
+            self.clear()
+
+    def isEnabled(self):
+        """Renvoie True si les livraisons sont différées."""
+        return self.__scheduler is not None
+
+    def deliver(self, callback, *items, priority=PRIORITY_REFRESH_ITEMS):
+        """
+        Livre callback(*items), immédiatement si la file est inactive, sinon
+        au prochain cycle d'inactivité.
+
+        Args :
+            callback (callable) : Le rappel à exécuter.
+            *items : Les éléments à transmettre, fusionnés avec ceux des
+                livraisons en attente pour le même rappel.
+            priority (int) : Ordre de livraison, les plus basses d'abord.
+        """
+        if self.__scheduler is None:
+            callback(*items)
+            return
+        try:
+            entry = self.__pending[callback]
+        except KeyError:
+            entry = self.__pending[callback] = [priority, {}]
+        else:
+            entry[0] = min(entry[0], priority)
+        entry[1].update(dict.fromkeys(items))
+        if not self.__drainScheduled:
+            self.__drainScheduled = True
+            self.__scheduler(self.drain)
+
+    def pending(self):
+        """Renvoie le nombre de rappels en attente de livraison."""
+        return len(self.__pending)
+
+    def drain(self):
+        """
+        Exécute les livraisons en attente, par ordre de priorité puis
+        d'arrivée. Les livraisons demandées pendant la vidange sont
+        reportées au cycle suivant. Une exception levée par un rappel est
+        journalisée et n'empêche pas la livraison des suivants.
+        """
+        pending, self.__pending = self.__pending, {}
+        self.__drainScheduled = False
+        entries = sorted(pending.items(), key=lambda entry: entry[1][0])
+        for callback, (priority, items) in entries:
+            try:
+                callback(*items)
+            except Exception:
+                log.exception(
+                    "DeliveryQueue.drain : échec de la livraison à %r.",
+                    callback,
+                )
+
+    def clear(self):
+        """Oublie les livraisons en attente."""
+        self.__pending = {}
+        self.__drainScheduled = False
+
+
 class Observer(object):
     """
     Classe mixin de base Observer qui permet de gérer l’enregistrement et la suppression des observateurs.
@@ -716,6 +1163,8 @@ class Observer(object):
         """
         Initialisez la liste des observateurs.
         """
+        # Les observateurs sont des méthodes de cette instance : on garde des
+        # MethodProxy pour ne pas créer de cycle de références avec elle.
         self.__observers = set()
         super().__init__(*args, **kwargs)
         # log.debug(f"Observer.__init__ : Liste des observateurs : {self.__observers}")
@@ -729,7 +1178,7 @@ class Observer(object):
             *args : liste d'arguments de longueur variable.
             **kwargs : arguments de mots clés arbitraires.
         """
-        self.__observers.add(observer)
+        self.__observers.add(MethodProxy(observer))
         Publisher().registerObserver(observer, *args, **kwargs)
 
     def removeObserver(self, observer, *args, **kwargs):
@@ -741,7 +1190,7 @@ class Observer(object):
             *args : liste d'arguments de longueur variable.
             **kwargs : Arguments de mots clés arbitraires.
         """
-        self.__observers.discard(observer)
+        self.__observers.discard(MethodProxy(observer))
         Publisher().removeObserver(observer, *args, **kwargs)
 
     def removeInstance(self):
@@ -749,7 +1198,7 @@ class Observer(object):
         Supprimez tous les observateurs enregistrés sur cette instance.
         """
         for observer in self.__observers.copy():
-            self.removeObserver(observer)
+            self.removeObserver(observer.method)
         pub.unsubAll(
             listenerFilter=lambda listener: hasattr(
                 listener.getCallable(), "__self__"
@@ -1105,6 +1554,7 @@ class CollectionDecorator(Decorator, ObservableCollection):
     # mais si l'objet de base (comme NoteContainer) ne le peut pas,
     # elle se contente de notifier ses propres observateurs (le Noteviewer),
     # qui eux savent comment se rafraîchir.
+    @tracing.traced("CollectionDecorator.refresh", itemCount=len)
     def refresh(self):
         """
         Rafraîchit la collection. Si l'observable sous-jacent a une méthode
@@ -1112,9 +1562,6 @@ class CollectionDecorator(Decorator, ObservableCollection):
         de changement.
         """
         observable = self.observable()
-        log.debug(
-            f"CollectionDecorator.refresh : Entrée avec observable = {type(observable).__name__}"
-        )
         # # if hasattr(observable, "refresh"):
         # # CheckTreeCtrl (et tous les widgets wx) ont une méthode Refresh() — mais en Python,
         # # hasattr(widget, "refresh") est case-insensitive dans certains contextes wxPython,
@@ -1125,9 +1572,6 @@ class CollectionDecorator(Decorator, ObservableCollection):
         #     observable, CollectionDecorator
         # ):
         if isinstance(observable, CollectionDecorator):
-            log.debug(
-                f"CollectionDecorator.refresh : appelle observable.refresh()"
-            )
             observable.refresh()
         # # else:
         # elif not hasattr(observable, "refresh"):
@@ -1165,8 +1609,8 @@ class CollectionDecorator(Decorator, ObservableCollection):
         #     on s'assure que l'appel récursif ne se produit que si l'objet enveloppé supporte explicitement ces méthodes.
         #     Cela empêchera l'appel d'atteindre le NoteContainer (ou tout autre objet de base qui n'est pas "freezable")
         #     et résoudra l'AttributeError.
-        log.debug("CollectionDecorator.refresh : terminé !")
 
+    @tracing.traced("CollectionDecorator.freeze", itemCount=len)
     def freeze(self):
         """
         Gèle la collection, arrêtant temporairement les notifications de changements aux observateurs.
@@ -1174,9 +1618,6 @@ class CollectionDecorator(Decorator, ObservableCollection):
         Si la collection observée est elle-même un CollectionDecorator,
         elle appelle également la méthode freeze sur cette collection.
         """
-        log.debug(
-            f"CollectionDecorator.freeze : {self.__class__.__name__}.freeze() - Entrée"
-        )
         # if isinstance(self.observable(), CollectionDecorator):
         #     self.observable().freeze()
         # AJOUTER LA VÉRIFICATION :
@@ -1184,10 +1625,8 @@ class CollectionDecorator(Decorator, ObservableCollection):
         if hasattr(observable, "freeze"):
             observable.freeze()
         self.__freezeCount += 1
-        log.debug(
-            f"CollectionDecorator.freeze : {self.__class__.__name__}.freeze() - Sortie, compteur = {self.__freezeCount} !"
-        )
 
+    @tracing.traced("CollectionDecorator.thaw", itemCount=len)
     def thaw(self):
         """
         Désactive le gel de l'objet, ce qui permet à nouveau les notifications.
@@ -1204,9 +1643,6 @@ class CollectionDecorator(Decorator, ObservableCollection):
         # La cause de l'erreur est donc que l'attribut self.__observable
         # (qui est retourné par self.observable()) est None
         # lorsque CollectionDecorator.thaw() est appelée.
-        log.debug(
-            f"CollectionDecorator.thaw : {self.__class__.__name__}.thaw() - Entrée"
-        )
         # # if self.isFrozen():
         # self.__freezeCount -= 1
         # Ensure counter does not go below zero
@@ -1221,9 +1657,6 @@ class CollectionDecorator(Decorator, ObservableCollection):
         #         # self.notifyFrozenObservers()
         # AJOUTER LA VÉRIFICATION :
         observable = self.observable()
-        log.debug(
-            f"CollectionDecorator.thaw : observable = {type(observable).__name__}"
-        )
         if hasattr(observable, "thaw"):
             observable.thaw()  # Boucle entre ici et domain.base.filter.Filter.thaw()
 
@@ -1232,9 +1665,6 @@ class CollectionDecorator(Decorator, ObservableCollection):
             self.refresh()  # Update the collection if counter is back to zero
         # log.debug(f"{self.__class__.__name__}.thaw() - Sortie")
         # log.debug(f"{self.__class__.__name__}.thaw() - Sortie, compteur = {self._frozen}")
-        log.debug(
-            f"CollectionDecorator.thaw : {self.__class__.__name__}.thaw() - Sortie, compteur = {self.__freezeCount} !"
-        )
 
     # def isFrozen(self) -> bool:
     def isFrozen(self):
@@ -1048,7 +1048,9 @@ class TaskFile(patterns.Observer):
         try:
             if self.exists():
                 # fd = self._openForRead()
-                with self._openForRead() as fd:
+                # Les événements émis pendant la lecture sont regroupés et
+                # envoyés une seule fois, voir patterns.Publisher.batch().
+                with patterns.Publisher().batch(), self._openForRead() as fd:
                     log.info(
                         f"TaskFile.load : fd={fd} ouvert en mode lecture binaire !"
                     )
@@ -1113,8 +1115,9 @@ class TaskFile(patterns.Observer):
                 )
             # Protection contre les erreurs d'observateurs lors de l'ajout
             try:
-                self.tasks().extend(tasks)
-                self.notes().extend(notes)
+                with patterns.Publisher().batch():
+                    self.tasks().extend(tasks)
+                    self.notes().extend(notes)
             except Exception as e:
                 log.error(
                     f"TaskFile.load : Erreur lors de l'extension des tâches/notes, vérifiez les observateurs : {e}",
@@ -1429,16 +1432,17 @@ class TaskFile(patterns.Observer):
                     log.debug(
                         f"TaskFile.mergeDiskChanges : Synchronisation des changements pour les catégories, tâches et notes."
                     )
-                    sync.sync(
-                        [
-                            (
-                                self.categories(),
-                                category.CategoryList(categories),
-                            ),
-                            (self.tasks(), task.TaskList(tasks)),
-                            (self.notes(), note.NoteContainer(notes)),
-                        ]
-                    )
+                    with patterns.Publisher().batch():
+                        sync.sync(
+                            [
+                                (
+                                    self.categories(),
+                                    category.CategoryList(categories),
+                                ),
+                                (self.tasks(), task.TaskList(tasks)),
+                                (self.notes(), note.NoteContainer(notes)),
+                            ]
+                        )
 
                     self.__changes[self.__monitor.guid()] = self.__monitor
                     log.debug(
@@ -1422,13 +1422,18 @@ class XMLReader(object):  # nouvelle classe
                         # have prerequisites listed that don't exist anymore
                         pass
                 each_task.setPrerequisites(prerequisites)
-                for prerequisite in prerequisites:
-                    prerequisite.addDependencies([each_task])
                 resolve_ids(each_task.children())
                 # print(f"resolve_ids : Résultat du remplacement en instances de each_task {each_task} : prerequisites = {prerequisites}")
 
         collect_ids(tasks)
         resolve_ids(tasks)
+        # Les dépendances de chaque prérequis sont définies en une fois,
+        # plutôt qu'un arc à la fois.
+        graph = task.DependencyGraph(tasks_by_id.values())
+        for each_task in tasks_by_id.values():
+            dependencies = graph.dependencies(each_task)
+            if dependencies:
+                each_task.addDependencies(dependencies)
 
     # def __resolve_categories(self, categories, tasks, notes):
     #     """
@@ -116,6 +116,7 @@ import os
 import sys
 from taskcoachlib import meta
 from taskcoachlib.domain import date, task, note, category
+from taskcoachlib.tools import tracing
 from xml.etree import ElementTree as eTree
 
 log = logging.getLogger(__name__)
@@ -402,6 +403,10 @@ class XMLWriter(object):
         self.__fd = fd
         self.__versionnr = versionnr
 
+    @tracing.traced(
+        "XMLWriter.write",
+        itemCount=lambda self, taskList, *args, **kwargs: len(taskList),
+    )
     def write(
         self, taskList, categoryContainer, noteContainer, syncMLConfig, guid
     ):
@@ -451,15 +456,11 @@ class XMLWriter(object):
         #     root,
         # ).write(self.__fd, encoding="utf-8")
         pi_content = f'<?taskcoach release="{meta.data.version}" tskversion="{self.__versionnr}"?>\n'
-        log.debug(f"XMLWriter.write : Après flatten, root = {root}")
         tree = eTree.ElementTree(root)
-        log.debug(f"XMLWriter.write : tree = {tree}")
         tree_str = eTree.tostring(
             tree.getroot(), encoding="utf-8", xml_declaration=False
         ).decode("utf-8")
         # xml_bytes = ET.tostring(tree.getroot(), encoding='utf-8', xml_declaration=False)
-        log.debug(f"XMLWriter.write : tree_str = {tree_str}")
-        log.debug(f"XMLWriter.write : Écriture du fichier {self.__fd.name}.")
         self.__fd.write(pi_content + tree_str)
         # try:
         #     self.__fd.write(pi_content.encode('utf-8'))
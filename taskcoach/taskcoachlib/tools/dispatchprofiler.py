@@ -0,0 +1,257 @@
+"""
+Task Coach - Your friendly task manager
+Copyright (C) 2021 Task Coach developers <developers@taskcoach.org>
+
+Task Coach is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Task Coach is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Profileur de la distribution des notifications.
+
+Mesure, par sujet (type d'événement de patterns.Publisher ou topic
+PyPubSub) et par écouteur, le nombre de messages ainsi que le temps cumulé
+et maximal passé à les traiter. Les temps sont inclusifs : un écouteur qui
+envoie lui-même un message est crédité du temps de distribution de ce
+message.
+
+Côté patterns.Publisher, `enable()` remplace Publisher.notifyObservers et
+MethodProxy.__call__ par des versions chronométrées et `disable()` remet les
+originales en place. Côté PyPubSub, un gestionnaire de notifications
+(pub.addNotificationHandler) est installé à la première activation et ne
+fait rien tant que le profileur est désactivé.
+
+Usage :
+    from taskcoachlib.tools import dispatchprofiler
+
+    dispatchprofiler.enable()
+    ...
+    print(dispatchprofiler.report())
+"""
+
+import logging
+import time
+
+from pubsub import pub
+
+from taskcoachlib.patterns import observer
+
+log = logging.getLogger(__name__)
+
+
+class Stats(object):
+    """Statistiques de distribution d'un sujet ou d'un écouteur."""
+
+    __slots__ = ("count", "total", "maximum")
+
+    def __init__(self):
+        self.count = 0
+        self.total = 0.0
+        self.maximum = 0.0
+
+    def add(self, duration):
+        self.count += 1
+        self.total += duration
+        if duration > self.maximum:
+            self.maximum = duration
+
+
+_enabled = False
+_topicStats = {}
+_listenerStats = {}
+_originalNotifyObservers = observer.Publisher.notifyObservers
+_originalMethodProxyCall = observer.MethodProxy.__call__
+
+
+def _add(stats, name, duration):
+    try:
+        entry = stats[name]
+    except KeyError:
+        entry = stats[name] = Stats()
+    entry.add(duration)
+
+
+def _callableName(function):
+    """Renvoie le nom qualifié (module.Classe.méthode) d'un écouteur."""
+    function = getattr(function, "__func__", function)
+    module = getattr(function, "__module__", None) or "?"
+    name = getattr(function, "__qualname__", None) or repr(function)
+    return f"{module}.{name}"
+
+
+def _profiledNotifyObservers(self, event):
+    start = time.perf_counter()
+    try:
+        return _originalNotifyObservers(self, event)
+    finally:
+        duration = time.perf_counter() - start
+        _add(_topicStats, ", ".join(sorted(event.types())), duration)
+
+
+def _profiledMethodProxyCall(self, *args, **kwargs):
+    start = time.perf_counter()
+    try:
+        return _originalMethodProxyCall(self, *args, **kwargs)
+    finally:
+        duration = time.perf_counter() - start
+        method = self.method
+        if method is not None:
+            _add(_listenerStats, _callableName(method), duration)
+
+
+class PubsubNotificationHandler(pub.INotificationHandler):
+    """Gestionnaire de notifications PyPubSub qui chronomètre les envois.
+
+    PyPubSub signale le début d'un envoi ('pre'), chaque écouteur sur le
+    point d'être appelé ('in') et la fin de l'envoi ('post'). Les envois
+    imbriqués (un écouteur qui envoie un message) sont gérés par une pile.
+    """
+
+    def __init__(self):
+        # Chaque cadre : [topic, début, nom de l'écouteur en cours, début].
+        self.__frames = []
+
+    def reset(self):
+        self.__frames = []
+
+    def notifySend(self, stage, topicObj, pubListener=None):
+        if not _enabled:
+            return
+        now = time.perf_counter()
+        if stage == "pre":
+            self.__frames.append([topicObj, now, None, now])
+            return
+        if not self.__frames:
+            return
+        if stage == "in":
+            frame = self.__frames[-1]
+            self.__closeListener(frame, now)
+            frame[2] = _callableName(pubListener.getCallable())
+            frame[3] = now
+        elif stage == "post":
+            # Les cadres d'envois interrompus par une exception n'ont jamais
+            # reçu de 'post' : on les abandonne.
+            while self.__frames:
+                frame = self.__frames.pop()
+                if frame[0] is topicObj:
+                    self.__closeListener(frame, now)
+                    _add(_topicStats, topicObj.getName(), now - frame[1])
+                    break
+
+    @staticmethod
+    def __closeListener(frame, now):
+        if frame[2] is not None:
+            _add(_listenerStats, frame[2], now - frame[3])
+            frame[2] = None
+
+    def notifySubscribe(self, pubListener, topicObj, newSub):
+        pass
+
+    def notifyUnsubscribe(self, pubListener, topicObj):
+        pass
+
+    def notifyDeadListener(self, pubListener, topicObj):
+        pass
+
+    def notifyNewTopic(self, topicObj, description, required, argsDocs):
+        pass
+
+    def notifyDelTopic(self, topicName):
+        pass
+
+
+_pubsubHandler = None
+
+
+def enable():
+    """Active le profilage de patterns.Publisher et de PyPubSub."""
+    global _enabled, _pubsubHandler
+    if _enabled:
+        return
+    _enabled = True
+    observer.Publisher.notifyObservers = _profiledNotifyObservers
+    observer.MethodProxy.__call__ = _profiledMethodProxyCall
+    if _pubsubHandler is None:
+        _pubsubHandler = PubsubNotificationHandler()
+        pub.addNotificationHandler(_pubsubHandler)
+    _pubsubHandler.reset()
+    pub.setNotificationFlags(sendMessage=True)
+
+
+def disable():
+    """Désactive le profilage (les statistiques sont conservées)."""
+    global _enabled
+    if not _enabled:
+        return
+    _enabled = False
+    observer.Publisher.notifyObservers = _originalNotifyObservers
+    observer.MethodProxy.__call__ = _originalMethodProxyCall
+    pub.setNotificationFlags(sendMessage=False)
+
+
+def isEnabled():
+    """Renvoie True si le profilage est activé."""
+    return _enabled
+
+
+def clear():
+    """Oublie les statistiques recueillies."""
+    _topicStats.clear()
+    _listenerStats.clear()
+
+
+def topicStats():
+    """Renvoie un dictionnaire {sujet : Stats}."""
+    return dict(_topicStats)
+
+
+def listenerStats():
+    """Renvoie un dictionnaire {écouteur : Stats}."""
+    return dict(_listenerStats)
+
+
+def _table(title, stats, limit):
+    lines = [
+        title,
+        f"{'messages':>10} {'cumulé (ms)':>12} {'max (ms)':>10}  nom",
+    ]
+    entries = sorted(
+        stats.items(), key=lambda item: item[1].total, reverse=True
+    )
+    for name, entry in entries[:limit]:
+        lines.append(
+            f"{entry.count:>10} {entry.total * 1e3:>12.3f} "
+            f"{entry.maximum * 1e3:>10.3f}  {name}"
+        )
+    return lines
+
+
+def report(limit=None):
+    """Renvoie le rapport des sujets et des écouteurs, triés par temps
+    cumulé décroissant.
+
+    Args :
+        limit (int | None) : Nombre maximal de lignes par tableau.
+
+    Returns :
+        str : Le rapport.
+    """
+    lines = _table("Sujets :", _topicStats, limit)
+    lines.append("")
+    lines.extend(_table("Écouteurs :", _listenerStats, limit))
+    return "\n".join(lines) + "\n"
+
+
+def writeReport(filename, limit=None):
+    """Écrit le rapport dans le fichier filename."""
+    with open(filename, "w", encoding="utf-8") as reportFile:
+        reportFile.write(report(limit))
+    log.info("Rapport de distribution écrit dans %s", filename)
@@ -0,0 +1,169 @@
+"""
+Task Coach - Your friendly task manager
+Copyright (C) 2021 Task Coach developers <developers@taskcoach.org>
+
+Task Coach is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Task Coach is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Traçage des chemins critiques (gel/dégel des collections, réinitialisation
+des filtres, tri, sauvegarde).
+
+Les méthodes décorées par `traced` enregistrent, lorsque le traçage est
+activé, une `Span` (nom, durée, nombre d'éléments). Lorsqu'il est désactivé
+(par défaut), la classe contient la méthode d'origine, non enveloppée :
+`enable()` installe les enveloppes de mesure et `disable()` les retire.
+Le traçage ne coûte donc rien tant qu'il n'est pas activé.
+
+Usage :
+    from taskcoachlib.tools import tracing
+
+    @tracing.traced("Filter.reset", itemCount=lambda self, *a, **k: len(self))
+    def reset(self, event=None):
+        ...
+
+    tracing.enable()
+    ...
+    for span in tracing.spans():
+        print(span.name, span.duration, span.itemCount)
+"""
+
+import collections
+import functools
+import logging
+import time
+import types
+
+log = logging.getLogger(__name__)
+
+# Nombre maximal de spans conservées, pour ne pas grossir indéfiniment
+# lorsque le traçage reste activé pendant une longue session.
+MAX_SPANS = 10000
+
+Span = collections.namedtuple("Span", ["name", "duration", "itemCount"])
+
+_enabled = False
+_spans = collections.deque(maxlen=MAX_SPANS)
+
+
+def enable():
+    """Active l'enregistrement des spans en installant les enveloppes de
+    mesure sur les méthodes tracées."""
+    global _enabled
+    _enabled = True
+    for tracedFunction in _registry:
+        tracedFunction.install(True)
+
+
+def disable():
+    """Désactive l'enregistrement des spans et remet en place les méthodes
+    d'origine (les spans déjà enregistrées sont conservées)."""
+    global _enabled
+    _enabled = False
+    for tracedFunction in _registry:
+        tracedFunction.install(False)
+
+
+def isEnabled():
+    """Renvoie True si le traçage est activé."""
+    return _enabled
+
+
+def spans():
+    """Renvoie la liste des spans enregistrées, de la plus ancienne à la
+    plus récente."""
+    return list(_spans)
+
+
+def clear():
+    """Oublie toutes les spans enregistrées."""
+    _spans.clear()
+
+
+def record(name, duration, itemCount=None):
+    """Enregistre une span. Ne fait rien si le traçage est désactivé.
+
+    Args :
+        name (str) : Nom du chemin tracé.
+        duration (float) : Durée en secondes.
+        itemCount (int | None) : Nombre d'éléments traités, si connu.
+    """
+    if not _enabled:
+        return
+    _spans.append(Span(name, duration, itemCount))
+    log.debug("%s : %.3f ms, %s éléments", name, duration * 1e3, itemCount)
+
+
+class _Traced(object):
+    """Enveloppe de mesure d'une fonction tracée.
+
+    Placée dans le corps d'une classe, elle se remplace par la fonction
+    d'origine dès la création de la classe (`__set_name__`) et s'inscrit
+    dans `_registry` pour être installée par `enable()`.
+    """
+
+    def __init__(self, func, name, itemCount):
+        self.func = func
+        self.name = name
+        self.itemCount = itemCount
+        self.owner = self.attribute = None
+        functools.update_wrapper(self, func)
+
+    def __set_name__(self, owner, attribute):
+        self.owner, self.attribute = owner, attribute
+        _registry.append(self)
+        setattr(owner, attribute, self.func if not _enabled else self)
+
+    def __get__(self, instance, owner=None):
+        if instance is None:
+            return self
+        return types.MethodType(self, instance)
+
+    def __call__(self, *args, **kwargs):
+        if not _enabled:
+            return self.func(*args, **kwargs)
+        start = time.perf_counter()
+        try:
+            return self.func(*args, **kwargs)
+        finally:
+            duration = time.perf_counter() - start
+            count = None
+            if self.itemCount:
+                count = self.itemCount(*args, **kwargs)
+            record(self.name, duration, count)
+
+    def install(self, enabled):
+        setattr(self.owner, self.attribute, self if enabled else self.func)
+
+
+_registry = []
+
+
+def traced(name, itemCount=None):
+    """Décorateur qui enregistre une span à chaque appel de la fonction
+    décorée lorsque le traçage est activé.
+
+    Args :
+        name (str) : Nom de la span.
+        itemCount (callable | None) : Fonction appelée, après la fonction
+            décorée, avec les mêmes arguments qu'elle et qui renvoie le
+            nombre d'éléments traités.
+
+    Returns :
+        Le décorateur. Pour une méthode, la classe contient la fonction
+        d'origine tant que le traçage est désactivé.
+    """
+
+    def decorator(func):
+        return _Traced(func, name, itemCount)
+
+    return decorator
@@ -0,0 +1,92 @@
+#!/usr/bin/env python
+
+"""
+Task Coach - Your friendly task manager
+Copyright (C) 2021 Task Coach developers <developers@taskcoach.org>
+
+Task Coach is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Task Coach is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Benchmark de Publisher.batch().
+
+Simule le collage de nombreuses tâches sous un même parent : chaque tâche
+est ajoutée à la liste, son sujet change et le parent reçoit un message
+pubsub de changement. Compte les notifications reçues par un observateur
+(comme le ferait un trieur ou un filtre) avec et sans regroupement.
+
+Usage :
+    python tests/benchmarks/batch_benchmark.py [nombre de tâches]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from pubsub import pub  # noqa: E402
+
+from taskcoachlib import patterns  # noqa: E402
+
+
+class Viewer(object):
+    """Observateur minimal qui compte les notifications reçues."""
+
+    def __init__(self, observable):
+        self.nrEvents = self.nrMessages = 0
+        publisher = patterns.Publisher()
+        publisher.registerObserver(
+            self.onEvent, eventType=observable.addItemEventType()
+        )
+        publisher.registerObserver(self.onEvent, eventType="task.subject")
+        pub.subscribe(self.onMessage, "benchmark.task.timeSpent")
+
+    def onEvent(self, event):
+        self.nrEvents += 1
+
+    def onMessage(self, newValue, sender):
+        self.nrMessages += 1
+
+
+def paste(taskList, parent, nrTasks):
+    for index in range(nrTasks):
+        item = object()
+        taskList.append(item)
+        patterns.Event("task.subject", item, f"Task {index}").send()
+        pub.sendMessage("benchmark.task.timeSpent", newValue=index, sender=parent)
+
+
+def benchmark(nrTasks=5000):
+    for batched in (False, True):
+        patterns.Publisher().clear()
+        pub.unsubAll()
+        taskList = patterns.ObservableList()
+        viewer = Viewer(taskList)
+        start = time.perf_counter()
+        if batched:
+            with patterns.Publisher().batch():
+                paste(taskList, object(), nrTasks)
+        else:
+            paste(taskList, object(), nrTasks)
+        duration = time.perf_counter() - start
+        print(
+            f"{'avec' if batched else 'sans'} batch() : "
+            f"{viewer.nrEvents} événements, {viewer.nrMessages} messages "
+            f"en {duration:.3f}s"
+        )
+    patterns.Publisher().clear()
+    pub.unsubAll()
+
+
+if __name__ == "__main__":
+    benchmark(*[int(arg) for arg in sys.argv[1:2]])
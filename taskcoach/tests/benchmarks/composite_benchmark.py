@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+"""
+Task Coach - Your friendly task manager
+Copyright (C) 2021 Task Coach developers <developers@taskcoach.org>
+
+Task Coach is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Task Coach is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Benchmark des caches d'ancêtres et de descendants de patterns.Composite.
+
+Construit un arbre aléatoire (50 000 nœuds, profondeur 12 par défaut) puis,
+comme le fait Filter.reset en mode arborescence, demande les ancêtres de
+chaque nœud et les descendants de chaque racine. Compare l'algorithme
+d'origine (listes reconstruites à chaque appel) avec les caches, avant et
+après une modification de la structure.
+
+Usage :
+    python tests/benchmarks/composite_benchmark.py [nombre de nœuds]
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from taskcoachlib import patterns  # noqa: E402
+
+
+def uncachedAncestors(composite):
+    parent = composite.parent()
+    return uncachedAncestors(parent) + [parent] if parent else []
+
+
+def uncachedDescendants(composite):
+    result = composite.children()[:]
+    for child in composite.children():
+        result.extend(uncachedDescendants(child))
+    return result
+
+
+def createTree(nrNodes, depth, seed=0):
+    rng = random.Random(seed)
+    nodes = [patterns.Composite()]
+    depths = [0]
+    while len(nodes) < nrNodes:
+        index = rng.randrange(len(nodes))
+        if depths[index] < depth - 1:
+            child = patterns.Composite()
+            nodes[index].addChild(child)
+            nodes.append(child)
+            depths.append(depths[index] + 1)
+    return nodes, max(depths) + 1
+
+
+def visit(nodes, ancestors, descendants):
+    for node in nodes:
+        ancestors(node)
+    for node in nodes:
+        if len(node.children()) > 5:
+            descendants(node)
+
+
+def timed(function):
+    start = time.perf_counter()
+    function()
+    return time.perf_counter() - start
+
+
+def benchmark(nrNodes=50000, depth=12):
+    nodes, actualDepth = createTree(nrNodes, depth)
+    print(f"{len(nodes)} nœuds, profondeur {actualDepth}")
+    uncached = timed(
+        lambda: visit(nodes, uncachedAncestors, uncachedDescendants)
+    )
+    print(f"sans cache              : {uncached:.3f}s")
+    cached = lambda: visit(  # noqa: E731
+        nodes,
+        patterns.Composite.ancestors,
+        lambda node: node.children(recursive=True),
+    )
+    print(f"avec cache, à froid     : {timed(cached):.3f}s")
+    print(f"avec cache, à chaud     : {timed(cached):.3f}s")
+    leaf = nodes[-1]
+    leaf.parent().removeChild(leaf)
+    nodes[0].addChild(leaf)
+    print(f"après un déplacement    : {timed(cached):.3f}s")
+
+
+if __name__ == "__main__":
+    benchmark(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,103 @@
+#!/usr/bin/env python
+
+"""
+Task Coach - Your friendly task manager
+Copyright (C) 2021 Task Coach developers <developers@taskcoach.org>
+
+Task Coach is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Task Coach is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Benchmark des lectures d'attributs des efforts.
+
+Mesure le temps de lecture des méthodes task, subject, getStart et
+getStop des efforts, telles qu'une visionneuse d'efforts les lit à chaque
+rafraîchissement, d'abord pour effort.Effort puis pour une sous-classe qui
+rétablit l'ancienne protection par __getattribute__ contre les attributs
+d'instance qui masquent les méthodes.
+
+Usage :
+    python tests/benchmarks/effortaccess_benchmark.py [nombre de lectures]
+
+Sans argument, le benchmark effectue 10 000 000 de lectures par variante.
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from taskcoachlib import config  # noqa: E402
+from taskcoachlib.domain import date, effort, task  # noqa: E402
+
+NR_EFFORTS = 1000
+ATTRIBUTES = ("task", "subject", "getStart", "getStop")
+
+
+class GetAttributeEffort(effort.Effort):
+    """Effort qui protège ses méthodes à chaque lecture d'attribut."""
+
+    def __getattribute__(self, name):
+        if name in effort.Effort._protectedMethodNames:
+            for cls in type(self).__mro__:
+                if name in cls.__dict__:
+                    method = cls.__dict__[name]
+                    if callable(method):
+                        return method.__get__(self, type(self))
+                    break
+        return object.__getattribute__(self, name)
+
+
+def createEfforts(effortClass):
+    theTask = task.Task(subject="task")
+    start = date.DateTime(2020, 1, 1)
+    efforts = []
+    for index in range(NR_EFFORTS):
+        newEffort = effortClass(
+            theTask,
+            start + date.TimeDelta(minutes=index),
+            start + date.TimeDelta(minutes=index + 1),
+        )
+        theTask.addEffort(newEffort)
+        efforts.append(newEffort)
+    return efforts
+
+
+def run(effortClass, nrReads):
+    efforts = createEfforts(effortClass)
+    nrRounds = max(1, nrReads // (NR_EFFORTS * len(ATTRIBUTES)))
+    start = time.perf_counter()
+    for _ in range(nrRounds):
+        for eachEffort in efforts:
+            eachEffort.task
+            eachEffort.subject
+            eachEffort.getStart
+            eachEffort.getStop
+    return time.perf_counter() - start, nrRounds * NR_EFFORTS * len(ATTRIBUTES)
+
+
+def benchmark(nrReads=10000000):
+    task.Task.settings = config.Settings(load=False)
+    for label, effortClass in (
+        ("Effort", effort.Effort),
+        ("__getattribute__", GetAttributeEffort),
+    ):
+        duration, nrDone = run(effortClass, nrReads)
+        print(
+            f"  {label:<18} {nrDone} lectures {duration:8.2f}s  "
+            f"{duration / nrDone * 1e9:6.1f}ns/lecture"
+        )
+
+
+if __name__ == "__main__":
+    benchmark(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,134 @@
+#!/usr/bin/env python
+
+"""
+Task Coach - Your friendly task manager
+Copyright (C) 2021 Task Coach developers <developers@taskcoach.org>
+
+Task Coach is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Task Coach is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Benchmark des filtres des visionneuses de tâches : la pile SearchFilter ->
+ViewFilter -> CategoryFilter -> DeletedFilter comparée au pipeline fusionné
+task.filter.TaskFilterPipeline.
+
+Mesure, pour chaque variante, la création des filtres, la frappe d'une
+recherche, le masquage des tâches terminées, le filtrage sur une catégorie
+et l'ajout de tâches, et vérifie que les deux variantes montrent les mêmes
+tâches (mode liste).
+
+Usage :
+    python tests/benchmarks/filterpipeline_benchmark.py [nombre de tâches]
+
+Sans argument, le benchmark est exécuté pour 10 000 puis 100 000 tâches.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from taskcoachlib import config  # noqa: E402
+from taskcoachlib.domain import base, category, task  # noqa: E402
+
+WORDS = ["alpha", "beta", "gamma", "delta", "epsilon", "zeta", "theta"]
+
+
+def createTasks(nrTasks, categories, rng):
+    tasks = []
+    for index in range(nrTasks):
+        newTask = task.Task(
+            subject=f"{rng.choice(WORDS)} {rng.choice(WORDS)} {index}"
+        )
+        if index % 10 == 0:
+            newTask.setCompletionDateTime()
+        if index % 3 == 0:
+            eachCategory = rng.choice(categories)
+            eachCategory.addCategorizable(newTask)
+            newTask.addCategory(eachCategory)
+        tasks.append(newTask)
+    return tasks
+
+
+def stackedFilters(taskList, categories):
+    deletedFilter = base.DeletedFilter(taskList)
+    categoryFilter = category.filter.CategoryFilter(
+        deletedFilter, categories=categories
+    )
+    viewFilter = task.filter.ViewFilter(categoryFilter)
+    return base.SearchFilter(viewFilter)
+
+
+def fusedFilters(taskList, categories):
+    return task.filter.TaskFilterPipeline(taskList, categories=categories)
+
+
+def timed(results, label, function):
+    start = time.perf_counter()
+    value = function()
+    results.append((label, time.perf_counter() - start))
+    return value
+
+
+def run(createFilters, nrTasks):
+    rng = random.Random(1)
+    task.Task.settings = config.Settings(load=False)
+    categoryList = category.CategoryList(
+        [category.Category(subject=f"category {index}") for index in range(5)]
+    )
+    categories = list(categoryList)
+    taskList = task.TaskList(createTasks(nrTasks, categories, rng))
+    results = []
+    filters = timed(
+        results, "création", lambda: createFilters(taskList, categoryList)
+    )
+
+    def typeSearch():
+        for searchString in ("g", "ga", "gam", "gamm", "gamma"):
+            filters.setSearchFilter(searchString)
+
+    timed(results, "recherche (5 frappes)", typeSearch)
+    timed(
+        results,
+        "masquer les terminées",
+        lambda: filters.hideTaskStatus(task.status.completed),
+    )
+    timed(results, "filtrer une catégorie", categories[0].setFiltered)
+    timed(
+        results,
+        "ajouter 1000 tâches",
+        lambda: taskList.extend(createTasks(1000, categories, rng)),
+    )
+    contents = sorted(eachTask.subject() for eachTask in filters)
+    filters.detach()
+    return results, contents
+
+
+def benchmark(nrTasks=None):
+    for size in [nrTasks] if nrTasks else [10000, 100000]:
+        stacked, stackedContents = run(stackedFilters, size)
+        fused, fusedContents = run(fusedFilters, size)
+        print(f"{size} tâches :")
+        for (label, stackedDuration), (_, fusedDuration) in zip(
+            stacked, fused
+        ):
+            print(
+                f"  {label:<24} empilés {stackedDuration * 1e3:10.1f}ms  "
+                f"fusionnés {fusedDuration * 1e3:10.1f}ms"
+            )
+        print(f"  mêmes tâches : {stackedContents == fusedContents}")
+
+
+if __name__ == "__main__":
+    benchmark(*[int(arg) for arg in sys.argv[1:2]])
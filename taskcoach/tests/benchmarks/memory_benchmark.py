@@ -0,0 +1,110 @@
+#!/usr/bin/env python
+
+"""
+Task Coach - Your friendly task manager
+Copyright (C) 2021 Task Coach developers <developers@taskcoach.org>
+
+Task Coach is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Task Coach is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Benchmark de la mémoire occupée par les tâches et les efforts.
+
+Mesure avec tracemalloc le nombre d'octets alloués par tâche et par effort
+à la création, puis par tâche et par effort une fois leurs couleurs et
+leurs champs d'apparence calculés (ce qui crée les Attribute déclarés par
+un AttributeField).
+
+Pour comparer avant et après une modification du stockage des attributs,
+exécuter le même script sur les deux révisions :
+
+    git stash; python tests/benchmarks/memory_benchmark.py
+    git stash pop; python tests/benchmarks/memory_benchmark.py
+
+Usage :
+    python tests/benchmarks/memory_benchmark.py [nombre de tâches]
+
+Sans argument, le benchmark crée 10 000 tâches et 50 000 efforts.
+"""
+
+import gc
+import os
+import sys
+import tracemalloc
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from taskcoachlib import config  # noqa: E402
+from taskcoachlib.domain import date, effort, task  # noqa: E402
+
+EFFORTS_PER_TASK = 5
+
+
+def measured(create):
+    """Renvoie la valeur créée par create() et les octets alloués."""
+    gc.collect()
+    tracemalloc.start()
+    before = tracemalloc.get_traced_memory()[0]
+    value = create()
+    gc.collect()
+    allocated = tracemalloc.get_traced_memory()[0] - before
+    tracemalloc.stop()
+    return value, allocated
+
+
+def createTasks(nrTasks):
+    return [task.Task(subject=f"task {index}") for index in range(nrTasks)]
+
+
+def createEfforts(tasks):
+    start = date.DateTime(2020, 1, 1)
+    efforts = []
+    for eachTask in tasks:
+        for index in range(EFFORTS_PER_TASK):
+            newEffort = effort.Effort(
+                eachTask,
+                start + date.TimeDelta(hours=index),
+                start + date.TimeDelta(hours=index, minutes=30),
+            )
+            eachTask.addEffort(newEffort)
+            efforts.append(newEffort)
+    return efforts
+
+
+def computeAppearance(objects):
+    for eachObject in objects:
+        eachObject.setDerivedFgColor("derived", "benchmark")
+        eachObject.setEffectiveFgColor("effective", "default", "benchmark")
+
+
+def benchmark(nrTasks=10000):
+    task.Task.settings = config.Settings(load=False)
+    tasks, taskBytes = measured(lambda: createTasks(nrTasks))
+    efforts, effortBytes = measured(lambda: createEfforts(tasks))
+    nrEfforts = len(efforts)
+    print(f"{nrTasks} tâches, {nrEfforts} efforts :")
+    print(f"  octets par tâche              {taskBytes / nrTasks:10.0f}")
+    print(f"  octets par effort             {effortBytes / nrEfforts:10.0f}")
+    _, appearanceBytes = measured(lambda: computeAppearance(tasks))
+    print(
+        f"  octets par tâche (apparence)  "
+        f"{(taskBytes + appearanceBytes) / nrTasks:10.0f}"
+    )
+    _, appearanceBytes = measured(lambda: computeAppearance(efforts))
+    print(
+        f"  octets par effort (apparence) "
+        f"{(effortBytes + appearanceBytes) / nrEfforts:10.0f}"
+    )
+
+
+if __name__ == "__main__":
+    benchmark(*[int(arg) for arg in sys.argv[1:2]])
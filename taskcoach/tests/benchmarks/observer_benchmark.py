@@ -0,0 +1,85 @@
+#!/usr/bin/env python
+
+"""
+Task Coach - Your friendly task manager
+Copyright (C) 2021 Task Coach developers <developers@taskcoach.org>
+
+Task Coach is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Task Coach is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Micro-benchmark de Publisher.notifyObservers.
+
+Envoie un grand nombre d'événements (un million par défaut) à une douzaine
+d'observateurs, comme le ferait une modification en masse de tâches avec
+plusieurs visionneuses ouvertes.
+
+Usage :
+    python tests/benchmarks/observer_benchmark.py [nombre d'événements]
+"""
+
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from taskcoachlib import patterns  # noqa: E402
+
+
+class Viewer(object):
+    """Observateur minimal qui compte les événements reçus."""
+
+    def __init__(self):
+        self.count = 0
+
+    def onEvent(self, event):
+        self.count += 1
+
+
+def benchmark(nrEvents=1000000, nrViewers=12, nrSources=100):
+    publisher = patterns.Publisher()
+    publisher.clear()
+    sources = [object() for _ in range(nrSources)]
+    viewers = [Viewer() for _ in range(nrViewers)]
+    # La moitié des visionneuses observe le type d'événement pour toutes les
+    # sources, l'autre moitié uniquement pour quelques sources.
+    for index, viewer in enumerate(viewers):
+        if index % 2:
+            publisher.registerObserver(viewer.onEvent, eventType="task.subject")
+        else:
+            for source in sources[index::nrViewers]:
+                publisher.registerObserver(
+                    viewer.onEvent, eventType="task.subject", eventSource=source
+                )
+    events = [
+        patterns.Event("task.subject", source, "new subject")
+        for source in sources
+    ]
+    nrEventsPerSource = nrEvents // len(events)
+    start = time.perf_counter()
+    for event in events:
+        for _ in range(nrEventsPerSource):
+            publisher.notifyObservers(event)
+    duration = time.perf_counter() - start
+    publisher.clear()
+    nrNotifications = sum(viewer.count for viewer in viewers)
+    print(
+        f"{nrEventsPerSource * len(events)} événements, "
+        f"{nrNotifications} notifications en {duration:.2f}s "
+        f"({duration / (nrEventsPerSource * len(events)) * 1e6:.2f}µs/événement)"
+    )
+    return duration
+
+
+if __name__ == "__main__":
+    benchmark(*[int(arg) for arg in sys.argv[1:2]])
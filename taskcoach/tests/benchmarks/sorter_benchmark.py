@@ -0,0 +1,84 @@
+#!/usr/bin/env python
+
+"""
+Task Coach - Your friendly task manager
+Copyright (C) 2021 Task Coach developers <developers@taskcoach.org>
+
+Task Coach is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Task Coach is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Benchmark du tri des tâches : modifications aléatoires de la priorité de
+tâches d'une liste triée par priorité, replacées une à une par
+Sorter.resetItems, comparées à un tri complet après chaque modification.
+
+Vérifie aussi que les deux variantes donnent le même ordre.
+
+Usage :
+    python tests/benchmarks/sorter_benchmark.py [nombre de tâches]
+
+Sans argument, le benchmark est exécuté pour 20 000 tâches et 1 000
+modifications.
+"""
+
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from taskcoachlib import config  # noqa: E402
+from taskcoachlib.domain import task  # noqa: E402
+
+NR_EDITS = 1000
+
+
+class FullResortSorter(task.sorter.Sorter):
+    """Le comportement précédent : chaque modification retrie tout."""
+
+    def resetItems(self, items):
+        self.reset()
+
+
+def run(sorterClass, nrTasks):
+    rng = random.Random(1)
+    task.Task.settings = config.Settings(load=False)
+    tasks = [
+        task.Task(subject=f"task {index}", priority=rng.randint(0, 9))
+        for index in range(nrTasks)
+    ]
+    taskList = task.TaskList(tasks)
+    sorter = sorterClass(taskList, sortBy=["priority", "subject"])
+    edits = [
+        (rng.choice(tasks), rng.randint(0, 9)) for _ in range(NR_EDITS)
+    ]
+    start = time.perf_counter()
+    for eachTask, priority in edits:
+        eachTask.setPriority(priority)
+    duration = time.perf_counter() - start
+    order = [eachTask.subject() for eachTask in sorter]
+    sorter.detach()
+    return duration, order
+
+
+def benchmark(nrTasks=20000):
+    fullDuration, fullOrder = run(FullResortSorter, nrTasks)
+    incrementalDuration, incrementalOrder = run(task.sorter.Sorter, nrTasks)
+    print(f"{nrTasks} tâches, {NR_EDITS} modifications de priorité :")
+    print(f"  tri complet       {fullDuration * 1e3:10.1f}ms")
+    print(f"  replacement       {incrementalDuration * 1e3:10.1f}ms")
+    print(f"  même ordre : {fullOrder == incrementalOrder}")
+
+
+if __name__ == "__main__":
+    benchmark(*[int(arg) for arg in sys.argv[1:2]])
@@ -0,0 +1,142 @@
+#!/usr/bin/env python
+
+"""
+Task Coach - Your friendly task manager
+Copyright (C) 2021 Task Coach developers <developers@taskcoach.org>
+
+Task Coach is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Task Coach is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+
+Benchmark du traçage des chemins critiques (taskcoachlib.tools.tracing).
+
+Mesure le gel/dégel d'une collection décorée, la réinitialisation d'un
+filtre et la sauvegarde XML avec le traçage désactivé puis activé, et
+vérifie que, désactivé, la classe contient bien la méthode d'origine : le
+traçage n'ajoute alors aucun appel.
+
+La partie filtre et sauvegarde nécessite wxPython (paquet domain) ; elle est
+ignorée s'il n'est pas disponible.
+
+Usage :
+    python tests/benchmarks/tracing_benchmark.py [nombre de tâches]
+"""
+
+import io
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.join(os.path.dirname(__file__), "..", ".."))
+
+from taskcoachlib import patterns  # noqa: E402
+from taskcoachlib.tools import tracing  # noqa: E402
+
+
+def measure(function, repeat):
+    start = time.perf_counter()
+    for _ in range(repeat):
+        function()
+    return (time.perf_counter() - start) / repeat
+
+
+def compare(label, function, repeat, *methods):
+    """Chronomètre function avec le traçage désactivé puis activé.
+
+    methods : couples (classe, nom d'attribut) des méthodes tracées dont on
+    vérifie qu'elles ne sont pas enveloppées lorsque le traçage est désactivé.
+    """
+    tracing.disable()
+    originals = all(
+        not hasattr(vars(owner)[attribute], "__wrapped__")
+        for owner, attribute in methods
+    )
+    durationDisabled = measure(function, repeat)
+    tracing.enable()
+    durationEnabled = measure(function, repeat)
+    nrSpans = len(tracing.spans())
+    tracing.disable()
+    tracing.clear()
+    print(
+        f"{label:<32} désactivé {durationDisabled * 1e6:10.1f}µs  "
+        f"activé {durationEnabled * 1e6:10.1f}µs  "
+        f"({nrSpans} spans, méthodes d'origine : {originals})"
+    )
+
+
+def benchmarkFreezeThaw(nrItems, repeat=100000):
+    decorator = patterns.ListDecorator(patterns.ObservableList(range(nrItems)))
+
+    def freezeThaw():
+        decorator.freeze()
+        decorator.thaw()
+
+    compare(
+        "CollectionDecorator freeze/thaw",
+        freezeThaw,
+        repeat,
+        (patterns.CollectionDecorator, "freeze"),
+        (patterns.CollectionDecorator, "thaw"),
+        (patterns.CollectionDecorator, "refresh"),
+    )
+
+
+def benchmarkFilterResetAndSave(nrTasks, repeat=20):
+    try:
+        from taskcoachlib import config, persistence
+        from taskcoachlib.domain import base, category, note, task
+    except ImportError as reason:
+        print(f"Filtre et sauvegarde ignorés : {reason}")
+        return
+    task.Task.settings = config.Settings(load=False)
+    parents = [task.Task(subject=f"Parent {index}") for index in range(10)]
+    children = [
+        task.Task(subject=f"Task {index}", parent=parents[index % 10])
+        for index in range(nrTasks)
+    ]
+    for child in children:
+        child.parent().addChild(child)
+    taskList = task.TaskList(parents + children)
+    searchFilter = base.SearchFilter(
+        taskList, searchString="Task 1", treeMode=True
+    )
+    compare(
+        "Filter.reset",
+        searchFilter.reset,
+        repeat,
+        (base.Filter, "reset"),
+    )
+
+    def save():
+        persistence.XMLWriter(io.StringIO()).write(
+            taskList,
+            category.CategoryList(),
+            note.NoteContainer(),
+            None,
+            "GUID",
+        )
+
+    compare(
+        "XMLWriter.write",
+        save,
+        repeat,
+        (persistence.XMLWriter, "write"),
+    )
+
+
+def benchmark(nrTasks=10000):
+    benchmarkFreezeThaw(nrTasks)
+    benchmarkFilterResetAndSave(nrTasks)
+
+
+if __name__ == "__main__":
+    benchmark(*[int(arg) for arg in sys.argv[1:2]])
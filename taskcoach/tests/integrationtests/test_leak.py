@@ -0,0 +1,62 @@
+"""
+Task Coach - Your friendly task manager
+Copyright (C) 2013 Task Coach developers <developers@taskcoach.org>
+
+Task Coach is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Task Coach is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import gc
+import weakref
+
+from .. import tctest
+from taskcoachlib import config, patterns, persistence
+from taskcoachlib.domain import task
+
+
+class LeakTest(tctest.TestCase):
+    def setUp(self):
+        super().setUp()
+        task.Task.settings = config.Settings(load=False)
+        self.taskFile = persistence.TaskFile()
+        self.task = task.Task("task")
+        self.taskFile.tasks().append(self.task)
+
+    def tearDown(self):
+        self.taskFile.close()
+        self.taskFile.stop()
+        super().tearDown()
+
+    def testClear(self):
+        taskRef = weakref.ref(self.task)
+        del self.task
+        self.taskFile.clear()
+        gc.collect()
+        self.assertTrue(taskRef() is None)
+
+    def testForgottenFilterAndSorterAreCollected(self):
+        viewFilter = task.filter.ViewFilter(self.taskFile.tasks())
+        sorter = task.sorter.Sorter(viewFilter)
+        filterRef, sorterRef = weakref.ref(viewFilter), weakref.ref(sorter)
+        del viewFilter, sorter
+        gc.collect()
+        self.assertTrue(filterRef() is None)
+        self.assertTrue(sorterRef() is None)
+
+    def testForgottenFilterNoLongerObservesTheTaskList(self):
+        nrObservers = len(patterns.Publisher().observers())
+        viewFilter = task.filter.ViewFilter(self.taskFile.tasks())
+        del viewFilter
+        gc.collect()
+        self.taskFile.tasks().append(task.Task("another task"))
+        self.assertEqual(nrObservers, len(patterns.Publisher().observers()))
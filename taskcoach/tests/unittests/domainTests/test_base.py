@@ -578,6 +578,28 @@ class ObjectTest(tctest.TestCase):
                 f"L'état contient une clé privée indésirable : {key}"
             )
 
+    # Compact storage:
+
+    def testAttributesWithDefaultValueAreNotStoredPerObject(self):
+        self.assertFalse("_Object__fgColor" in vars(self.tcobject))
+        self.assertFalse("_Object__derivedFgColorValue" in vars(self.tcobject))
+
+    def testSetAttributeToDefaultValueIsNotStoredPerObject(self):
+        self.tcobject.setForegroundColor(None)
+        self.assertFalse("_Object__fgColor" in vars(self.tcobject))
+        self.assertEqual([], self.eventsReceived)
+
+    def testResetAttributeToDefaultValueCausesNotification(self):
+        self.tcobject.setForegroundColor(wx.GREEN)
+        self.tcobject.setForegroundColor(None)
+        self.assertEqual(None, self.tcobject.foregroundColor())
+        self.assertEqual(2, len(self.eventsReceived))
+
+    def testDerivedAttributes(self):
+        self.tcobject.setDerivedFgColor(wx.GREEN, "test")
+        self.assertEqual(wx.GREEN, self.tcobject.derivedFgColor())
+        self.assertEqual("test", self.tcobject.derivedFgColorSource())
+
 
 class CompositeObjectTest(tctest.TestCase):
     def setUp(self):
@@ -411,6 +411,31 @@ class OneCategoryAndParentAndChildTaskFixture(Fixture):
         self.category.setFiltered()
         self.assertEqual(2 if self.treeMode else 1, len(self.filter))
 
+    def testThatFilterContainsGrandChildAddedAfterParentIsFiltered(self):
+        self.link(self.category, self.parentTask)
+        self.category.setFiltered()
+        grandChild = task.Task("grandchild")
+        self.childTask.addChild(grandChild)
+        grandChild.setParent(self.childTask)
+        self.tasks.append(grandChild)
+        self.assertEqual(3, len(self.filter))
+
+    def testThatFilterHidesChildRemovedFromCategorizedParent(self):
+        self.link(self.category, self.parentTask)
+        self.category.setFiltered()
+        self.tasks.remove(self.childTask)
+        self.assertEqual([self.parentTask], list(self.filter))
+
+    def testThatFilterHidesChildMovedToUncategorizedParent(self):
+        self.link(self.category, self.parentTask)
+        self.category.setFiltered()
+        otherTask = task.Task("other")
+        self.tasks.append(otherTask)
+        self.parentTask.removeChild(self.childTask)
+        otherTask.addChild(self.childTask)
+        self.childTask.setParent(otherTask)
+        self.assertEqual([self.parentTask], list(self.filter))
+
 
 class OneCategoryAndParentAndChildTaskInListModeTest(
     OneCategoryAndParentAndChildTaskFixture, tctest.TestCase
@@ -786,6 +811,41 @@ class ParentAndChildCategoryAndOneTaskFixture(Fixture):
         self.childCategory.setFiltered()
         self.assertFilterHidesNothing()
 
+    def testThatFilterContainsTaskLinkedToChildCategoryAfterParentIsFiltered(
+        self,
+    ):
+        self.parentCategory.setFiltered()
+        self.link(self.childCategory, self.task)
+        self.assertFilterHidesNothing()
+
+    def testThatFilterHidesTaskAfterChildCategoryIsRemovedFromParent(self):
+        self.link(self.childCategory, self.task)
+        self.parentCategory.setFiltered()
+        self.parentCategory.removeChild(self.childCategory)
+        self.assertFilterHidesEverything()
+
+    def testThatFilterContainsTaskAfterCategorizedSubcategoryIsAdded(self):
+        self.parentCategory.setFiltered()
+        newCategory = category.Category("new")
+        self.link(newCategory, self.task)
+        self.parentCategory.addChild(newCategory)
+        self.assertFilterHidesNothing()
+
+    def testThatToggleFilteringDoesNotRecomputeCategoryMembers(self):
+        self.link(self.childCategory, self.task)
+        calls = []
+        categorizables = self.parentCategory.categorizables
+
+        def countingCategorizables(*args, **kwargs):
+            calls.append(args)
+            return categorizables(*args, **kwargs)
+
+        self.parentCategory.categorizables = countingCategorizables
+        for _ in range(3):
+            self.parentCategory.setFiltered()
+            self.parentCategory.setFiltered(False)
+        self.assertEqual(1, len(calls))
+
 
 class ParentAndChildCategoryAndTaskInListModeTest(
     ParentAndChildCategoryAndOneTaskFixture, tctest.TestCase
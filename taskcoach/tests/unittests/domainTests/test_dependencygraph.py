@@ -0,0 +1,132 @@
+"""
+Task Coach - Your friendly task manager
+Copyright (C) 2004-2016 Task Coach developers <developers@taskcoach.org>
+
+Task Coach is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Task Coach is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from ... import tctest
+from taskcoachlib import config
+from taskcoachlib.domain import task
+
+
+class DependencyGraphTest(tctest.TestCase):
+    def setUp(self):
+        super().setUp()
+        task.Task.settings = config.Settings(load=False)
+        self.prerequisite = task.Task(subject="prerequisite")
+        self.dependency = task.Task(
+            subject="dependency", prerequisites=[self.prerequisite]
+        )
+        self.graph = task.DependencyGraph([self.prerequisite, self.dependency])
+
+    def testLength(self):
+        self.assertEqual(2, len(self.graph))
+
+    def testContains(self):
+        self.assertTrue(self.dependency in self.graph)
+        self.assertFalse(task.Task() in self.graph)
+
+    def testPrerequisites(self):
+        self.assertEqual(
+            {self.prerequisite}, self.graph.prerequisites(self.dependency)
+        )
+
+    def testDependencies(self):
+        self.assertEqual(
+            {self.dependency}, self.graph.dependencies(self.prerequisite)
+        )
+
+    def testIncompletePrerequisiteCount(self):
+        self.assertEqual(
+            1, self.graph.incompletePrerequisiteCount(self.dependency)
+        )
+        self.assertEqual(
+            0, self.graph.incompletePrerequisiteCount(self.prerequisite)
+        )
+
+    def testUpdateCompletion(self):
+        self.prerequisite.setCompletionDateTime()
+        self.assertEqual(
+            [self.dependency], self.graph.updateCompletion(self.prerequisite)
+        )
+        self.assertFalse(
+            self.graph.hasIncompletePrerequisites(self.dependency)
+        )
+
+    def testUpdateCompletionWithoutChange(self):
+        self.assertEqual([], self.graph.updateCompletion(self.prerequisite))
+
+    def testUpdateCompletionOfTaskWithoutDependencies(self):
+        self.assertEqual([], self.graph.updateCompletion(self.dependency))
+
+    def testChildHasIncompletePrerequisitesOfParent(self):
+        child = task.Task()
+        self.dependency.addChild(child)
+        self.graph.add([child])
+        self.assertTrue(self.graph.hasIncompletePrerequisites(child))
+
+    def testUpdatePrerequisites(self):
+        self.dependency.removePrerequisites([self.prerequisite])
+        self.graph.update(self.dependency)
+        self.assertEqual(
+            frozenset(), self.graph.dependencies(self.prerequisite)
+        )
+        self.assertFalse(
+            self.graph.hasIncompletePrerequisites(self.dependency)
+        )
+
+    def testRemove(self):
+        self.graph.remove([self.dependency])
+        self.assertFalse(self.dependency in self.graph)
+        self.assertEqual(
+            frozenset(), self.graph.dependencies(self.prerequisite)
+        )
+
+    def testTasksWithEqualIdsAreDistinctNodes(self):
+        twin = task.Task(id=self.dependency.id())
+        self.graph.add([twin])
+        self.assertEqual(3, len(self.graph))
+        self.graph.remove([twin])
+        self.assertTrue(self.dependency in self.graph)
+        self.assertEqual(
+            {self.dependency}, self.graph.dependencies(self.prerequisite)
+        )
+
+    def testNoCycle(self):
+        self.assertEqual(None, self.graph.findCycle())
+
+    def testCycle(self):
+        self.prerequisite.addPrerequisites([self.dependency])
+        self.graph.update(self.prerequisite)
+        cycle = self.graph.findCycle()
+        self.assertEqual({self.prerequisite, self.dependency}, set(cycle))
+
+    def testTopologicalOrder(self):
+        last = task.Task(prerequisites=[self.dependency])
+        self.graph.add([last])
+        self.assertEqual(
+            [self.prerequisite, self.dependency, last],
+            self.graph.topologicalOrder(),
+        )
+
+    def testTopologicalOrderPutsCyclesLast(self):
+        self.prerequisite.addPrerequisites([self.dependency])
+        self.graph.update(self.prerequisite)
+        independent = task.Task()
+        self.graph.add([independent])
+        self.assertEqual(
+            [independent, self.prerequisite, self.dependency],
+            self.graph.topologicalOrder(),
+        )
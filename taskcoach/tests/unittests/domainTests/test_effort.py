@@ -223,6 +223,13 @@ class EffortTest(tctest.TestCase, asserts.Mixin):
         copyEffort = self.effort.copy()
         self.assertNotEqual(copyEffort.id(), self.effort.id())
 
+    def testInstanceAttributesDoNotShadowMethods(self):
+        self.effort.task = "task"
+        self.effort.subject = "subject"
+        self.assertEqual(self.task, self.effort.task())
+        self.assertTrue(callable(self.effort.subject))
+        self.assertNotIn("task", vars(self.effort))
+
     def testCopyHasStatusNew(self):
         self.effort.markDeleted()
         copyEffort = self.effort.copy()
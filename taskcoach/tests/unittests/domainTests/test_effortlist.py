@@ -17,7 +17,7 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 from ... import tctest
-from taskcoachlib import patterns, config
+from taskcoachlib import command, patterns, config
 from taskcoachlib.domain import task, effort, date
 
 
@@ -155,3 +155,40 @@ class EffortListTest(tctest.TestCase):
         self.assertEqual(1, len(self.effortList))
         self.effort.setTask(anotherTask)
         self.assertEqual(1, len(self.effortList))
+
+    # Publisher().batch()
+
+    def createSecondEffort(self):
+        return effort.Effort(
+            self.task, date.DateTime(2005, 1, 1), date.DateTime(2005, 1, 2)
+        )
+
+    def testAddEffortsInBatch(self):
+        effort2 = self.createSecondEffort()
+        with patterns.Publisher().batch():
+            self.task.addEffort(self.effort)
+            self.task.addEffort(effort2)
+        self.assertEqual({self.effort, effort2}, set(self.effortList))
+
+    def testRemoveEffortsInBatch(self):
+        effort2 = self.createSecondEffort()
+        self.task.addEffort(self.effort)
+        self.task.addEffort(effort2)
+        with patterns.Publisher().batch():
+            self.task.removeEffort(self.effort)
+            self.task.removeEffort(effort2)
+        self.assertEqual(0, len(self.effortList))
+
+    def testDeleteEffortsOfOneTaskAndUndo(self):
+        effort2 = self.createSecondEffort()
+        self.task.addEffort(self.effort)
+        self.task.addEffort(effort2)
+        deleteCommand = command.DeleteEffortCommand(
+            self.effortList, [self.effort, effort2]
+        )
+        deleteCommand.do()
+        self.assertEqual(0, len(self.effortList))
+        deleteCommand.undo()
+        self.assertEqual({self.effort, effort2}, set(self.effortList))
+        deleteCommand.redo()
+        self.assertEqual(0, len(self.effortList))
@@ -17,6 +17,8 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 # from builtins import object
+import random
+import re
 import weakref
 
 from ... import tctest
@@ -103,6 +105,124 @@ class StackedFilterTest(tctest.TestCase):
         self.assertTrue(filterRef() is None)
 
 
+class TreeItem(patterns.Composite):
+    def __init__(self, value, *args, **kwargs):
+        self.value = value
+        super().__init__(*args, **kwargs)
+
+
+class TreeFilterUnderTest(base.Filter):
+    """Filtre dont le critère dépend de l'élément et de ses enfants."""
+
+    def filterItems(self, items):
+        return [
+            item
+            for item in items
+            if item.value % 3 == 0
+            or any(child.value % 5 == 0 for child in item.children())
+        ]
+
+
+class FilterUnderTestOnValue(base.Filter):
+    def filterItems(self, items):
+        return [item for item in items if item.value % 2 == 0]
+
+
+class IncrementalFilterTestsMixin(object):
+    """Compare, sur des arbres aléatoires, le contenu des filtres mis à
+    jour de façon incrémentale avec celui de filtres recalculés en entier."""
+
+    treeMode = False
+    operations = 200
+
+    def setUp(self):
+        super().setUp()
+        self.random = random.Random(self.seed)
+        self.nextValue = 0
+        self.items = []
+        self.list = patterns.ObservableList()
+        for _ in range(30):
+            self.addItem()
+        self.filter1 = TreeFilterUnderTest(self.list, treeMode=self.treeMode)
+        self.filter2 = FilterUnderTestOnValue(
+            self.filter1, treeMode=self.treeMode
+        )
+
+    def newItem(self):
+        self.nextValue += 1
+        return TreeItem(self.nextValue)
+
+    def addItem(self):
+        item = self.newItem()
+        if self.items and self.random.random() < 0.8:
+            self.random.choice(self.items).addChild(item)
+        self.items.append(item)
+        self.list.append(item)
+
+    def addSubtree(self):
+        root = self.newItem()
+        for _ in range(self.random.randint(1, 4)):
+            root.addChild(self.newItem())
+        if self.items:
+            self.random.choice(self.items).addChild(root)
+        subtree = [root] + root.children(recursive=True)
+        self.items.extend(subtree)
+        self.list.extend(subtree)
+
+    def removeSubtree(self):
+        root = self.random.choice(self.items)
+        subtree = [root] + root.children(recursive=True)
+        if root.parent():
+            root.parent().removeChild(root)
+        for item in subtree:
+            self.items.remove(item)
+        self.list.removeItems(subtree)
+
+    def assertSameAsFullReset(self):
+        filter1 = TreeFilterUnderTest(self.list, treeMode=self.treeMode)
+        filter2 = FilterUnderTestOnValue(filter1, treeMode=self.treeMode)
+        self.assertEqual(set(filter1), set(self.filter1))
+        self.assertEqual(set(filter2), set(self.filter2))
+        filter2.detach()
+        filter1.detach()
+
+    def testRandomOperations(self):
+        for _ in range(self.operations):
+            operation = self.random.random()
+            if operation < 0.4 or len(self.items) < 5:
+                self.addItem()
+            elif operation < 0.6:
+                self.addSubtree()
+            else:
+                self.removeSubtree()
+            self.assertSameAsFullReset()
+
+    def testRemoveAllItems(self):
+        self.list.removeItems(list(self.list))
+        self.assertFalse(self.filter1)
+        self.assertFalse(self.filter2)
+
+
+class IncrementalFilterListModeTest(
+    IncrementalFilterTestsMixin, tctest.TestCase
+):
+    seed = 1
+
+
+class IncrementalFilterTreeModeTest(
+    IncrementalFilterTestsMixin, tctest.TestCase
+):
+    seed = 2
+    treeMode = True
+
+
+class IncrementalFilterTreeModeOtherSeedTest(
+    IncrementalFilterTestsMixin, tctest.TestCase
+):
+    seed = 3
+    treeMode = True
+
+
 class SearchFilterTest(tctest.TestCase):
     def setUp(self):
         super().setUp()
@@ -218,6 +338,58 @@ class SearchFilterTest(tctest.TestCase):
         self.setSearchString("child description", searchDescription=True)
         self.assertEqual(2, len(self.filter))
 
+    def testSubstringMatchesSpanningSubjectAndDescription(self):
+        self.setSearchString(
+            "$DParent", regularExpression=False, searchDescription=True
+        )
+        self.assertEqual([self.parent], list(self.filter))
+
+    def testMatchAfterSubjectChange(self):
+        self.setSearchString("XYZ")
+        self.child.setSubject("XYZ")
+        self.filter.reset()
+        self.assertEqual([self.child], list(self.filter))
+
+    def testNoMatchAfterSubjectChange(self):
+        self.setSearchString("DEF")
+        self.child.setSubject("XYZ")
+        self.filter.reset()
+        self.assertFalse(self.filter)
+
+    def testMatchAfterDescriptionChange(self):
+        self.setSearchString("XYZ", searchDescription=True)
+        self.child.setDescription("XYZ")
+        self.filter.reset()
+        self.assertEqual([self.child], list(self.filter))
+
+    def testMatchWithIncludeSubItemsAndTreeMode(self):
+        self.filter.setTreeMode(True)
+        grandchild = task.Task(subject="GHI")
+        self.child.addChild(grandchild)
+        self.list.append(grandchild)
+        self.setSearchString("DEF", includeSubItems=True)
+        self.assertEqual(
+            {self.parent, self.child, grandchild}, set(self.filter)
+        )
+
+    def testSubstringAndRegularExpressionSearchesAgree(self):
+        for searchString in ("ab", "DE", "c$", "description", "xyz"):
+            for treeMode in (False, True):
+                self.filter.setTreeMode(treeMode)
+                self.setSearchString(
+                    searchString,
+                    includeSubItems=True,
+                    searchDescription=True,
+                    regularExpression=False,
+                )
+                substringResult = set(self.filter)
+                self.setSearchString(
+                    re.escape(searchString) + "|(?!)",
+                    includeSubItems=True,
+                    searchDescription=True,
+                )
+                self.assertEqual(substringResult, set(self.filter))
+
 
 class DeletedFilterTest(tctest.TestCase):
     def setUp(self):
@@ -0,0 +1,91 @@
+"""
+Task Coach - Your friendly task manager
+Copyright (C) 2004-2016 Task Coach developers <developers@taskcoach.org>
+
+Task Coach is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Task Coach is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from ... import tctest
+from taskcoachlib.domain.base.searchindex import SearchIndex
+
+
+class SearchIndexTest(tctest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.index = SearchIndex()
+        self.index.add("task1", "Buy groceries", "Milk, bread")
+        self.index.add("task2", "Call Bob", "About the groceries")
+
+    def testLength(self):
+        self.assertEqual(2, len(self.index))
+
+    def testContains(self):
+        self.assertTrue("task1" in self.index)
+        self.assertFalse("task3" in self.index)
+
+    def testTexts(self):
+        self.assertEqual(
+            ("Buy groceries", "Milk, bread"), self.index.texts("task1")
+        )
+
+    def testCandidatesForWord(self):
+        self.assertEqual({"task1"}, set(self.index.candidates("milk")))
+
+    def testCandidatesForPartOfWord(self):
+        self.assertEqual(
+            {"task1", "task2"}, set(self.index.candidates("ROCER"))
+        )
+
+    def testCandidatesForShortPartOfWord(self):
+        self.assertEqual({"task1"}, set(self.index.candidates("uy")))
+
+    def testCandidatesForLongFragmentThatIsNotInAnyWord(self):
+        # Le mot contient chaque fragment de trois lettres de "abcab".
+        self.index.add("task3", "abcxbcaxcab", "")
+        self.assertFalse(self.index.candidates("abcab"))
+
+    def testCandidatesUseLongestFragment(self):
+        self.assertEqual({"task2"}, set(self.index.candidates("ll bo")))
+
+    def testCandidatesSpanningSubjectAndDescription(self):
+        self.assertEqual({"task2"}, set(self.index.candidates("bobabout")))
+
+    def testCandidatesWithoutWordCharacters(self):
+        self.assertEqual({"task1", "task2"}, set(self.index.candidates(", ")))
+
+    def testNoCandidates(self):
+        self.assertFalse(self.index.candidates("xyz"))
+
+    def testReindex(self):
+        self.index.add("task1", "Buy flowers", "")
+        self.assertEqual({"task2"}, set(self.index.candidates("groceries")))
+        self.assertEqual({"task1"}, set(self.index.candidates("flowers")))
+
+    def testRemove(self):
+        self.index.remove("task2")
+        self.assertEqual({"task1"}, set(self.index.candidates("groceries")))
+        self.assertFalse(self.index.candidates("bob"))
+
+    def testRemoveForgetsPartsOfWords(self):
+        self.index.remove("task2")
+        self.assertFalse(self.index.candidates("bo"))
+
+    def testRemoveItemNotIndexed(self):
+        self.index.remove("task3")
+        self.assertEqual(2, len(self.index))
+
+    def testClear(self):
+        self.index.clear()
+        self.assertFalse(self.index.candidates("groceries"))
+        self.assertEqual(0, len(self.index))
@@ -16,6 +16,8 @@ You should have received a copy of the GNU General Public License
 along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
+import random
+
 from ... import tctest
 from taskcoachlib import config
 from taskcoachlib.domain import task, effort, date, category
@@ -406,6 +408,70 @@ class TaskSorterTreeModeTest(tctest.TestCase):
             < list(self.sorter).index(self.parent1)
         )
 
+    def testRootItemsAreSorted(self):
+        self.sorter.sortBy("subject")
+        self.sorter.sortAscending(False)
+        self.assertEqual([self.parent2, self.parent1], self.sorter.rootItems())
+
+    def testChildrenOfAreSorted(self):
+        child0 = task.Task(subject="child 0")
+        self.parent1.addChild(child0)
+        self.taskList.append(child0)
+        self.assertEqual(
+            [child0, self.child1], self.sorter.childrenOf(self.parent1)
+        )
+
+    def testChildIsMovedAmongItsSiblingsOnly(self):
+        child0 = task.Task(subject="child 0")
+        self.parent1.addChild(child0)
+        self.taskList.append(child0)
+        self.sorter.sortBy("priority")
+        self.sorter.sortAscending(False)
+        self.child1.setPriority(1)
+        self.assertEqual(
+            [self.child1, child0], self.sorter.childrenOf(self.parent1)
+        )
+        self.assertEqual(
+            [self.parent1, self.child1, child0, self.parent2, self.child2],
+            list(self.sorter),
+        )
+
+    def testListIsDepthFirst(self):
+        self.sorter.sortBy("priority")
+        self.sorter.sortAscending(False)
+        self.child2.setPriority(10)
+        self.assertEqual(
+            [self.parent2, self.child2, self.parent1, self.child1],
+            list(self.sorter),
+        )
+
+    def testParentsWithEqualIdsKeepTheirOwnChildren(self):
+        parent3 = task.Task(subject="parent 3", id=self.parent1.id())
+        child3 = task.Task(subject="child 3")
+        parent3.addChild(child3)
+        self.taskList.append(parent3)
+        self.assertEqual([self.child1], self.sorter.childrenOf(self.parent1))
+        self.assertEqual([child3], self.sorter.childrenOf(parent3))
+        self.assertEqual(
+            [
+                self.parent1,
+                self.child1,
+                self.parent2,
+                self.child2,
+                parent3,
+                child3,
+            ],
+            list(self.sorter),
+        )
+
+    def testRemovedChildIsNoLongerAChild(self):
+        self.taskList.remove(self.child1)
+        self.assertEqual([], self.sorter.childrenOf(self.parent1))
+
+    def testChildrenOfInListMode(self):
+        self.sorter.setTreeMode(False)
+        self.assertEqual([self.child1], self.sorter.childrenOf(self.parent1))
+
     def testSetSorterToListMode(self):
         self.sorter.setTreeMode(False)
         self.assertEqual(
@@ -427,6 +493,318 @@ class TaskSorterTreeModeTest(tctest.TestCase):
         )
 
 
+class TaskSorterResetItemsTestsMixin(object):
+    """Les modifications d'une tâche replacent les seules tâches concernées :
+    la liste triée doit rester celle que donnerait un tri complet."""
+
+    treeMode = False
+
+    def setUp(self):
+        super().setUp()
+        task.Task.settings = config.Settings(load=False)
+        self.random = random.Random(1)
+        self.tasks = [
+            task.Task(subject="task %d" % index) for index in range(200)
+        ]
+        for child in self.tasks[100:150]:
+            parent = self.random.choice(self.tasks[:100])
+            parent.addChild(child)
+            child.setParent(parent)
+        self.taskList = task.TaskList(
+            [eachTask for eachTask in self.tasks if eachTask.parent() is None]
+        )
+        self.sorter = task.sorter.Sorter(self.taskList, treeMode=self.treeMode)
+
+    def assertSorted(self):
+        sortedTasks = list(self.sorter)
+        self.sorter.invalidateSortKeys()
+        self.sorter.reset()
+        self.assertEqual(sortedTasks, list(self.sorter))
+
+    def testRandomPriorityChanges(self):
+        self.sorter.sortBy("priority")
+        for _ in range(50):
+            eachTask = self.random.choice(self.tasks)
+            eachTask.setPriority(self.random.randint(0, 5))
+            self.assertSorted()
+
+    def testRandomDueDateTimeChangesWithSecondarySortKey(self):
+        self.sorter.sortBy("priority")
+        self.sorter.sortBy("dueDateTime")
+        self.sorter.sortAscending(False)
+        for _ in range(50):
+            eachTask = self.random.choice(self.tasks)
+            if self.random.random() < 0.5:
+                eachTask.setPriority(self.random.randint(0, 5))
+            else:
+                eachTask.setDueDateTime(
+                    date.Now() + date.TimeDelta(days=self.random.randint(1, 9))
+                )
+            self.assertSorted()
+
+    def testChangingSubjectMovesTask(self):
+        self.tasks[0].setSubject("zzz")
+        self.assertSorted()
+
+    def testCompletingPrerequisiteMovesDependency(self):
+        prerequisite, dependency = self.tasks[0], self.tasks[1]
+        dependency.setPlannedStartDateTime(date.Now() - date.ONE_HOUR)
+        dependency.addPrerequisites([prerequisite])
+        prerequisite.addDependencies([dependency])
+        self.sorter.reset()
+        oldIndex = list(self.sorter).index(dependency)
+        # Les deux tâches sont replacées par resetItems, sans retri complet.
+        fullResets = []
+        self.sorter.reset = lambda *args, **kwargs: fullResets.append(args)
+        prerequisite.setCompletionDateTime()
+        del self.sorter.reset
+        self.assertEqual([], fullResets)
+        self.assertNotEqual(oldIndex, list(self.sorter).index(dependency))
+        self.assertSorted()
+
+
+class TaskSorterResetItemsInListModeTest(
+    TaskSorterResetItemsTestsMixin, tctest.TestCase
+):
+    treeMode = False
+
+
+class TaskSorterResetItemsInTreeModeTest(
+    TaskSorterResetItemsTestsMixin, tctest.TestCase
+):
+    treeMode = True
+
+
+class TaskSorterCompositeKeyTest(tctest.TestCase):
+    """Le tri en une passe sur une clé composée doit donner l'ordre des tris
+    stables successifs, de la dernière clé à la première."""
+
+    def setUp(self):
+        super().setUp()
+        task.Task.settings = config.Settings(load=False)
+        self.random = random.Random(1)
+        now = date.Now()
+        self.tasks = [
+            task.Task(
+                subject=self.random.choice(["a", "B", "c"]),
+                priority=self.random.randint(0, 3),
+                dueDateTime=now
+                + date.TimeDelta(days=self.random.randint(0, 3)),
+                plannedStartDateTime=now
+                - date.TimeDelta(days=self.random.randint(-1, 1)),
+            )
+            for _ in range(100)
+        ]
+        for eachTask in self.tasks[::7]:
+            eachTask.setCompletionDateTime()
+        self.taskList = task.TaskList(self.tasks)
+
+    def assertSameOrderAsMultiPassSort(self, sortKeys, **kwargs):
+        sorter = task.sorter.Sorter(self.taskList, sortBy=sortKeys, **kwargs)
+        expected = list(self.taskList)
+        for sortKey in reversed(sortKeys):
+            expected.sort(
+                key=sorter.createSortKeyFunction(sortKey.lstrip("-")),
+                reverse=sortKey.startswith("-"),
+            )
+        self.assertEqual(expected, list(sorter))
+
+    def testOneKey(self):
+        self.assertSameOrderAsMultiPassSort(["priority"])
+
+    def testOneDescendingKey(self):
+        self.assertSameOrderAsMultiPassSort(["-priority"])
+
+    def testTwoAscendingKeys(self):
+        self.assertSameOrderAsMultiPassSort(["priority", "subject"])
+
+    def testTwoDescendingKeys(self):
+        self.assertSameOrderAsMultiPassSort(["-priority", "-subject"])
+
+    def testMixedKeys(self):
+        self.assertSameOrderAsMultiPassSort(["-priority", "subject"])
+
+    def testThreeMixedKeys(self):
+        self.assertSameOrderAsMultiPassSort(
+            ["subject", "-dueDateTime", "priority"]
+        )
+
+    def testThreeMixedKeysCaseInsensitive(self):
+        self.assertSameOrderAsMultiPassSort(
+            ["-subject", "priority", "-dueDateTime"],
+            sortCaseSensitive=False,
+        )
+
+    def testMixedKeysWithoutStatusFirst(self):
+        self.assertSameOrderAsMultiPassSort(
+            ["dueDateTime", "-priority"], sortByTaskStatusFirst=False
+        )
+
+
+class WindowedTaskSorterTest(tctest.TestCase):
+    def setUp(self):
+        super().setUp()
+        task.Task.settings = config.Settings(load=False)
+        self.random = random.Random(1)
+        self.tasks = [
+            task.Task(
+                subject="task %03d" % index,
+                priority=self.random.randint(0, 9),
+            )
+            for index in range(500)
+        ]
+        self.taskList = task.TaskList(self.tasks)
+        sortBy = ["-priority", "subject"]
+        self.windowed = task.sorter.Sorter(
+            self.taskList, sortBy=list(sortBy), windowed=True
+        )
+        self.sorter = task.sorter.Sorter(self.taskList, sortBy=list(sortBy))
+
+    def assertSameWindow(self, start, stop):
+        self.assertEqual(
+            list(self.sorter)[start:stop],
+            self.windowed.sortedItems(start, stop),
+        )
+
+    def testIsWindowed(self):
+        self.assertTrue(self.windowed.isWindowed())
+        self.assertFalse(self.sorter.isWindowed())
+
+    def testFirstPage(self):
+        self.assertSameWindow(0, 50)
+
+    def testScrolling(self):
+        for start in range(0, 500, 50):
+            self.assertSameWindow(start, start + 50)
+
+    def testWindowInTheMiddle(self):
+        self.assertSameWindow(300, 350)
+
+    def testAllItems(self):
+        self.assertEqual(list(self.sorter), self.windowed.sortedItems())
+
+    def testItemWithIndex(self):
+        self.assertEqual(self.sorter[123], self.windowed.itemWithIndex(123))
+
+    def testNegativeItemWithIndex(self):
+        self.assertEqual(self.sorter[-1], self.windowed.itemWithIndex(-1))
+
+    def testItemWithIndexOutOfRange(self):
+        self.assertRaises(IndexError, self.windowed.itemWithIndex, 500)
+
+    def testIndexOfItem(self):
+        eachTask = self.sorter[321]
+        self.assertEqual(321, self.windowed.indexOfItem(eachTask))
+
+    def testIndexOfItemWithEqualId(self):
+        twin = task.Task(subject="twin", id=self.sorter[0].id(), priority=-1)
+        self.taskList.append(twin)
+        self.assertEqual(500, self.windowed.indexOfItem(twin))
+        self.assertIs(twin, self.windowed.itemWithIndex(500))
+
+    def testChangingPriority(self):
+        self.assertSameWindow(0, 50)
+        self.sorter[-1].setPriority(10)
+        self.assertSameWindow(0, 50)
+
+    def testAddingTasks(self):
+        self.assertSameWindow(0, 50)
+        self.taskList.extend(
+            [
+                task.Task(subject="new %d" % index, priority=5)
+                for index in range(5)
+            ]
+        )
+        self.assertSameWindow(0, 100)
+
+    def testRemovingTasks(self):
+        self.assertSameWindow(0, 100)
+        self.taskList.removeItems(self.sorter[10:20])
+        self.assertSameWindow(0, 100)
+
+    def testTreeModeIsNeverWindowed(self):
+        self.windowed.setTreeMode(True)
+        self.assertFalse(self.windowed.isWindowed())
+
+    def testSetWindowedOff(self):
+        self.windowed.setWindowed(False)
+        self.assertEqual(list(self.sorter), list(self.windowed))
+
+
+class CountingSorter(task.sorter.Sorter):
+    """Trieur qui compte les éléments dont il calcule la clé de tri."""
+
+    def __init__(self, *args, **kwargs):
+        self.keyComputations = []
+        super().__init__(*args, **kwargs)
+
+    def createSortKeyFunction(self, sortKey):
+        keyFunction = super().createSortKeyFunction(sortKey)
+
+        def countingKeyFunction(item):
+            self.keyComputations.append(item)
+            return keyFunction(item)
+
+        return countingKeyFunction
+
+
+class TaskSorterSortKeyCacheTest(tctest.TestCase):
+    def setUp(self):
+        super().setUp()
+        task.Task.settings = config.Settings(load=False)
+        self.tasks = [
+            task.Task(subject="task %d" % index, priority=index)
+            for index in range(5)
+        ]
+        self.taskList = task.TaskList(self.tasks)
+        self.sorter = CountingSorter(self.taskList, sortBy=["priority"])
+        del self.sorter.keyComputations[:]
+
+    def testResetDoesNotRecomputeKeys(self):
+        self.sorter.reset()
+        self.assertEqual([], self.sorter.keyComputations)
+
+    def testChangingOneTaskRecomputesOnlyItsKey(self):
+        self.tasks[0].setPriority(10)
+        self.assertEqual([self.tasks[0]], self.sorter.keyComputations)
+        self.assertEqual(self.tasks[1:] + self.tasks[:1], list(self.sorter))
+
+    def testChangingUnrelatedAttributeDoesNotRecomputeKeys(self):
+        self.tasks[0].setSubject("new subject")
+        self.assertEqual([], self.sorter.keyComputations)
+
+    def testAddingTaskComputesOnlyItsKey(self):
+        newTask = task.Task(priority=2)
+        self.taskList.append(newTask)
+        self.assertEqual([newTask], self.sorter.keyComputations)
+        self.assertEqual(newTask, self.sorter[3])
+
+    def testTasksWithEqualIdsHaveTheirOwnKeys(self):
+        twin = task.Task(id=self.tasks[0].id(), priority=3)
+        self.taskList.append(twin)
+        self.assertEqual([twin], self.sorter.keyComputations)
+        self.assertEqual(self.tasks[0], self.sorter[0])
+        self.assertEqual(twin, self.sorter[4])
+
+    def testRemovedTaskIsForgotten(self):
+        self.taskList.remove(self.tasks[0])
+        self.taskList.append(self.tasks[0])
+        self.assertEqual([self.tasks[0]], self.sorter.keyComputations)
+
+    def testSortByRecomputesKeys(self):
+        self.sorter.sortBy("subject")
+        self.assertEqual(set(self.tasks), set(self.sorter.keyComputations))
+
+    def testSortCaseSensitiveRecomputesKeys(self):
+        self.sorter.sortCaseSensitive(False)
+        self.assertEqual(set(self.tasks), set(self.sorter.keyComputations))
+
+    def testStatusChangeRecomputesKey(self):
+        self.tasks[0].setCompletionDateTime()
+        self.assertIn(self.tasks[0], self.sorter.keyComputations)
+        self.assertEqual(self.tasks[0], self.sorter[-1])
+
+
 class EffortSorterTest(tctest.TestCase):
     def setUp(self):
         super().setUp()
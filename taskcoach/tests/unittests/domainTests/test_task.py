@@ -3092,6 +3092,92 @@ class RecursivePriorityFixture(TaskTestCase, CommonTaskTestsMixin):
         self.assertEqual((1, self.task1), events[0])
 
 
+class RecursiveAggregatesFixture(TaskTestCase):
+    """Les agrégats récursifs sont gardés en cache : chaque test les lit une
+    première fois, modifie le petit-enfant et vérifie qu'ils sont à jour."""
+
+    def taskCreationKeywordArguments(self):
+        return [
+            {
+                "priority": 1,
+                "children": [task.Task(children=[task.Task()])],
+            }
+        ]
+
+    def testBudget(self):
+        self.assertEqual(date.TimeDelta(), self.task1.budget(recursive=True))
+        self.task1_1_1.setBudget(date.TWO_HOURS)
+        self.assertEqual(date.TWO_HOURS, self.task1.budget(recursive=True))
+        self.assertEqual(date.TWO_HOURS, self.task1_1.budget(recursive=True))
+
+    def testTimeSpent(self):
+        self.assertEqual(
+            date.TimeDelta(), self.task1.timeSpent(recursive=True)
+        )
+        self.addEffort(date.ONE_HOUR, self.task1_1_1)
+        self.assertEqual(date.ONE_HOUR, self.task1.timeSpent(recursive=True))
+
+    def testTimeSpentAfterRemovingEffort(self):
+        self.addEffort(date.ONE_HOUR, self.task1_1_1)
+        self.assertEqual(date.ONE_HOUR, self.task1.timeSpent(recursive=True))
+        self.task1_1_1.removeEffort(self.task1_1_1.efforts()[0])
+        self.assertEqual(
+            date.TimeDelta(), self.task1.timeSpent(recursive=True)
+        )
+
+    def testTimeSpentWithActiveEffortGrows(self):
+        start = date.DateTime.now() - date.ONE_HOUR
+        self.task1_1_1.addEffort(effort.Effort(self.task1_1_1, start))
+        self.assertTrue(self.task1.timeSpent(recursive=True) >= date.ONE_HOUR)
+
+    def testBudgetLeft(self):
+        self.task1_1_1.setBudget(date.TWO_HOURS)
+        self.assertEqual(date.TWO_HOURS, self.task1.budgetLeft(recursive=True))
+        self.addEffort(date.ONE_HOUR, self.task1_1_1)
+        self.assertEqual(date.ONE_HOUR, self.task1.budgetLeft(recursive=True))
+
+    def testPriority(self):
+        self.assertEqual(1, self.task1.priority(recursive=True))
+        self.task1_1_1.setPriority(5)
+        self.assertEqual(5, self.task1.priority(recursive=True))
+
+    def testPriorityWhenGrandChildIsCompleted(self):
+        self.task1_1_1.setPriority(5)
+        self.assertEqual(5, self.task1.priority(recursive=True))
+        self.task1_1_1.setCompletionDateTime()
+        self.assertEqual(1, self.task1.priority(recursive=True))
+
+    def testPercentageComplete(self):
+        self.task1.setShouldMarkCompletedWhenAllChildrenCompleted(True)
+        self.task1_1.setShouldMarkCompletedWhenAllChildrenCompleted(True)
+        self.assertEqual(0, self.task1.percentageComplete(recursive=True))
+        self.task1_1_1.setPercentageComplete(50)
+        self.assertEqual(50, self.task1.percentageComplete(recursive=True))
+
+    def testFixedFeeAndRevenue(self):
+        self.assertEqual(0, self.task1.revenue(recursive=True))
+        self.task1_1_1.setFixedFee(100)
+        self.assertEqual(100, self.task1.fixedFee(recursive=True))
+        self.assertEqual(100, self.task1.revenue(recursive=True))
+
+    def testRevenueAfterChangingHourlyFee(self):
+        self.addEffort(date.ONE_HOUR, self.task1_1_1)
+        self.assertEqual(0, self.task1.revenue(recursive=True))
+        self.task1_1_1.setHourlyFee(100)
+        self.assertEqual(100, self.task1.revenue(recursive=True))
+
+    def testRemovingGrandChild(self):
+        self.task1_1_1.setBudget(date.TWO_HOURS)
+        self.assertEqual(date.TWO_HOURS, self.task1.budget(recursive=True))
+        self.task1_1.removeChild(self.task1_1_1)
+        self.assertEqual(date.TimeDelta(), self.task1.budget(recursive=True))
+
+    def testAddingChild(self):
+        self.assertEqual(1, self.task1.priority(recursive=True))
+        self.task1_1.addChild(task.Task(priority=7))
+        self.assertEqual(7, self.task1.priority(recursive=True))
+
+
 class TaskWithFixedFeeFixture(TaskTestCase, CommonTaskTestsMixin):
     def taskCreationKeywordArguments(self):
         return [{"fixedFee": 1000}]
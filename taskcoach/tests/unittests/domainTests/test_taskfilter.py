@@ -17,9 +17,11 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 # from builtins import object
+import random
+
 from ... import tctest
 from taskcoachlib import config
-from taskcoachlib.domain import task, date
+from taskcoachlib.domain import base, category, date, task
 
 
 class ViewFilterTestCase(tctest.TestCase):
@@ -27,9 +29,7 @@ class ViewFilterTestCase(tctest.TestCase):
         super().setUp()
         task.Task.settings = config.Settings(load=False)
         self.list = task.TaskList()
-        self.filter = task.filter.ViewFilter(
-            self.list, treeMode=self.treeMode
-        )  # pylint: disable=E1101
+        self.filter = self.createFilter()
         self.task = task.Task(subject="task")
         self.dueToday = task.Task(
             subject="due Today", dueDateTime=date.Now().endOfDay()
@@ -42,6 +42,11 @@ class ViewFilterTestCase(tctest.TestCase):
         )
         self.child = task.Task(subject="child")
 
+    def createFilter(self):
+        return task.filter.ViewFilter(
+            self.list, treeMode=self.treeMode
+        )  # pylint: disable=E1101
+
     def assertFilterShows(self, *tasks):
         self.assertEqual(len(tasks), len(self.filter))
         for eachTask in tasks:
@@ -72,6 +77,42 @@ class ViewFilterTestsMixin(object):
         self.filter.hideTaskStatus(task.status.completed)
         self.assertEqual(0, self.filter.nrOfTasksPerStatus()[task.status.completed])
 
+    def testShowCompletedTaskAgain(self):
+        self.task.setCompletionDateTime()
+        self.filter.extend([self.task, self.dueToday])
+        self.filter.hideTaskStatus(task.status.completed)
+        self.filter.hideTaskStatus(task.status.completed, False)
+        self.assertFilterShows(self.task, self.dueToday)
+        self.assertEqual(
+            1, self.filter.nrOfTasksPerStatus()[task.status.completed]
+        )
+
+    def testHideTaskCompletedAfterFilterCreation(self):
+        self.filter.extend([self.task, self.dueToday])
+        self.task.setCompletionDateTime()
+        self.filter.hideTaskStatus(task.status.completed)
+        self.assertFilterShows(self.dueToday)
+
+    def testHideTaskThatBecomesOverdue(self):
+        self.filter.extend([self.task, self.dueToday])
+        self.filter.hideTaskStatus(task.status.overdue)
+        oldNow = date.Now
+        date.Now = lambda: self.dueToday.dueDateTime() + date.ONE_SECOND
+        self.list.updateStatusTransitions()
+        date.Now = oldNow
+        self.assertFilterShows(self.task)
+
+    def testHideTaskThatBecomesOverdueAfterDueDateTimeChange(self):
+        self.filter.extend([self.task, self.dueToday])
+        self.filter.hideTaskStatus(task.status.overdue)
+        dueDateTime = date.Now() + date.ONE_HOUR
+        self.task.setDueDateTime(dueDateTime)
+        oldNow = date.Now
+        date.Now = lambda: dueDateTime + date.ONE_SECOND
+        self.list.updateStatusTransitions()
+        date.Now = oldNow
+        self.assertFilterShows(self.dueToday)
+
     def testFilterCompletedTask_RootTasks(self):
         self.task.setCompletionDateTime()
         self.filter.append(self.task)
@@ -143,6 +184,28 @@ class ViewFilterTestsMixin(object):
         self.task.addPrerequisites([self.dueToday])
         self.assertFilterShows(self.dueToday)
 
+    def testMarkPrerequisiteOfParentCompletedShowsChild(self):
+        self.task.addChild(self.child)
+        self.task.addPrerequisites([self.dueToday])
+        self.dueToday.addDependencies([self.task])
+        for eachTask in (self.task, self.child, self.dueToday):
+            eachTask.setPlannedStartDateTime(date.Now() - date.ONE_SECOND)
+        self.filter.extend([self.dueToday, self.task])
+        self.filter.hideTaskStatus(task.status.inactive)
+        self.filter.hideTaskStatus(task.status.completed)
+        self.assertFilterShows(self.dueToday)
+        self.dueToday.setCompletionDateTime()
+        self.assertFilterShows(self.task, self.child)
+
+    def testAddPrerequisiteToParentWhileFilteringInactiveTasksHidesChild(self):
+        self.task.addChild(self.child)
+        for eachTask in (self.task, self.child, self.dueToday):
+            eachTask.setPlannedStartDateTime(date.Now())
+        self.filter.extend([self.dueToday, self.task])
+        self.filter.hideTaskStatus(task.status.inactive)
+        self.task.addPrerequisites([self.dueToday])
+        self.assertFilterShows(self.dueToday)
+
     def testFilterLateTask(self):
         self.task.setPlannedStartDateTime(date.Yesterday())
         self.list.append(self.task)
@@ -194,9 +257,7 @@ class HideCompositeTasksTestCase(ViewFilterTestCase):
     def setUp(self):
         task.Task.settings = config.Settings(load=False)
         self.list = task.TaskList()
-        self.filter = task.filter.ViewFilter(
-            self.list, treeMode=self.treeMode
-        )  # pylint: disable=E1101
+        self.filter = self.createFilter()
         self.task = task.Task(subject="task")
         self.child = task.Task(subject="child")
         self.task.addChild(self.child)
@@ -271,3 +332,146 @@ class HideCompositeTasksInTreeModeTest(
     HideCompositeTasksTestsMixin, HideCompositeTasksTestCase
 ):
     treeMode = True
+
+
+class TaskFilterPipelineMixin(object):
+    def createFilter(self):
+        return task.filter.TaskFilterPipeline(
+            self.list,
+            categories=category.CategoryList(),
+            treeMode=self.treeMode,
+        )
+
+
+class TaskFilterPipelineInListModeTest(
+    TaskFilterPipelineMixin, ViewFilterTestsMixin, ViewFilterTestCase
+):
+    treeMode = False
+
+
+class TaskFilterPipelineInTreeModeTest(
+    TaskFilterPipelineMixin, ViewFilterTestsMixin, ViewFilterTestCase
+):
+    treeMode = True
+
+
+class TaskFilterPipelineHideCompositeTasksInListModeTest(
+    TaskFilterPipelineMixin,
+    HideCompositeTasksTestsMixin,
+    HideCompositeTasksTestCase,
+):
+    treeMode = False
+
+
+class TaskFilterPipelineHideCompositeTasksInTreeModeTest(
+    TaskFilterPipelineMixin,
+    HideCompositeTasksTestsMixin,
+    HideCompositeTasksTestCase,
+):
+    treeMode = True
+
+
+class TaskFilterPipelineEquivalenceTestsMixin(object):
+    """Compare, sur des tâches aléatoires, le pipeline avec les filtres
+    qu'il fusionne."""
+
+    def setUp(self):
+        super().setUp()
+        self.settings = task.Task.settings = config.Settings(load=False)
+        self.random = random.Random(self.seed)
+        self.categories = category.CategoryList(
+            [
+                category.Category(subject=f"category {index}")
+                for index in range(3)
+            ]
+        )
+        tasks = []
+        for index in range(60):
+            newTask = task.Task(
+                subject=self.random.choice(["abc", "bcd", "cde"])
+            )
+            if tasks and self.random.random() < 0.6:
+                self.random.choice(tasks).addChild(newTask)
+            if self.random.random() < 0.3:
+                newTask.setCompletionDateTime()
+            for eachCategory in self.categories:
+                if self.random.random() < 0.3:
+                    eachCategory.addCategorizable(newTask)
+                    newTask.addCategory(eachCategory)
+            tasks.append(newTask)
+        self.list = task.TaskList(tasks)
+        self.pipeline = task.filter.TaskFilterPipeline(
+            self.list, categories=self.categories, treeMode=self.treeMode
+        )
+
+    def changeCriteria(self, filters):
+        operation = self.random.randrange(4)
+        if operation == 0:
+            status = self.random.choice(task.Task.possibleStatuses())
+            hide = self.random.random() < 0.5
+            for eachFilter in filters:
+                eachFilter.hideTaskStatus(status, hide)
+        elif operation == 1:
+            searchString = self.random.choice(["", "b", "cd", "ab"])
+            for eachFilter in filters:
+                eachFilter.setSearchFilter(searchString)
+        elif operation == 2:
+            eachCategory = self.random.choice(list(self.categories))
+            eachCategory.setFiltered(not eachCategory.isFiltered())
+        else:
+            self.random.choice(list(self.list)).markDeleted()
+
+    def testRandomCriteria(self):
+        stackedFilters = self.createStackedFilters()
+        for _ in range(40):
+            self.changeCriteria([self.pipeline, stackedFilters])
+            self.assertEqual(
+                self.expectedTasks(stackedFilters), set(self.pipeline)
+            )
+
+
+class TaskFilterPipelineEquivalenceInListModeTest(
+    TaskFilterPipelineEquivalenceTestsMixin, tctest.TestCase
+):
+    seed = 1
+    treeMode = False
+
+    def createStackedFilters(self):
+        deletedFilter = base.DeletedFilter(self.list)
+        categoryFilter = category.filter.CategoryFilter(
+            deletedFilter, categories=self.categories
+        )
+        viewFilter = task.filter.ViewFilter(categoryFilter)
+        return base.SearchFilter(viewFilter)
+
+    def expectedTasks(self, stackedFilters):
+        return set(stackedFilters)
+
+
+class TaskFilterPipelineEquivalenceInTreeModeTest(
+    TaskFilterPipelineEquivalenceTestsMixin, tctest.TestCase
+):
+    """En mode arborescence, le pipeline renvoie les tâches qui satisfont
+    tous les critères, et leurs ancêtres."""
+
+    seed = 2
+    treeMode = True
+
+    def createStackedFilters(self):
+        return task.filter.TaskFilterPipeline(
+            self.list, categories=self.categories, treeMode=True
+        )
+
+    def expectedTasks(self, stackedFilters):
+        matches = set(self.list)
+        for filterClass in (
+            base.SearchFilter,
+            category.filter.CategoryFilter,
+            task.filter.ViewFilter,
+            base.DeletedFilter,
+        ):
+            matches &= set(filterClass.filterItems(stackedFilters, self.list))
+        expected = set(matches)
+        for eachTask in matches:
+            expected.update(eachTask.ancestors())
+        return expected
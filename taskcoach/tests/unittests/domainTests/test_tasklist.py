@@ -97,3 +97,147 @@ class TaskListTest(tctest.TestCase):
     def testMaxPriority_TwoTasks(self):
         self.taskList.extend([task.Task(priority=3), task.Task(priority=5)])
         self.assertEqual(5, self.taskList.maxPriority())
+
+    def testNrOfTasksPerStatusIgnoresDeletedTasks(self):
+        self.taskList.extend([self.task1, self.task3])
+        self.task3.markDeleted()
+        self.assertEqual(1, sum(self.taskList.nrOfTasksPerStatus().values()))
+        self.task3.cleanDirty()
+        self.assertEqual(2, sum(self.taskList.nrOfTasksPerStatus().values()))
+
+    def testNrCompletedAfterRemovingCompletedTask(self):
+        self.taskList.append(self.task1)
+        self.task1.setCompletionDateTime()
+        self.taskList.remove(self.task1)
+        self.assertEqual(0, self.nrStatus(task.status.completed))
+
+    def testClearForgetsStatuses(self):
+        self.taskList.extend([self.task1, self.task2])
+        self.taskList.clear()
+        self.assertEqual(
+            0, sum(self.taskList.nrOfTasksPerStatus().values())
+        )
+        for status in task.Task.possibleStatuses():
+            self.assertFalse(self.taskList.tasksWithStatus(status))
+
+    def testNrCompletedCountsChildTasks(self):
+        self.task1.addChild(self.task3)
+        self.task3.setParent(self.task1)
+        self.task3.setCompletionDateTime()
+        self.taskList.append(self.task1)
+        self.assertEqual(1, self.nrStatus(task.status.completed))
+
+    def testNrLateAfterPrerequisiteIsCompleted(self):
+        self.task3.setPlannedStartDateTime(date.Now() - date.ONE_HOUR)
+        self.task3.addPrerequisites([self.task1])
+        self.task1.addDependencies([self.task3])
+        self.taskList.extend([self.task1, self.task3])
+        self.assertEqual(0, self.nrStatus(task.status.late))
+        self.task1.setCompletionDateTime()
+        self.assertEqual(1, self.nrStatus(task.status.late))
+
+    def testTasksWithStatus(self):
+        self.taskList.extend([self.task1, self.task2])
+        self.task2.setCompletionDateTime()
+        self.assertEqual(
+            {self.task2}, self.taskList.tasksWithStatus(task.status.completed)
+        )
+
+    def testTasksWithStatusAreUpdatedAtMidnight(self):
+        self.taskList.append(self.task1)
+        oldNow = date.Now
+        date.Now = lambda: self.task1.dueDateTime() - date.ONE_HOUR
+        self.taskList.onDateChanged(None)
+        self.assertEqual(
+            {self.task1}, self.taskList.tasksWithStatus(task.status.duesoon)
+        )
+        date.Now = oldNow
+
+    def testNextStatusTransitionOfAnEmptyTaskList(self):
+        self.assertEqual(None, self.taskList.nextStatusTransition())
+
+    def testNextStatusTransitionIsTheEarliestOfAllTasks(self):
+        self.taskList.extend([self.task1, self.task2, self.task3])
+        self.assertEqual(
+            self.task1.nextStatusTransition(),
+            self.taskList.nextStatusTransition(),
+        )
+
+    def testNextStatusTransitionAfterDueDateTimeChange(self):
+        self.taskList.extend([self.task1, self.task2])
+        self.task1.setDueDateTime(date.DateTime(date.Now().year + 3, 1, 1))
+        self.assertEqual(
+            self.task2.nextStatusTransition(),
+            self.taskList.nextStatusTransition(),
+        )
+
+    def testNextStatusTransitionAfterRemovingTask(self):
+        self.taskList.extend([self.task1, self.task2])
+        self.taskList.remove(self.task1)
+        self.assertEqual(
+            self.task2.nextStatusTransition(),
+            self.taskList.nextStatusTransition(),
+        )
+
+    def testUpdateStatusTransitionsOnlyUpdatesTasksWithPassedTransitions(
+        self,
+    ):
+        self.taskList.extend([self.task1, self.task2, self.task3])
+        oldNow = date.Now
+        date.Now = lambda: self.task1.dueDateTime() + date.ONE_SECOND
+        self.assertEqual(
+            [self.task1], self.taskList.updateStatusTransitions()
+        )
+        self.assertEqual(1, self.nrStatus(task.status.overdue))
+        self.assertEqual([], self.taskList.updateStatusTransitions())
+        date.Now = oldNow
+
+    def testUpdateStatusTransitionsIgnoresRemovedTasks(self):
+        self.taskList.extend([self.task1, self.task2])
+        self.taskList.remove(self.task1)
+        oldNow = date.Now
+        date.Now = lambda: self.task1.dueDateTime() + date.ONE_SECOND
+        self.assertEqual([], self.taskList.updateStatusTransitions())
+        date.Now = oldNow
+
+    # Prerequisites
+
+    def testDependencyGraphContainsAddedTasks(self):
+        self.task1.addPrerequisites([self.task2])
+        self.taskList.extend([self.task1, self.task2])
+        graph = self.taskList.dependencyGraph()
+        self.assertEqual({self.task2}, graph.prerequisites(self.task1))
+        self.assertEqual({self.task1}, graph.dependencies(self.task2))
+
+    def testDependencyGraphForgetsRemovedTasks(self):
+        self.task1.addPrerequisites([self.task2])
+        self.taskList.extend([self.task1, self.task2])
+        self.taskList.remove(self.task1)
+        graph = self.taskList.dependencyGraph()
+        self.assertFalse(self.task1 in graph)
+        self.assertEqual(frozenset(), graph.dependencies(self.task2))
+
+    def testDependencyGraphForgetsClearedTasks(self):
+        self.task1.addPrerequisites([self.task2])
+        self.taskList.extend([self.task1, self.task2])
+        self.taskList.clear()
+        graph = self.taskList.dependencyGraph()
+        self.assertEqual(0, len(graph))
+        self.assertEqual(frozenset(), graph.dependencies(self.task2))
+
+    def testDependencyGraphFollowsPrerequisitesChanges(self):
+        self.taskList.extend([self.task1, self.task2])
+        self.task1.addPrerequisites([self.task2])
+        graph = self.taskList.dependencyGraph()
+        self.assertEqual(1, graph.incompletePrerequisiteCount(self.task1))
+
+    def testCompletingPrerequisiteUpdatesDependencyStatus(self):
+        self.task1.addPrerequisites([self.task2])
+        self.task2.addDependencies([self.task1])
+        self.task1.setPlannedStartDateTime(date.Now() - date.ONE_DAY)
+        self.taskList.extend([self.task1, self.task2])
+        self.assertEqual(0, self.nrStatus(task.status.late))
+        self.task2.setCompletionDateTime()
+        graph = self.taskList.dependencyGraph()
+        self.assertEqual(0, graph.incompletePrerequisiteCount(self.task1))
+        self.assertEqual(1, self.nrStatus(task.status.late))
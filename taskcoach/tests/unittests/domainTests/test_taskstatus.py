@@ -369,3 +369,92 @@ class TaskStatusTest(tctest.TestCase):
         taskA.addPrerequisites([taskB])
         for eachTask in (taskA, taskB):
             self.assertEqual(task.status.inactive, eachTask.status())
+
+
+class CountingTask(task.Task):
+    computeStatusCount = 0
+
+    @classmethod
+    def computeStatus(cls, *args, **kwargs):
+        cls.computeStatusCount += 1
+        return super().computeStatus(*args, **kwargs)
+
+
+class TaskStatusCacheTest(tctest.TestCase):
+    def setUp(self):
+        super().setUp()
+        task.Task.settings = config.Settings(load=False)
+        self.now = date.Now()
+        self.oldNow = date.Now
+        CountingTask.computeStatusCount = 0
+
+    def tearDown(self):
+        date.Now = self.oldNow
+        super().tearDown()
+
+    def setNow(self, now):
+        date.Now = lambda: now
+
+    def testStatusIsCachedUntilNextTransition(self):
+        dueDateTime = self.now + date.ONE_DAY + date.ONE_DAY
+        aTask = CountingTask(dueDateTime=dueDateTime)
+        self.setNow(self.now)
+        self.assertEqual(task.status.inactive, aTask.status())
+        count = CountingTask.computeStatusCount
+        self.assertEqual(task.status.inactive, aTask.status())
+        self.assertEqual(count, CountingTask.computeStatusCount)
+
+    def testStatusChangesWhenClockCrossesDueSoon(self):
+        dueDateTime = self.now + date.ONE_DAY + date.ONE_DAY
+        aTask = task.Task(dueDateTime=dueDateTime)
+        self.setNow(self.now)
+        self.assertEqual(task.status.inactive, aTask.status())
+        self.setNow(dueDateTime - date.ONE_HOUR)
+        self.assertEqual(task.status.duesoon, aTask.status())
+        self.setNow(dueDateTime + date.ONE_SECOND)
+        self.assertEqual(task.status.overdue, aTask.status())
+
+    def testStatusChangesWhenClockCrossesPlannedStart(self):
+        plannedStartDateTime = self.now + date.ONE_HOUR
+        aTask = task.Task(plannedStartDateTime=plannedStartDateTime)
+        self.setNow(self.now)
+        self.assertEqual(task.status.inactive, aTask.status())
+        self.setNow(plannedStartDateTime + date.ONE_SECOND)
+        self.assertEqual(task.status.late, aTask.status())
+
+    def testStatusChangesWhenDateChanges(self):
+        aTask = task.Task()
+        self.assertEqual(task.status.inactive, aTask.status())
+        aTask.setDueDateTime(self.now - date.ONE_HOUR)
+        self.assertEqual(task.status.overdue, aTask.status())
+
+    def testStatusChangesWhenPrerequisiteCompletes(self):
+        prerequisite = task.Task()
+        aTask = task.Task(plannedStartDateTime=self.now - date.ONE_DAY)
+        aTask.addPrerequisites([prerequisite])
+        prerequisite.addDependencies([aTask])
+        self.assertEqual(task.status.inactive, aTask.status())
+        prerequisite.setCompletionDateTime(self.now)
+        self.assertEqual(task.status.late, aTask.status())
+
+    def testStatusChangesWhenParentGetsPrerequisite(self):
+        child = task.Task(plannedStartDateTime=self.now - date.ONE_DAY)
+        parent = task.Task(children=[child])
+        self.assertEqual(task.status.late, child.status())
+        parent.addPrerequisites([task.Task()])
+        self.assertEqual(task.status.inactive, child.status())
+
+    def testStatusChangesWhenTaskIsMarkedUncompleted(self):
+        aTask = task.Task()
+        aTask.setCompletionDateTime()
+        self.assertEqual(task.status.completed, aTask.status())
+        aTask.setCompletionDateTime(date.DateTime())
+        self.assertEqual(task.status.inactive, aTask.status())
+
+    def testCompletedStatusIsCached(self):
+        aTask = CountingTask(completionDateTime=self.now)
+        self.assertEqual(task.status.completed, aTask.status())
+        count = CountingTask.computeStatusCount
+        self.setNow(self.now + date.ONE_DAY)
+        self.assertEqual(task.status.completed, aTask.status())
+        self.assertEqual(count, CountingTask.computeStatusCount)
@@ -178,6 +178,135 @@ class CompositeTest(tctest.TestCase):
         self.composite.copy()
         self.assertEqual(1, len(self.composite.children()))
 
+    def testChildrenRecursive_AfterAddingGrandChild(self):
+        self.composite.addChild(self.child)
+        self.composite.children(recursive=True)
+        grandChild = patterns.Composite()
+        self.child.addChild(grandChild)
+        self.assertEqual(
+            [self.child, grandChild], self.composite.children(recursive=True)
+        )
+
+    def testChildrenRecursive_AfterRemovingGrandChild(self):
+        grandChild = patterns.Composite()
+        self.composite.addChild(self.child)
+        self.child.addChild(grandChild)
+        self.composite.children(recursive=True)
+        self.child.removeChild(grandChild)
+        self.assertEqual([self.child], self.composite.children(recursive=True))
+
+    def testChildrenRecursive_ReturnsACopy(self):
+        self.composite.addChild(self.child)
+        self.composite.children(recursive=True).append(patterns.Composite())
+        self.assertEqual([self.child], self.composite.children(recursive=True))
+
+    def testChildrenRecursive_AfterSetState(self):
+        self.composite.addChild(self.child)
+        state = self.composite.__getstate__()
+        self.composite.children(recursive=True)
+        self.composite.removeChild(self.child)
+        self.composite.__setstate__(state)
+        self.assertEqual([self.child], self.composite.children(recursive=True))
+
+    def testAncestors_AfterMovingParent(self):
+        grandChild = patterns.Composite()
+        newRoot = patterns.Composite()
+        self.composite.addChild(self.child)
+        self.child.addChild(grandChild)
+        self.assertEqual([self.composite, self.child], grandChild.ancestors())
+        self.composite.removeChild(self.child)
+        newRoot.addChild(self.child)
+        self.assertEqual([newRoot, self.child], grandChild.ancestors())
+
+    def testAncestors_AfterSetParent(self):
+        self.child.ancestors()
+        self.child.setParent(self.composite)
+        self.assertEqual([self.composite], self.child.ancestors())
+
+    def testAncestors_ReturnsACopy(self):
+        self.composite.addChild(self.child)
+        self.child.ancestors().append(self.child)
+        self.assertEqual([self.composite], self.child.ancestors())
+
+    def createTree(self):
+        """composite -> child -> (grandChild1 -> greatGrandChild),
+        grandChild2"""
+        self.grandChild1 = patterns.Composite()
+        self.grandChild2 = patterns.Composite()
+        self.greatGrandChild = patterns.Composite()
+        self.composite.addChild(self.child)
+        self.child.addChild(self.grandChild1)
+        self.child.addChild(self.grandChild2)
+        self.grandChild1.addChild(self.greatGrandChild)
+
+    def testIterChildren(self):
+        self.createTree()
+        self.assertEqual([self.child], list(self.composite.iterChildren()))
+
+    def testIterChildren_Recursive(self):
+        self.createTree()
+        self.assertEqual(
+            [
+                self.child,
+                self.grandChild1,
+                self.greatGrandChild,
+                self.grandChild2,
+            ],
+            list(self.composite.iterChildren(recursive=True)),
+        )
+
+    def testIterChildren_RecursiveHasSameItemsAsChildren(self):
+        self.createTree()
+        self.assertEqual(
+            set(self.composite.children(recursive=True)),
+            set(self.composite.iterChildren(recursive=True)),
+        )
+
+    def testIterChildren_Prune(self):
+        self.createTree()
+        self.assertEqual(
+            [self.child, self.grandChild1, self.grandChild2],
+            list(
+                self.composite.iterChildren(
+                    recursive=True,
+                    prune=lambda child: child is self.grandChild1,
+                )
+            ),
+        )
+
+    def testIterChildren_StopsEarly(self):
+        self.createTree()
+        visited = []
+
+        def prune(child):
+            visited.append(child)
+            return False
+
+        children = self.composite.iterChildren(recursive=True, prune=prune)
+        self.assertEqual(self.child, next(children))
+        self.assertEqual([], visited)
+
+    def testIterAncestors(self):
+        self.createTree()
+        self.assertEqual(
+            [self.grandChild1, self.child, self.composite],
+            list(self.greatGrandChild.iterAncestors()),
+        )
+
+    def testIterAncestors_WithoutParent(self):
+        self.assertEqual([], list(self.composite.iterAncestors()))
+
+    def testWalk(self):
+        self.createTree()
+        self.assertEqual(
+            [self.child, self.grandChild1, self.grandChild2],
+            list(self.child.walk(prune=lambda item: item is self.grandChild1)),
+        )
+        self.assertEqual(
+            [self.child],
+            list(self.child.walk(prune=lambda item: item is self.child)),
+        )
+
 
 class ObservableCompositeTest(tctest.TestCase):
     def setUp(self):
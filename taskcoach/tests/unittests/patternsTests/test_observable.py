@@ -17,6 +17,12 @@ along with this program.  If not, see <http://www.gnu.org/licenses/>.
 """
 
 # from builtins import object
+import gc
+import time
+import weakref
+
+from pubsub import pub
+
 from ... import tctest
 from taskcoachlib import patterns
 
@@ -666,6 +672,348 @@ class PublisherTest(tctest.TestCase):
         patterns.Event("eventType1", "observable2").send()
         self.assertTrue(self.events)
 
+    def testNotifyObservers_ObserverForWholeEventReceivesEventItself(self):
+        self.publisher.registerObserver(self.onEvent, eventType="eventType")
+        event = patterns.Event("eventType", "observable1")
+        event.addSource("observable2")
+        event.send()
+        self.assertTrue(event is self.events[0])
+
+    def testNotifyObservers_ObserverForOneSourceReceivesSubEvent(self):
+        self.publisher.registerObserver(
+            self.onEvent, eventType="eventType", eventSource="observable1"
+        )
+        event = patterns.Event("eventType", "observable1", "value1")
+        event.addSource("observable2", "value2")
+        event.send()
+        self.assertEqual(
+            [patterns.Event("eventType", "observable1", "value1")], self.events
+        )
+
+    def testNotifyObservers_ObserverForOneTypeReceivesSubEvent(self):
+        self.publisher.registerObserver(self.onEvent, eventType="eventType1")
+        event = patterns.Event("eventType1", self)
+        event.addSource(self, type="eventType2")
+        event.send()
+        self.assertEqual([patterns.Event("eventType1", self)], self.events)
+
+    def testNotifyObservers_ObserverForTypeAndSourceIsNotifiedOnce(self):
+        self.publisher.registerObserver(self.onEvent, eventType="eventType")
+        self.publisher.registerObserver(
+            self.onEvent, eventType="eventType", eventSource="observable1"
+        )
+        patterns.Event("eventType", "observable1").send()
+        self.assertEqual([patterns.Event("eventType", "observable1")], self.events)
+
+    def testRemoveObserver_RegisteredForOtherSourceOnly(self):
+        self.publisher.registerObserver(
+            self.onEvent, eventType="eventType", eventSource="observable1"
+        )
+        self.publisher.removeObserver(self.onEvent, eventSource="observable2")
+        self.assertEqual([self.onEvent], self.publisher.observers())
+
+    def testRemoveManySourceSpecificObservers(self):
+        class Observer(object):
+            def onEvent(self, event):
+                pass  # pragma: no cover
+
+        observers = [Observer() for _ in range(100000)]
+        for observer in observers:
+            self.publisher.registerObserver(
+                observer.onEvent, eventType="eventType", eventSource=observer
+            )
+        start = time.perf_counter()
+        for observer in observers:
+            self.publisher.removeObserver(observer.onEvent)
+        duration = time.perf_counter() - start
+        self.assertEqual([], self.publisher.observers())
+        self.assertTrue(duration < 5, f"Removing observers took {duration:.2f}s")
+
+    def testPublisherDoesNotKeepObserversAlive(self):
+        class Observer(object):
+            def onEvent(self, event):
+                pass  # pragma: no cover
+
+        observer = Observer()
+        observerRef = weakref.ref(observer)
+        self.publisher.registerObserver(observer.onEvent, eventType="eventType")
+        del observer
+        gc.collect()
+        self.assertTrue(observerRef() is None)
+
+    def testDeadObserversArePurgedOnDispatch(self):
+        class Observer(object):
+            def onEvent(self, event):
+                pass  # pragma: no cover
+
+        observer = Observer()
+        self.publisher.registerObserver(observer.onEvent, eventType="eventType")
+        self.publisher.registerObserver(self.onEvent, eventType="eventType")
+        del observer
+        gc.collect()
+        patterns.Event("eventType", self).send()
+        self.assertEqual([self.onEvent], self.publisher.observers())
+        self.assertEqual(1, len(self.events))
+
+    def testDeadObserversDoNotKeepTheirEventSourceAlive(self):
+        class Observer(object):
+            def onEvent(self, event):
+                pass  # pragma: no cover
+
+        class Source(object):
+            pass
+
+        observer, source = Observer(), Source()
+        sourceRef = weakref.ref(source)
+        self.publisher.registerObserver(
+            observer.onEvent, eventType="eventType", eventSource=source
+        )
+        del observer, source
+        gc.collect()
+        self.assertTrue(sourceRef() is None)
+        self.assertEqual([], self.publisher.observers())
+
+    def testObserverMixinDoesNotReferenceItself(self):
+        class Observer(patterns.Observer):
+            def onEvent(self, event):
+                pass  # pragma: no cover
+
+        observer = Observer()
+        observer.registerObserver(observer.onEvent, eventType="eventType")
+        observerRef = weakref.ref(observer)
+        gc.disable()
+        try:
+            del observer
+            self.assertTrue(observerRef() is None)
+        finally:
+            gc.enable()
+        self.assertEqual([], self.publisher.observers())
+
+    def testMethodProxyOfDeadInstanceDoesNothing(self):
+        class Observer(object):
+            def onEvent(self, event):
+                return "called"  # pragma: no cover
+
+        observer = Observer()
+        proxy = patterns.MethodProxy(observer.onEvent)
+        self.assertEqual("called", proxy(None))
+        del observer
+        gc.collect()
+        self.assertTrue(proxy(None) is None)
+        self.assertFalse(proxy.isAlive())
+
+
+class PublisherBatchTest(tctest.TestCase):
+    def setUp(self):
+        super().setUp()
+        self.publisher = patterns.Publisher()
+        self.events = []
+        self.messages = []
+        self.list = patterns.ObservableList()
+        pub.subscribe(self.onMessage, "batchtest.topic")
+
+    def onEvent(self, event):
+        self.events.append(event)
+
+    def onMessage(self, newValue, sender):
+        self.messages.append((newValue, sender))
+
+    def testEventsAreDeliveredOnExit(self):
+        self.publisher.registerObserver(self.onEvent, eventType="eventType")
+        with self.publisher.batch():
+            patterns.Event("eventType", self, "value").send()
+            self.assertFalse(self.events)
+        self.assertEqual([patterns.Event("eventType", self, "value")], self.events)
+
+    def testRepeatedEventsCollapseToLastValue(self):
+        self.publisher.registerObserver(self.onEvent, eventType="eventType")
+        with self.publisher.batch():
+            patterns.Event("eventType", self, "value1").send()
+            patterns.Event("eventType", self, "value2").send()
+        self.assertEqual([patterns.Event("eventType", self, "value2")], self.events)
+
+    def testEventsForDifferentSourcesAreDeliveredInOneEvent(self):
+        self.publisher.registerObserver(self.onEvent, eventType="eventType")
+        with self.publisher.batch():
+            patterns.Event("eventType", "source1", "value1").send()
+            patterns.Event("eventType", "source2", "value2").send()
+        self.assertEqual(1, len(self.events))
+        self.assertEqual({"source1", "source2"}, self.events[0].sources())
+
+    def testCollectionAdditionsAreAccumulated(self):
+        self.publisher.registerObserver(
+            self.onEvent, eventType=self.list.addItemEventType()
+        )
+        with self.publisher.batch():
+            self.list.append(1)
+            self.list.append(2)
+        self.assertEqual(1, len(self.events))
+        self.assertEqual((1, 2), self.events[0].values())
+
+    def testCollectionAdditionsAndRemovalsKeepTheirOrder(self):
+        self.publisher.registerObserver(
+            self.onEvent, eventType=self.list.addItemEventType()
+        )
+        self.publisher.registerObserver(
+            self.onEvent, eventType=self.list.removeItemEventType()
+        )
+        with self.publisher.batch():
+            self.list.append(1)
+            self.list.remove(1)
+            self.list.append(1)
+        self.assertEqual(
+            [
+                self.list.addItemEventType(),
+                self.list.removeItemEventType(),
+                self.list.addItemEventType(),
+            ],
+            [event.type() for event in self.events],
+        )
+
+    def testNestedBatchesDeliverOnOutermostExit(self):
+        self.publisher.registerObserver(self.onEvent, eventType="eventType")
+        with self.publisher.batch():
+            with self.publisher.batch():
+                patterns.Event("eventType", self).send()
+            self.assertFalse(self.events)
+        self.assertEqual(1, len(self.events))
+
+    def testEventsAreDeliveredWhenExceptionIsRaised(self):
+        self.publisher.registerObserver(self.onEvent, eventType="eventType")
+        try:
+            with self.publisher.batch():
+                patterns.Event("eventType", self).send()
+                raise ValueError
+        except ValueError:
+            pass
+        self.assertEqual(1, len(self.events))
+        self.assertFalse(self.publisher.isBatching())
+
+    def testRepeatedMessagesCollapseToLastValue(self):
+        with self.publisher.batch():
+            pub.sendMessage("batchtest.topic", newValue=1, sender=self)
+            pub.sendMessage("batchtest.topic", newValue=2, sender=self)
+            self.assertFalse(self.messages)
+        self.assertEqual([(2, self)], self.messages)
+
+    def testMessagesForDifferentSendersAreAllDelivered(self):
+        with self.publisher.batch():
+            pub.sendMessage("batchtest.topic", newValue=1, sender=self)
+            pub.sendMessage("batchtest.topic", newValue=2, sender=self.list)
+        self.assertEqual([(1, self), (2, self.list)], self.messages)
+
+    def testRepeatedDeltaEventsAccumulateValues(self):
+        self.publisher.registerObserver(self.onEvent, eventType="child.add")
+        with self.publisher.batch():
+            patterns.Event("child.add", self, "child1").send()
+            patterns.Event("child.add", self, "child2").send()
+        self.assertEqual(
+            [patterns.Event("child.add", self, "child1", "child2")],
+            self.events,
+        )
+
+    def testRepeatedDeltaMessagesKeepFirstOldValue(self):
+        patterns.Publisher.registerDeltaTopic("batchtest.delta")
+        pub.subscribe(self.onMessage, "batchtest.delta")
+        with self.publisher.batch():
+            pub.sendMessage("batchtest.delta", newValue=([1], []), sender=self)
+            pub.sendMessage(
+                "batchtest.delta", newValue=([1, 2], [1]), sender=self
+            )
+        self.assertEqual([(([1, 2], []), self)], self.messages)
+
+
+
+class DeliveryQueueTest(tctest.TestCase):
+    def setUp(self):
+        self.queue = patterns.DeliveryQueue()
+        self.scheduled = []
+        self.calls = []
+
+    def tearDown(self):
+        self.queue.setScheduler(None)
+        super().tearDown()
+
+    def refreshItems(self, *items):
+        self.calls.append(("refreshItems", items))
+
+    def refresh(self):
+        self.calls.append(("refresh", ()))
+
+    def enable(self):
+        self.queue.setScheduler(self.scheduled.append)
+
+    def testDeliversImmediatelyWithoutScheduler(self):
+        self.queue.deliver(self.refreshItems, 1, 2)
+        self.assertEqual([("refreshItems", (1, 2))], self.calls)
+
+    def testDefersDeliveryWithScheduler(self):
+        self.enable()
+        self.queue.deliver(self.refreshItems, 1)
+        self.assertEqual([], self.calls)
+        self.assertEqual([self.queue.drain], self.scheduled)
+        self.queue.drain()
+        self.assertEqual([("refreshItems", (1,))], self.calls)
+
+    def testDrainIsScheduledOncePerCycle(self):
+        self.enable()
+        self.queue.deliver(self.refreshItems, 1)
+        self.queue.deliver(self.refresh)
+        self.assertEqual(1, len(self.scheduled))
+        self.queue.drain()
+        self.queue.deliver(self.refresh)
+        self.assertEqual(2, len(self.scheduled))
+
+    def testItemsOfTheSameCallbackAreMergedAndDeduplicated(self):
+        self.enable()
+        self.queue.deliver(self.refreshItems, 1, 2)
+        self.queue.deliver(self.refreshItems, 2, 3)
+        self.assertEqual(1, self.queue.pending())
+        self.queue.drain()
+        self.assertEqual([("refreshItems", (1, 2, 3))], self.calls)
+
+    def testDeliveriesAreOrderedByPriority(self):
+        self.enable()
+        self.queue.deliver(self.refreshItems, 1)
+        self.queue.deliver(
+            self.refresh, priority=patterns.DeliveryQueue.PRIORITY_REFRESH
+        )
+        self.queue.drain()
+        self.assertEqual(
+            ["refresh", "refreshItems"], [call[0] for call in self.calls]
+        )
+
+    def testDeliveriesDuringDrainAreDeferredToTheNextCycle(self):
+        def refreshAndDeliverAgain():
+            self.calls.append(("again", ()))
+            self.queue.deliver(self.refresh)
+
+        self.enable()
+        self.queue.deliver(refreshAndDeliverAgain)
+        self.queue.drain()
+        self.assertEqual([("again", ())], self.calls)
+        self.assertEqual(1, self.queue.pending())
+
+    def testFailingDeliveryDoesNotStopTheOthers(self):
+        def failingRefresh():
+            raise RuntimeError("wrapped C/C++ object has been deleted")
+
+        self.enable()
+        self.queue.deliver(
+            failingRefresh, priority=patterns.DeliveryQueue.PRIORITY_REFRESH
+        )
+        self.queue.deliver(self.refreshItems, 1)
+        with self.assertLogs("taskcoachlib.patterns.observer", "ERROR"):
+            self.queue.drain()
+        self.assertEqual([("refreshItems", (1,))], self.calls)
+
+    def testRemovingTheSchedulerForgetsPendingDeliveries(self):
+        self.enable()
+        self.queue.deliver(self.refreshItems, 1)
+        self.queue.setScheduler(None)
+        self.assertEqual(0, self.queue.pending())
+        self.assertFalse(self.queue.isEnabled())
+
 
 if __name__ == "__main__":
     tctest.main()
@@ -0,0 +1,136 @@
+"""
+Task Coach - Your friendly task manager
+Copyright (C) 2021 Task Coach developers <developers@taskcoach.org>
+
+Task Coach is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Task Coach is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+import time
+
+from pubsub import pub
+
+from ... import tctest
+from taskcoachlib import patterns
+from taskcoachlib.tools import dispatchprofiler
+
+
+class Listener(object):
+    def __init__(self):
+        self.events = []
+
+    def onEvent(self, event):
+        self.events.append(event)
+
+    def onMessage(self, newValue, sender):
+        self.events.append(newValue)
+
+    def onSlowMessage(self, newValue, sender):
+        time.sleep(0.01)
+
+    def onMessageSendingAnother(self, newValue, sender):
+        pub.sendMessage("profiler.inner", newValue=newValue, sender=sender)
+
+
+class DispatchProfilerTest(tctest.TestCase):
+    def setUp(self):
+        super().setUp()
+        dispatchprofiler.clear()
+        self.listener = Listener()
+
+    def tearDown(self):
+        dispatchprofiler.disable()
+        dispatchprofiler.clear()
+        super().tearDown()
+
+    def listenerName(self, method):
+        return f"{__name__}.Listener.{method}"
+
+    def testDisabledByDefault(self):
+        self.assertFalse(dispatchprofiler.isEnabled())
+
+    def testNothingRecordedWhenDisabled(self):
+        patterns.Publisher().registerObserver(
+            self.listener.onEvent, eventType="profiler.event"
+        )
+        patterns.Event("profiler.event", self).send()
+        self.assertEqual({}, dispatchprofiler.topicStats())
+        self.assertEqual({}, dispatchprofiler.listenerStats())
+
+    def testPublisherEventsArePerTopicAndPerListener(self):
+        patterns.Publisher().registerObserver(
+            self.listener.onEvent, eventType="profiler.event"
+        )
+        dispatchprofiler.enable()
+        patterns.Event("profiler.event", self).send()
+        patterns.Event("profiler.event", self).send()
+        self.assertEqual(2, len(self.listener.events))
+        self.assertEqual(
+            2, dispatchprofiler.topicStats()["profiler.event"].count
+        )
+        stats = dispatchprofiler.listenerStats()[self.listenerName("onEvent")]
+        self.assertEqual(2, stats.count)
+        self.assertTrue(stats.maximum <= stats.total)
+
+    def testDisableRestoresPublisher(self):
+        dispatchprofiler.enable()
+        dispatchprofiler.disable()
+        self.assertFalse(
+            patterns.Publisher.notifyObservers.__name__.startswith("_profiled")
+        )
+        self.assertFalse(
+            patterns.MethodProxy.__call__.__name__.startswith("_profiled")
+        )
+
+    def testPubsubMessagesArePerTopicAndPerListener(self):
+        pub.subscribe(self.listener.onMessage, "profiler.message")
+        dispatchprofiler.enable()
+        for value in range(3):
+            pub.sendMessage("profiler.message", newValue=value, sender=self)
+        self.assertEqual([0, 1, 2], self.listener.events)
+        self.assertEqual(
+            3, dispatchprofiler.topicStats()["profiler.message"].count
+        )
+        self.assertEqual(
+            3,
+            dispatchprofiler.listenerStats()[
+                self.listenerName("onMessage")
+            ].count,
+        )
+
+    def testNestedPubsubMessages(self):
+        pub.subscribe(self.listener.onMessageSendingAnother, "profiler.outer")
+        pub.subscribe(self.listener.onMessage, "profiler.inner")
+        dispatchprofiler.enable()
+        pub.sendMessage("profiler.outer", newValue=1, sender=self)
+        topics = dispatchprofiler.topicStats()
+        self.assertEqual(1, topics["profiler.outer"].count)
+        self.assertEqual(1, topics["profiler.inner"].count)
+        self.assertTrue(
+            topics["profiler.inner"].total <= topics["profiler.outer"].total
+        )
+        listeners = dispatchprofiler.listenerStats()
+        self.assertEqual(1, listeners[self.listenerName("onMessage")].count)
+        self.assertEqual(
+            1, listeners[self.listenerName("onMessageSendingAnother")].count
+        )
+
+    def testReportIsSortedByCumulativeTime(self):
+        pub.subscribe(self.listener.onSlowMessage, "profiler.slow")
+        dispatchprofiler.enable()
+        pub.sendMessage("profiler.message", newValue=0, sender=self)
+        pub.sendMessage("profiler.slow", newValue=0, sender=self)
+        report = dispatchprofiler.report()
+        self.assertTrue(
+            report.index("profiler.slow") < report.index("profiler.message")
+        )
@@ -0,0 +1,110 @@
+"""
+Task Coach - Your friendly task manager
+Copyright (C) 2021 Task Coach developers <developers@taskcoach.org>
+
+Task Coach is free software: you can redistribute it and/or modify
+it under the terms of the GNU General Public License as published by
+the Free Software Foundation, either version 3 of the License, or
+(at your option) any later version.
+
+Task Coach is distributed in the hope that it will be useful,
+but WITHOUT ANY WARRANTY; without even the implied warranty of
+MERCHANTABILITY or FITNESS FOR A PARTICULAR PURPOSE.  See the
+GNU General Public License for more details.
+
+You should have received a copy of the GNU General Public License
+along with this program.  If not, see <http://www.gnu.org/licenses/>.
+"""
+
+from ... import tctest
+from taskcoachlib import patterns
+from taskcoachlib.tools import tracing
+
+
+class TracedList(list):
+    @tracing.traced("TracedList.double", itemCount=len)
+    def double(self):
+        self.extend(self[:])
+        return len(self)
+
+
+class TracingTest(tctest.TestCase):
+    def setUp(self):
+        super().setUp()
+        tracing.clear()
+        self.items = TracedList([1, 2, 3])
+
+    def tearDown(self):
+        tracing.disable()
+        tracing.clear()
+        super().tearDown()
+
+    def testDisabledByDefault(self):
+        self.assertFalse(tracing.isEnabled())
+
+    def testNoSpansWhenDisabled(self):
+        self.assertEqual(6, self.items.double())
+        self.assertEqual([], tracing.spans())
+
+    def testSpanRecordedWhenEnabled(self):
+        tracing.enable()
+        self.items.double()
+        (span,) = tracing.spans()
+        self.assertEqual("TracedList.double", span.name)
+        self.assertEqual(6, span.itemCount)
+        self.assertTrue(span.duration >= 0)
+
+    def testSpanRecordedWhenFunctionRaises(self):
+        @tracing.traced("failing")
+        def failing():
+            raise ValueError
+
+        tracing.enable()
+        self.assertRaises(ValueError, failing)
+        self.assertEqual(["failing"], [span.name for span in tracing.spans()])
+
+    def testDisableKeepsRecordedSpans(self):
+        tracing.enable()
+        self.items.double()
+        tracing.disable()
+        self.items.double()
+        self.assertEqual(1, len(tracing.spans()))
+
+    def testClear(self):
+        tracing.enable()
+        self.items.double()
+        tracing.clear()
+        self.assertEqual([], tracing.spans())
+
+    def testOriginalMethodIsInstalledWhenDisabled(self):
+        original = vars(TracedList)["double"]
+        self.assertFalse(hasattr(original, "__wrapped__"))
+        tracing.enable()
+        self.assertTrue(vars(TracedList)["double"].__wrapped__ is original)
+        tracing.disable()
+        self.assertTrue(vars(TracedList)["double"] is original)
+
+    def testOverridingMethodCallingSuperIsTraced(self):
+        class SubList(TracedList):
+            def double(self):
+                return super().double()
+
+        tracing.enable()
+        SubList([1]).double()
+        self.assertEqual(2, tracing.spans()[0].itemCount)
+
+    def testCollectionDecoratorFreezeAndThawAreTraced(self):
+        observed = patterns.ObservableList([1, 2])
+        decorator = patterns.ListDecorator(observed)
+        tracing.enable()
+        decorator.freeze()
+        decorator.thaw()
+        self.assertEqual(
+            ["CollectionDecorator.freeze", "CollectionDecorator.thaw"],
+            [
+                span.name
+                for span in tracing.spans()
+                if span.name != "CollectionDecorator.refresh"
+            ],
+        )
+        self.assertTrue(all(span.itemCount == 2 for span in tracing.spans()))